@@ -0,0 +1,28 @@
+"""Add articles created_at index for keyset pagination
+
+Revision ID: 4e2d7c1a9b35
+Revises: b6c9829b4a3d
+Create Date: 2026-10-18 09:40:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "4e2d7c1a9b35"
+down_revision = "b6c9829b4a3d"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # SQLite ajoute implicitement le rowid (id) à l'index : il couvre donc
+    # l'ordre (created_at, id) utilisé par la pagination par curseur.
+    op.create_index(
+        op.f("ix_articles_created_at"), "articles", ["created_at"], unique=False
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_articles_created_at"), table_name="articles")
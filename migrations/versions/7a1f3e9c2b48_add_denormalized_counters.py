@@ -0,0 +1,61 @@
+"""Add denormalized counters on articles and users
+
+Revision ID: 7a1f3e9c2b48
+Revises: 4e2d7c1a9b35
+Create Date: 2026-10-18 10:05:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "7a1f3e9c2b48"
+down_revision = "4e2d7c1a9b35"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "articles",
+        sa.Column("favorites_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "articles",
+        sa.Column("comments_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "users",
+        sa.Column("followers_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "users",
+        sa.Column("following_count", sa.Integer(), server_default="0", nullable=False),
+    )
+
+    # Initialiser les compteurs à partir des données existantes
+    op.execute(
+        "UPDATE articles SET "
+        "favorites_count = (SELECT COUNT(*) FROM article_favorites "
+        "WHERE article_favorites.article_id = articles.id), "
+        "comments_count = (SELECT COUNT(*) FROM comments "
+        "WHERE comments.article_id = articles.id)"
+    )
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT COUNT(*) FROM user_follows "
+        "WHERE user_follows.followed_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM user_follows "
+        "WHERE user_follows.follower_id = users.id)"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table("users") as batch_op:
+        batch_op.drop_column("following_count")
+        batch_op.drop_column("followers_count")
+    with op.batch_alter_table("articles") as batch_op:
+        batch_op.drop_column("comments_count")
+        batch_op.drop_column("favorites_count")
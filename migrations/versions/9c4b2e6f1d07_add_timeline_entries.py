@@ -0,0 +1,62 @@
+"""Add materialized timeline_entries table for the feed
+
+Revision ID: 9c4b2e6f1d07
+Revises: 7a1f3e9c2b48
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "9c4b2e6f1d07"
+down_revision = "7a1f3e9c2b48"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "timeline_entries",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("article_id", sa.Integer(), nullable=False),
+        sa.Column("author_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["article_id"], ["articles.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["author_id"], ["users.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(["user_id"], ["users.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "article_id"),
+    )
+    op.create_index(
+        "ix_timeline_entries_user_created",
+        "timeline_entries",
+        ["user_id", "created_at", "article_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_timeline_entries_user_author",
+        "timeline_entries",
+        ["user_id", "author_id"],
+        unique=False,
+    )
+
+    # Remplir les timelines à partir des abonnements existants, avec la même
+    # borne qu'un nouvel abonnement (FEED_BACKFILL_LIMIT, 200 par défaut) : les
+    # 200 articles les plus récents de chaque auteur suivi
+    op.execute(
+        "INSERT INTO timeline_entries (user_id, article_id, author_id, created_at) "
+        "SELECT user_follows.follower_id, recent.id, recent.author_id, "
+        "recent.created_at FROM user_follows "
+        "JOIN (SELECT id, author_id, created_at, ROW_NUMBER() OVER ("
+        "PARTITION BY author_id ORDER BY created_at DESC, id DESC) AS position "
+        "FROM articles) AS recent "
+        "ON recent.author_id = user_follows.followed_id AND recent.position <= 200"
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_timeline_entries_user_author", table_name="timeline_entries")
+    op.drop_index("ix_timeline_entries_user_created", table_name="timeline_entries")
+    op.drop_table("timeline_entries")
@@ -0,0 +1,61 @@
+"""Merge tag names differing only by case or surrounding spaces
+
+Revision ID: a8e2f5c1d937
+Revises: f3b7a1d9c526
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "a8e2f5c1d937"
+down_revision = "f3b7a1d9c526"
+branch_labels = None
+depends_on = None
+
+
+def normalize(name: str) -> str:
+    # Même normalisation que repositories.article_repository.normalize_tag_names
+    return name.strip().lower()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Les tags sont désormais enregistrés en minuscules : les variantes de casse
+    # existantes (« Python », « python ») sont fusionnées en un seul tag. En
+    # Python plutôt qu'en SQL, dont lower() ne traite que l'ASCII.
+    conn = op.get_bind()
+    rows = conn.execute(sa.text("SELECT id, name FROM tags ORDER BY id")).all()
+    canonical = {name: tag_id for tag_id, name in rows if name == normalize(name)}
+
+    for tag_id, name in rows:
+        target = normalize(name)
+        if target == name:
+            continue
+        if target and target not in canonical:
+            # Première variante d'un nom : renommée sur place, son id est conservé
+            conn.execute(
+                sa.text("UPDATE tags SET name = :name WHERE id = :id"),
+                {"name": target, "id": tag_id},
+            )
+            canonical[target] = tag_id
+            continue
+        if target:
+            conn.execute(
+                sa.text(
+                    "INSERT OR IGNORE INTO article_tags (article_id, tag_id) "
+                    "SELECT article_id, :canonical FROM article_tags WHERE tag_id = :id"
+                ),
+                {"canonical": canonical[target], "id": tag_id},
+            )
+        conn.execute(
+            sa.text("DELETE FROM article_tags WHERE tag_id = :id"), {"id": tag_id}
+        )
+        conn.execute(sa.text("DELETE FROM tags WHERE id = :id"), {"id": tag_id})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # Fusion irréversible : les noms d'origine ne sont pas conservés
+    pass
@@ -0,0 +1,71 @@
+"""Add missing composite indexes and article_tags primary key
+
+Revision ID: c2d8f4a6e913
+Revises: 9c4b2e6f1d07
+Create Date: 2026-10-18 11:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "c2d8f4a6e913"
+down_revision = "9c4b2e6f1d07"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Retirer les associations incomplètes ou en double avant d'ajouter la clé primaire
+    op.execute("DELETE FROM article_tags WHERE article_id IS NULL OR tag_id IS NULL")
+    op.execute(
+        "DELETE FROM article_tags WHERE rowid NOT IN "
+        "(SELECT MIN(rowid) FROM article_tags GROUP BY article_id, tag_id)"
+    )
+    with op.batch_alter_table("article_tags", recreate="always") as batch_op:
+        batch_op.alter_column("article_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.alter_column("tag_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_primary_key("pk_article_tags", ["article_id", "tag_id"])
+    op.create_index(
+        "ix_article_tags_tag_id", "article_tags", ["tag_id", "article_id"], unique=False
+    )
+
+    op.create_index(
+        "ix_article_favorites_user_id",
+        "article_favorites",
+        ["user_id", "article_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_articles_author_id_created_at",
+        "articles",
+        ["author_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_comments_article_id_created_at",
+        "comments",
+        ["article_id", "created_at"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_user_follows_followed_id",
+        "user_follows",
+        ["followed_id", "follower_id"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_user_follows_followed_id", table_name="user_follows")
+    op.drop_index("ix_comments_article_id_created_at", table_name="comments")
+    op.drop_index("ix_articles_author_id_created_at", table_name="articles")
+    op.drop_index("ix_article_favorites_user_id", table_name="article_favorites")
+
+    op.drop_index("ix_article_tags_tag_id", table_name="article_tags")
+    with op.batch_alter_table("article_tags", recreate="always") as batch_op:
+        batch_op.drop_constraint("pk_article_tags", type_="primary")
+        batch_op.alter_column("article_id", existing_type=sa.Integer(), nullable=True)
+        batch_op.alter_column("tag_id", existing_type=sa.Integer(), nullable=True)
@@ -0,0 +1,51 @@
+"""Add FTS5 full-text index on articles
+
+Revision ID: e5a9c3d7b214
+Revises: c2d8f4a6e913
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "e5a9c3d7b214"
+down_revision = "c2d8f4a6e913"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute(
+        "CREATE VIRTUAL TABLE articles_fts USING fts5("
+        "title, description, body, content='articles', content_rowid='id', "
+        "tokenize='unicode61 remove_diacritics 2')"
+    )
+    op.execute(
+        "CREATE TRIGGER articles_fts_ai AFTER INSERT ON articles BEGIN "
+        "INSERT INTO articles_fts(rowid, title, description, body) "
+        "VALUES (new.id, new.title, new.description, new.body); END"
+    )
+    op.execute(
+        "CREATE TRIGGER articles_fts_ad AFTER DELETE ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+        "VALUES ('delete', old.id, old.title, old.description, old.body); END"
+    )
+    op.execute(
+        "CREATE TRIGGER articles_fts_au "
+        "AFTER UPDATE OF title, description, body ON articles BEGIN "
+        "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+        "VALUES ('delete', old.id, old.title, old.description, old.body); "
+        "INSERT INTO articles_fts(rowid, title, description, body) "
+        "VALUES (new.id, new.title, new.description, new.body); END"
+    )
+    # Indexer les articles existants
+    op.execute("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_au")
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_ad")
+    op.execute("DROP TRIGGER IF EXISTS articles_fts_ai")
+    op.execute("DROP TABLE IF EXISTS articles_fts")
@@ -0,0 +1,72 @@
+"""Consolidate user_following into user_follows
+
+Revision ID: f3b7a1d9c526
+Revises: e5a9c3d7b214
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "f3b7a1d9c526"
+down_revision = "e5a9c3d7b214"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Reporter les relations de l'ancienne table (doublons et auto-suivis ignorés)
+    op.execute(
+        "INSERT OR IGNORE INTO user_follows (follower_id, followed_id) "
+        "SELECT follower_id, followed_id FROM user_following "
+        "WHERE follower_id != followed_id"
+    )
+    # Les relations reportées alimentent aussi les compteurs et le fil d'actualité
+    op.execute(
+        "UPDATE users SET "
+        "followers_count = (SELECT COUNT(*) FROM user_follows "
+        "WHERE user_follows.followed_id = users.id), "
+        "following_count = (SELECT COUNT(*) FROM user_follows "
+        "WHERE user_follows.follower_id = users.id)"
+    )
+    # Même borne qu'un nouvel abonnement (FEED_BACKFILL_LIMIT, 200 par défaut) ;
+    # les auteurs au-delà de FEED_FANOUT_MAX_FOLLOWERS (10000) sont lus à la
+    # demande par le fil et n'ont pas d'entrées
+    op.execute(
+        "INSERT OR IGNORE INTO timeline_entries "
+        "(user_id, article_id, author_id, created_at) "
+        "SELECT user_follows.follower_id, recent.id, recent.author_id, "
+        "recent.created_at FROM user_follows "
+        "JOIN users ON users.id = user_follows.followed_id "
+        "JOIN (SELECT id, author_id, created_at, ROW_NUMBER() OVER ("
+        "PARTITION BY author_id ORDER BY created_at DESC, id DESC) AS position "
+        "FROM articles) AS recent "
+        "ON recent.author_id = user_follows.followed_id AND recent.position <= 200 "
+        "WHERE users.followers_count <= 10000"
+    )
+    op.drop_table("user_following")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        "user_following",
+        sa.Column("follower_id", sa.Integer(), nullable=False),
+        sa.Column("followed_id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["followed_id"],
+            ["users.id"],
+        ),
+        sa.ForeignKeyConstraint(
+            ["follower_id"],
+            ["users.id"],
+        ),
+        sa.PrimaryKeyConstraint("follower_id", "followed_id"),
+    )
+    # Les relations restent aussi dans user_follows, désormais la seule lue
+    op.execute(
+        "INSERT INTO user_following (follower_id, followed_id) "
+        "SELECT follower_id, followed_id FROM user_follows"
+    )
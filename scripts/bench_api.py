@@ -0,0 +1,521 @@
+"""Banc d'essai HTTP de l'API, exécuté en mémoire sur une base peuplée.
+
+Pilote la vraie application (`api:app`) via le transport ASGI de httpx, sur
+une copie de travail d'une base générée par `generate_dataset.py` (ou d'une
+base fournie par `--database`). Chaque scénario correspond à un routeur
+(articles, commentaires, profils, tags, utilisateurs) et tire ses requêtes
+selon un mélange pondéré, avec `--concurrency` clients simultanés.
+
+Pour chaque scénario et chaque type de requête, le rapport donne les latences
+p50/p95/p99, le débit, le nombre moyen de requêtes SQL par requête HTTP et les
+erreurs. Les résultats sont enregistrés en JSON (`--output`) ; le test
+tests/test_bench_regression.py les prend comme référence (`--bench-baseline`)
+et échoue si un p95 ou un débit se dégrade, ou si le nombre de requêtes SQL
+par requête HTTP augmente.
+
+Usage : python scripts/bench_api.py [--scale 0.01 | --database loadtest.db]
+        [--requests 500] [--concurrency 8] [--scenarios articles,tags]
+        [--output results.json]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import httpx
+
+from core.sql_events import install_statement_hooks, track_statements
+
+ROOT = Path(__file__).parent.parent
+
+Request = Tuple[str, str, dict]
+
+
+@dataclass
+class Context:
+    """Données échantillonnées dans la base, partagées par les scénarios."""
+
+    rng: random.Random
+    slugs: List[str]
+    hot_slugs: List[str]
+    usernames: List[str]
+    tags: List[str]
+    tokens: Dict[int, str]
+    authored: List[Tuple[int, str]]
+    password: str
+    serial: int = 0
+
+    def auth(self, user_id: Optional[int] = None) -> dict:
+        if user_id is None:
+            user_id = self.rng.choice(list(self.tokens))
+        return {"Authorization": f"Bearer {self.tokens[user_id]}"}
+
+    def slug(self) -> str:
+        # Un tiers des lectures vise les articles les plus commentés
+        if self.rng.random() < 0.33:
+            return self.rng.choice(self.hot_slugs)
+        return self.rng.choice(self.slugs)
+
+    def next_serial(self) -> int:
+        self.serial += 1
+        return self.serial
+
+
+RequestFactory = Callable[[Context], Request]
+
+
+def _get(path: str, headers: Optional[dict] = None) -> Request:
+    return "GET", path, {"headers": headers or {}}
+
+
+SEARCH_TERMS = ["python", "cache", "index latence"]
+
+SCENARIOS: Dict[str, List[Tuple[float, str, RequestFactory]]] = {
+    "articles": [
+        (25, "GET /articles", lambda c: _get("/articles?limit=20")),
+        (
+            10,
+            "GET /articles?tag",
+            lambda c: _get(f"/articles?tag={c.rng.choice(c.tags)}"),
+        ),
+        (
+            5,
+            "GET /articles?author",
+            lambda c: _get(f"/articles?author={c.rng.choice(c.usernames)}"),
+        ),
+        (15, "GET /articles/feed", lambda c: _get("/articles/feed", c.auth())),
+        (25, "GET /articles/{slug}", lambda c: _get(f"/articles/{c.slug()}", c.auth())),
+        (
+            5,
+            "GET /articles/search",
+            lambda c: _get(f"/articles/search?q={c.rng.choice(SEARCH_TERMS)}"),
+        ),
+        (
+            5,
+            "POST /articles/{slug}/favorite",
+            lambda c: ("POST", f"/articles/{c.slug()}/favorite", {"headers": c.auth()}),
+        ),
+        (
+            4,
+            "DELETE /articles/{slug}/favorite",
+            lambda c: (
+                "DELETE",
+                f"/articles/{c.slug()}/favorite",
+                {"headers": c.auth()},
+            ),
+        ),
+        (
+            3,
+            "POST /articles",
+            lambda c: (
+                "POST",
+                "/articles",
+                {
+                    "headers": c.auth(),
+                    "json": {
+                        "article": {
+                            "title": f"Bench article {c.next_serial()}",
+                            "description": "Benchmark",
+                            "body": "Corps de l'article de benchmark. " * 20,
+                            "tagList": c.rng.sample(c.tags, 2),
+                        }
+                    },
+                },
+            ),
+        ),
+        (3, "PUT /articles/{slug}", lambda c: _update_article(c)),
+    ],
+    "comments": [
+        (
+            80,
+            "GET /articles/{slug}/comments",
+            lambda c: _get(f"/articles/{c.slug()}/comments"),
+        ),
+        (
+            20,
+            "POST /articles/{slug}/comments",
+            lambda c: (
+                "POST",
+                f"/articles/{c.slug()}/comments",
+                {
+                    "headers": c.auth(),
+                    "json": {"comment": {"body": "Commentaire de benchmark"}},
+                },
+            ),
+        ),
+    ],
+    "profiles": [
+        (
+            80,
+            "GET /profiles/{username}",
+            lambda c: _get(f"/profiles/{c.rng.choice(c.usernames)}", c.auth()),
+        ),
+        (10, "POST /profiles/{username}/follow", lambda c: _follow(c, "POST")),
+        (10, "DELETE /profiles/{username}/follow", lambda c: _follow(c, "DELETE")),
+    ],
+    "tags": [
+        (100, "GET /tags", lambda c: _get("/tags")),
+    ],
+    "users": [
+        (70, "GET /user", lambda c: _get("/user", c.auth())),
+        (25, "PUT /user", lambda c: _update_user(c)),
+        (
+            5,
+            "POST /users/login",
+            lambda c: (
+                "POST",
+                "/users/login",
+                {
+                    "json": {
+                        "user_input": {
+                            "email": f"{c.rng.choice(c.usernames)}@example.com",
+                            "password": c.password,
+                        }
+                    }
+                },
+            ),
+        ),
+    ],
+}
+
+
+def _update_article(ctx: Context) -> Request:
+    # Sans changer le titre : le slug reste valide pour les requêtes suivantes
+    user_id, slug = ctx.rng.choice(ctx.authored)
+    return (
+        "PUT",
+        f"/articles/{slug}",
+        {
+            "headers": ctx.auth(user_id),
+            "json": {"article": {"description": f"Révision {ctx.next_serial()}"}},
+        },
+    )
+
+
+def _update_user(ctx: Context) -> Request:
+    # Sans changer le nom d'utilisateur : les tokens restent valides
+    return (
+        "PUT",
+        "/user",
+        {"headers": ctx.auth(), "json": {"user": {"bio": f"Bio {ctx.next_serial()}"}}},
+    )
+
+
+def _follow(ctx: Context, method: str) -> Request:
+    return (
+        method,
+        f"/profiles/{ctx.rng.choice(ctx.usernames)}/follow",
+        {"headers": ctx.auth()},
+    )
+
+
+@dataclass
+class Samples:
+    latencies: List[float] = field(default_factory=list)
+    queries: List[int] = field(default_factory=list)
+    errors: int = 0
+
+
+def percentile(ordered: List[float], q: float) -> float:
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+def summarize(samples: Samples) -> dict:
+    ordered = sorted(samples.latencies)
+    return {
+        "count": len(ordered),
+        "errors": samples.errors,
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "mean_ms": round(sum(ordered) / len(ordered), 3),
+        "queries_per_request": round(sum(samples.queries) / len(samples.queries), 2),
+    }
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: Context,
+    mix: List[Tuple[float, str, RequestFactory]],
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> dict:
+    """Exécute `requests` requêtes tirées du mélange par `concurrency` clients."""
+    weights = [weight for weight, _, _ in mix]
+    by_label: Dict[str, Samples] = {label: Samples() for _, label, _ in mix}
+    remaining = warmup + requests
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal remaining, issued
+        while remaining > 0:
+            remaining -= 1
+            measured = issued >= warmup
+            issued += 1
+            _, label, factory = ctx.rng.choices(mix, weights=weights)[0]
+            method, path, kwargs = factory(ctx)
+
+            # Activité SQL reprise par l'application (core/sql_events.py)
+            with track_statements() as activity:
+                start = time.perf_counter()
+                try:
+                    response = await client.request(method, path, **kwargs)
+                    failed = response.status_code >= 400
+                except Exception:
+                    failed = True
+                elapsed = (time.perf_counter() - start) * 1000
+
+            if measured:
+                samples = by_label[label]
+                samples.latencies.append(elapsed)
+                samples.queries.append(activity.statements)
+                samples.errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    total = Samples()
+    for samples in by_label.values():
+        total.latencies.extend(samples.latencies)
+        total.queries.extend(samples.queries)
+        total.errors += samples.errors
+
+    return {
+        # Le débit inclut l'échauffement, exécuté dans la même fenêtre
+        "throughput_rps": round((warmup + requests) / elapsed, 1),
+        **summarize(total),
+        "endpoints": {
+            label: summarize(samples)
+            for label, samples in by_label.items()
+            if samples.latencies
+        },
+    }
+
+
+async def build_context(session_factory, rng: random.Random, password: str) -> Context:
+    from sqlalchemy import desc, func, select
+
+    from models.article_sql import ArticleModel, ArticleTag
+    from models.user_sql import UserModel
+    from utils.security import create_access_token
+
+    async with session_factory() as session:
+        slugs = (
+            (
+                await session.execute(
+                    select(ArticleModel.slug).order_by(func.random()).limit(2_000)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        hot_slugs = (
+            (
+                await session.execute(
+                    select(ArticleModel.slug)
+                    .order_by(desc(ArticleModel.comments_count))
+                    .limit(50)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        users = (
+            await session.execute(
+                select(UserModel.id, UserModel.username)
+                .order_by(func.random())
+                .limit(500)
+            )
+        ).all()
+        tags = (
+            (
+                await session.execute(
+                    select(ArticleTag.name).order_by(ArticleTag.id).limit(100)
+                )
+            )
+            .scalars()
+            .all()
+        )
+        authored = (
+            await session.execute(
+                select(ArticleModel.author_id, ArticleModel.slug)
+                .where(ArticleModel.author_id.in_([user.id for user in users]))
+                .limit(500)
+            )
+        ).all()
+
+    tokens = {
+        user.id: create_access_token(
+            {"sub": user.username}, expires_delta=timedelta(hours=12)
+        )
+        for user in users
+    }
+    return Context(
+        rng=rng,
+        slugs=list(slugs),
+        hot_slugs=list(hot_slugs),
+        usernames=[user.username for user in users],
+        tags=list(tags),
+        tokens=tokens,
+        authored=[(row.author_id, row.slug) for row in authored],
+        password=password,
+    )
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return (
+            subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                cwd=ROOT,
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+            or None
+        )
+    except OSError:
+        return None
+
+
+def print_report(results: dict) -> None:
+    header = (
+        f"{'requête':>36} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} "
+        f"{'SQL/req':>8} {'err':>5}"
+    )
+    for name, scenario in results["scenarios"].items():
+        print(
+            f"\n[{name}] {scenario['throughput_rps']} req/s, "
+            f"{scenario['errors']} erreurs"
+        )
+        print(header)
+        for label, stats in scenario["endpoints"].items():
+            print(
+                f"{label:>36} {stats['count']:>6} {stats['p50_ms']:>8.2f} "
+                f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} "
+                f"{stats['queries_per_request']:>8.2f} {stats['errors']:>5}"
+            )
+
+
+async def run(args, database: Path) -> dict:
+    from api import app
+    from database import async_read_session, engine, read_engine
+
+    for target in (engine, read_engine):
+        install_statement_hooks(target)
+
+    rng = random.Random(args.seed)
+    ctx = await build_context(async_read_session, rng, args.password)
+
+    results = {
+        "meta": {
+            "timestamp": datetime.now().isoformat(timespec="seconds"),
+            "revision": git_revision(),
+            "database": str(args.database or f"generate_dataset --scale {args.scale}"),
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "warmup": args.warmup,
+            "seed": args.seed,
+        },
+        "scenarios": {},
+    }
+
+    # Démarrage et arrêt de l'application (regroupeur d'écritures, etc.)
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            for name in args.scenarios:
+                print(f"scénario {name}...", flush=True)
+                results["scenarios"][name] = await run_scenario(
+                    client,
+                    ctx,
+                    SCENARIOS[name],
+                    args.requests,
+                    args.concurrency,
+                    args.warmup,
+                )
+    await engine.dispose()
+    await read_engine.dispose()
+    return results
+
+
+def prepare_database(args, workdir: Path) -> Path:
+    """Copie de travail de la base (les scénarios écrivent), générée au besoin."""
+    target = workdir / "bench.db"
+    if args.database:
+        source = sqlite3.connect(args.database)
+        destination = sqlite3.connect(target)
+        source.backup(destination)
+        destination.close()
+        source.close()
+    else:
+        from generate_dataset import DEFAULTS, generate
+
+        spec = DEFAULTS.scaled(args.scale)
+        print(f"génération du jeu de données (--scale {args.scale})...", flush=True)
+        asyncio.run(generate(target, spec))
+    return target
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--database", type=Path, help="base peuplée à copier (sinon générée)"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=0.01, help="volume du jeu généré"
+    )
+    parser.add_argument(
+        "--password", default="password", help="mot de passe des utilisateurs"
+    )
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument(
+        "--requests", type=int, default=500, help="requêtes mesurées par scénario"
+    )
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", type=Path, help="fichier JSON des résultats")
+    args = parser.parse_args()
+
+    args.scenarios = [
+        name.strip() for name in args.scenarios.split(",") if name.strip()
+    ]
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"scénarios inconnus : {', '.join(sorted(unknown))}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database = Path(tmp) / "bench.db"
+        # À définir avant tout import de l'application (lecture des settings)
+        os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+        prepare_database(args, Path(tmp))
+        results = asyncio.run(run(args, database))
+
+    print_report(results)
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False))
+        print(f"\nrésultats enregistrés dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
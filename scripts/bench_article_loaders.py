@@ -0,0 +1,247 @@
+"""Compare les chargeurs d'article dédiés à l'ancien chargement par jointures.
+
+Prépare un article de `--comments` commentaires et `--tags` tags sur une base
+temporaire, puis mesure pour chaque chargeur le temps moyen, le nombre de
+requêtes, le nombre de lignes renvoyées par SQLite et le nombre d'objets ORM
+instanciés :
+
+- l'ancien chargement (jointures auteur + tags + commentaires et leurs auteurs),
+  qui multiplie les lignes (commentaires x tags) ;
+- la vue détail (projection à plat + tags) ;
+- la référence minimale utilisée par les mutations (id, author_id) ;
+- la suppression par cascade ORM, comparée aux DELETE directs.
+
+Usage : python scripts/bench_article_loaders.py [--comments 1000] [--tags 10]
+        [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import event, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import joinedload, sessionmaker
+
+from database import Base
+from models.article_sql import ArticleModel, ArticleTag, CommentModel, article_tags
+from models.user_sql import UserModel
+from repositories.article_repository import (
+    delete_article,
+    get_article_ref,
+    get_article_row_by_slug,
+)
+from repositories.feed_repository import remove_article_from_timelines
+
+USERS = 100
+
+
+async def seed(engine, tags: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"}
+                for i in range(1, USERS + 1)
+            ],
+        )
+        await conn.execute(
+            insert(ArticleTag),
+            [{"id": i, "name": f"tag{i}"} for i in range(1, tags + 1)],
+        )
+
+
+async def insert_article(engine, article_id: int, comments: int, tags: int) -> str:
+    """Insère un article avec ses commentaires et ses tags ; retourne son slug."""
+    slug = f"article-{article_id}"
+    start = datetime(2020, 1, 1)
+    async with engine.begin() as conn:
+        await conn.execute(
+            insert(ArticleModel),
+            [
+                {
+                    "id": article_id,
+                    "slug": slug,
+                    "title": f"Article {article_id}",
+                    "description": "Benchmark",
+                    "body": "Body " * 200,
+                    "author_id": 1,
+                    "comments_count": comments,
+                }
+            ],
+        )
+        await conn.execute(
+            insert(article_tags),
+            [{"article_id": article_id, "tag_id": i} for i in range(1, tags + 1)],
+        )
+        await conn.execute(
+            insert(CommentModel),
+            [
+                {
+                    "body": f"Commentaire {i}",
+                    "article_id": article_id,
+                    "author_id": i % USERS + 1,
+                    "created_at": start + timedelta(seconds=i),
+                    "updated_at": start + timedelta(seconds=i),
+                }
+                for i in range(comments)
+            ],
+        )
+    return slug
+
+
+async def legacy_load(session: AsyncSession, slug: str) -> ArticleModel:
+    """Ancien chargement : toutes les relations en jointures dans une même requête."""
+    query = (
+        select(ArticleModel)
+        .options(
+            joinedload(ArticleModel.author),
+            joinedload(ArticleModel.tags),
+            joinedload(ArticleModel.comments).joinedload(CommentModel.author),
+        )
+        .where(ArticleModel.slug == slug)
+    )
+    result = await session.execute(query)
+    return result.unique().scalar_one()
+
+
+async def legacy_delete(session: AsyncSession, slug: str) -> None:
+    """Ancienne suppression : chargement complet puis cascade ORM."""
+    article = await legacy_load(session, slug)
+    await remove_article_from_timelines(session, article.id)
+    await session.delete(article)
+    await session.commit()
+
+
+async def ref_delete(session: AsyncSession, slug: str) -> None:
+    """Nouvelle suppression : référence minimale puis DELETE directs."""
+    ref = await get_article_ref(session, slug)
+    await delete_article(session, ref.id)
+
+
+class Probe:
+    """Compte les requêtes émises et les lignes qu'elles renvoient."""
+
+    def __init__(self, engine) -> None:
+        self.engine = engine
+        self.statements = []
+        event.listen(engine.sync_engine, "before_cursor_execute", self._capture)
+
+    def _capture(self, conn, cursor, statement, parameters, context, executemany):
+        if not executemany:
+            self.statements.append((statement, parameters))
+
+    async def rows(self) -> int:
+        """Rejoue les SELECT capturés pour compter les lignes qu'ils renvoient."""
+        total = 0
+        async with self.engine.connect() as conn:
+            for statement, parameters in self.statements:
+                if not statement.lstrip().upper().startswith("SELECT"):
+                    continue
+                result = await conn.exec_driver_sql(
+                    f"SELECT count(*) FROM ({statement})", parameters
+                )
+                total += result.scalar_one()
+        return total
+
+
+async def measure_load(
+    engine, session_factory, label: str, loader, slug: str, repeat: int
+) -> None:
+    elapsed = 0.0
+    for _ in range(repeat):
+        async with session_factory() as session:
+            start = time.perf_counter()
+            await loader(session, slug)
+            elapsed += time.perf_counter() - start
+
+    probe = Probe(engine)
+    async with session_factory() as session:
+        # Garder le résultat : la carte d'identité ne retient les objets que faiblement
+        result = await loader(session, slug)
+        objects = len(session.identity_map)
+        del result
+    event.remove(engine.sync_engine, "before_cursor_execute", probe._capture)
+    statements = probe.statements
+    rows = await probe.rows()
+
+    print(
+        f"{label:>28} {elapsed / repeat * 1000:>9.2f} {len(statements):>9} "
+        f"{rows:>9} {objects:>9}"
+    )
+
+
+async def measure_delete(
+    engine, session_factory, label: str, deleter, args, repeat: int
+) -> None:
+    elapsed = 0.0
+    for i in range(repeat):
+        slug = await insert_article(engine, 1_000 + i, args.comments, args.tags)
+        async with session_factory() as session:
+            start = time.perf_counter()
+            await deleter(session, slug)
+            elapsed += time.perf_counter() - start
+
+        async with session_factory() as session:
+            remaining = (
+                await session.execute(
+                    select(CommentModel.id)
+                    .where(CommentModel.article_id == 1_000 + i)
+                    .limit(1)
+                )
+            ).first()
+        if remaining is not None:
+            raise SystemExit(f"{label} : commentaires orphelins après suppression")
+
+    print(f"{label:>28} {elapsed / repeat * 1000:>9.2f}")
+
+
+async def main(args) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "bench.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+        await seed(engine, args.tags)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        slug = await insert_article(engine, 1, args.comments, args.tags)
+
+        print(f"Article de {args.comments} commentaires et {args.tags} tags")
+        print(f"{'chargeur':>28} {'ms':>9} {'requêtes':>9} {'lignes':>9} {'objets':>9}")
+        loaders = (
+            ("jointures (ancien)", legacy_load),
+            ("vue détail (projection)", get_article_row_by_slug),
+            ("référence (mutations)", get_article_ref),
+        )
+        for label, loader in loaders:
+            await measure_load(
+                engine, session_factory, label, loader, slug, args.repeat
+            )
+
+        delete_repeat = max(1, args.repeat // 4)
+        print(f"\n{'suppression':>28} {'ms':>9}")
+        deleters = (
+            ("cascade ORM (ancien)", legacy_delete),
+            ("DELETE directs", ref_delete),
+        )
+        for label, deleter in deleters:
+            await measure_delete(
+                engine, session_factory, label, deleter, args, delete_repeat
+            )
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--comments", type=int, default=1_000)
+    parser.add_argument("--tags", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
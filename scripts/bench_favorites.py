@@ -0,0 +1,154 @@
+"""Vérifie que le coût d'une mise en favori ne dépend pas du nombre de favoris.
+
+Pour chaque taille de `--sizes`, prépare sur une base temporaire un article
+déjà mis en favori par autant d'utilisateurs, puis mesure le temps moyen d'un
+aller-retour favori + retrait (compteur compris) avec l'implémentation
+actuelle (INSERT OR IGNORE / DELETE directs) et avec l'ancienne, qui chargeait
+la liste complète des favoris. Vérifie aussi l'idempotence et le compteur.
+
+Usage : python scripts/bench_favorites.py [--sizes 10,10000,200000] [--repeat 200]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import selectinload, sessionmaker
+
+from database import Base
+from models.article_sql import ArticleModel, article_favorites
+from models.user_sql import UserModel
+from repositories.article_repository import favorite_article, unfavorite_article
+
+ARTICLE_ID = 1
+CLICKER_ID = 1
+
+
+async def seed(engine, favorites: int) -> None:
+    """Un article, `favorites` favoris existants et un utilisateur qui clique."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        users = [
+            {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"}
+            for i in range(1, favorites + 2)
+        ]
+        for start in range(0, len(users), 50_000):
+            await conn.execute(insert(UserModel), users[start : start + 50_000])
+        await conn.execute(
+            insert(ArticleModel),
+            [
+                {
+                    "id": ARTICLE_ID,
+                    "slug": "article-1",
+                    "title": "Article 1",
+                    "description": "Benchmark",
+                    "body": "Body",
+                    "author_id": CLICKER_ID,
+                    "favorites_count": favorites,
+                }
+            ],
+        )
+        rows = [
+            {"article_id": ARTICLE_ID, "user_id": i} for i in range(2, favorites + 2)
+        ]
+        for start in range(0, len(rows), 50_000):
+            await conn.execute(insert(article_favorites), rows[start : start + 50_000])
+
+
+async def legacy_toggle(session: AsyncSession, favorited: bool) -> None:
+    """Ancienne implémentation : charge la liste des favoris avant de la modifier."""
+    query = (
+        select(ArticleModel)
+        .options(selectinload(ArticleModel.favorited_by))
+        .where(ArticleModel.id == ARTICLE_ID)
+    )
+    article = (await session.execute(query)).scalar_one()
+    query = select(UserModel).where(UserModel.id == CLICKER_ID)
+    user = (await session.execute(query)).scalar_one()
+    if favorited and user not in article.favorited_by:
+        article.favorited_by.append(user)
+        delta = 1
+    elif not favorited and user in article.favorited_by:
+        article.favorited_by.remove(user)
+        delta = -1
+    else:
+        delta = 0
+    await session.execute(
+        update(ArticleModel)
+        .where(ArticleModel.id == ARTICLE_ID)
+        .values(favorites_count=ArticleModel.favorites_count + delta)
+    )
+    await session.commit()
+
+
+async def current_toggle(session: AsyncSession, favorited: bool) -> None:
+    if favorited:
+        await favorite_article(session, ARTICLE_ID, CLICKER_ID)
+    else:
+        await unfavorite_article(session, ARTICLE_ID, CLICKER_ID)
+
+
+async def measure(session_factory, toggle, repeat: int) -> float:
+    """Temps moyen (ms) d'un aller-retour favori + retrait, une session par requête."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for favorited in (True, False):
+            async with session_factory() as session:
+                await toggle(session, favorited)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+async def check(session_factory, favorites: int) -> None:
+    """Double favori puis double retrait : l'état et le compteur restent cohérents."""
+    async with session_factory() as session:
+        states = [
+            await favorite_article(session, ARTICLE_ID, CLICKER_ID),
+            await favorite_article(session, ARTICLE_ID, CLICKER_ID),
+            await unfavorite_article(session, ARTICLE_ID, CLICKER_ID),
+            await unfavorite_article(session, ARTICLE_ID, CLICKER_ID),
+        ]
+    observed = [(state.favorited, state.favorites_count) for state in states]
+    expected = [
+        (True, favorites + 1),
+        (True, favorites + 1),
+        (False, favorites),
+        (False, favorites),
+    ]
+    if observed != expected:
+        raise SystemExit(f"États inattendus : {observed} (attendus : {expected})")
+
+
+async def main(sizes, repeat: int, legacy_repeat: int) -> None:
+    print(f"{'favoris':>10} {'actuel (ms)':>12} {'ancien (ms)':>12}")
+    for favorites in sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = os.path.join(tmp, "bench.db")
+            engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+            await seed(engine, favorites)
+            session_factory = sessionmaker(
+                engine, class_=AsyncSession, expire_on_commit=False
+            )
+
+            await check(session_factory, favorites)
+            current = await measure(session_factory, current_toggle, repeat)
+            legacy = await measure(session_factory, legacy_toggle, legacy_repeat)
+            await engine.dispose()
+        print(f"{favorites:>10} {current:>12.2f} {legacy:>12.2f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", default="10,10000,200000")
+    parser.add_argument("--repeat", type=int, default=200)
+    parser.add_argument("--legacy-repeat", type=int, default=3)
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(",")]
+    asyncio.run(main(sizes, args.repeat, args.legacy_repeat))
@@ -0,0 +1,104 @@
+"""Compare le coût d'une page profonde en pagination offset et par curseur.
+
+Usage : python scripts/bench_pagination.py [--articles 50000] [--limit 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models.article_sql import ArticleModel
+from models.user_sql import UserModel
+from repositories.article_repository import get_articles
+from utils.pagination import next_cursor
+
+
+async def seed(engine, count: int) -> None:
+    """Insère `count` articles en masse pour un seul auteur."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserModel),
+            [{"id": 1, "username": "bench", "email": "bench@example.com"}],
+        )
+        start = datetime(2020, 1, 1)
+        rows = [
+            {
+                "slug": f"article-{i}",
+                "title": f"Article {i}",
+                "description": "Benchmark",
+                "body": "Lorem ipsum",
+                "author_id": 1,
+                # Quelques horodatages identiques pour exercer le départage par id
+                "created_at": start + timedelta(seconds=i // 2),
+                "updated_at": start,
+            }
+            for i in range(count)
+        ]
+        await conn.execute(insert(ArticleModel), rows)
+
+
+async def timed(session: AsyncSession, repeat: int, **kwargs) -> float:
+    """Retourne la durée moyenne (ms) d'un appel à get_articles."""
+    elapsed = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        await get_articles(session, **kwargs)
+        elapsed += time.perf_counter() - start
+    return elapsed / repeat * 1000
+
+
+async def cursor_for_page(session: AsyncSession, page: int, limit: int) -> str:
+    """Parcourt les pages par curseur jusqu'à la page demandée."""
+    cursor = None
+    for _ in range(page - 1):
+        articles = await get_articles(session, limit=limit, cursor=cursor)
+        cursor = next_cursor(articles, limit)
+    return cursor
+
+
+async def main(count: int, limit: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "bench.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+        await seed(engine, count)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+
+        last_page = count // limit
+        pages = sorted({1, max(1, last_page // 10), max(1, last_page // 2), last_page})
+
+        print(f"{count} articles, limit={limit}, moyenne sur {repeat} appels")
+        print(f"{'page':>8} {'offset (ms)':>12} {'cursor (ms)':>12}")
+        async with session_factory() as session:
+            for page in pages:
+                offset_ms = await timed(
+                    session, repeat, limit=limit, offset=(page - 1) * limit
+                )
+                cursor = await cursor_for_page(session, page, limit)
+                cursor_ms = await timed(session, repeat, limit=limit, cursor=cursor)
+                print(f"{page:>8} {offset_ms:>12.2f} {cursor_ms:>12.2f}")
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=50_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    asyncio.run(main(args.articles, args.limit, args.repeat))
@@ -0,0 +1,160 @@
+"""Compare la sérialisation des listes d'articles : chemin pydantic et chemin rapide.
+
+Le chemin pydantic est celui d'origine (objets ORM, validation from_attributes
+puis revalidation par le response_model de FastAPI) ; le chemin rapide construit
+la réponse depuis des lignes à plat et l'encode avec FastJSONResponse. Les deux
+sont mesurés de bout en bout via une application FastAPI en mémoire.
+
+Usage : python scripts/bench_serialization.py [--articles 2000] [--repeat 20]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import httpx
+from fastapi import FastAPI
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from core.responses import FastJSONResponse, orjson
+from database import Base
+from models.article_sql import ArticleModel, ArticleTag, article_tags
+from models.user_sql import UserModel
+from repositories.article_repository import get_article_rows_page, get_articles_page
+from schemas.article import MultipleArticlesResponse
+from schemas.serializers import serialize_article_rows
+from utils.pagination import next_cursor
+
+LIMITS = (20, 100, 500)
+
+
+async def seed(engine, count: int) -> None:
+    """Insère `count` articles de taille réaliste, avec trois tags chacun."""
+    body = "Lorem ipsum dolor sit amet. " * 40
+    start = datetime(2020, 1, 1)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"}
+                for i in range(1, 51)
+            ],
+        )
+        await conn.execute(
+            insert(ArticleTag), [{"id": i, "name": f"tag{i}"} for i in range(1, 21)]
+        )
+        await conn.execute(
+            insert(ArticleModel),
+            [
+                {
+                    "id": i,
+                    "slug": f"article-{i}",
+                    "title": f"Article {i}",
+                    "description": "Benchmark",
+                    "body": body,
+                    "author_id": i % 50 + 1,
+                    "created_at": start + timedelta(minutes=i),
+                    "updated_at": start + timedelta(minutes=i),
+                }
+                for i in range(1, count + 1)
+            ],
+        )
+        await conn.execute(
+            insert(article_tags),
+            [
+                {"article_id": i, "tag_id": (i + k) % 20 + 1}
+                for i in range(1, count + 1)
+                for k in range(3)
+            ],
+        )
+
+
+def build_app(session_factory) -> FastAPI:
+    """Application minimale exposant les deux chemins de sérialisation."""
+    app = FastAPI()
+
+    @app.get("/pydantic", response_model=MultipleArticlesResponse)
+    async def pydantic_path(limit: int):
+        async with session_factory() as session:
+            articles, total = await get_articles_page(session, limit=limit)
+        return MultipleArticlesResponse.from_article_instances(
+            articles, total_count=total, next_cursor=next_cursor(articles, limit)
+        )
+
+    @app.get("/fast", response_model=MultipleArticlesResponse)
+    async def fast_path(limit: int):
+        async with session_factory() as session:
+            rows, tags_by_article, total = await get_article_rows_page(
+                session, limit=limit
+            )
+        return FastJSONResponse(
+            serialize_article_rows(
+                rows, tags_by_article, total, next_cursor=next_cursor(rows, limit)
+            )
+        )
+
+    return app
+
+
+async def timed(client: httpx.AsyncClient, path: str, limit: int, repeat: int) -> float:
+    """Retourne la durée moyenne (ms) d'une requête, après un appel de chauffe."""
+    await client.get(path, params={"limit": limit})
+    elapsed = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = await client.get(path, params={"limit": limit})
+        elapsed += time.perf_counter() - start
+        response.raise_for_status()
+    return elapsed / repeat * 1000
+
+
+async def main(count: int, repeat: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        database = os.path.join(tmp, "bench.db")
+        engine = create_async_engine(f"sqlite+aiosqlite:///{database}")
+        await seed(engine, count)
+        session_factory = sessionmaker(
+            engine, class_=AsyncSession, expire_on_commit=False
+        )
+        transport = httpx.ASGITransport(app=build_app(session_factory))
+
+        encoder = "orjson" if orjson is not None else "json (orjson absent)"
+        print(f"{count} articles, encodeur {encoder}, moyenne sur {repeat} requêtes")
+        print(f"{'limit':>6} {'pydantic (ms)':>14} {'rapide (ms)':>12} {'gain':>6}")
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://bench"
+        ) as client:
+            # Les deux chemins doivent produire le même document
+            for limit in LIMITS:
+                slow = (await client.get("/pydantic", params={"limit": limit})).json()
+                fast = (await client.get("/fast", params={"limit": limit})).json()
+                if slow != fast:
+                    raise SystemExit(f"Réponses divergentes pour limit={limit}")
+
+            for limit in LIMITS:
+                slow_ms = await timed(client, "/pydantic", limit, repeat)
+                fast_ms = await timed(client, "/fast", limit, repeat)
+                print(
+                    f"{limit:>6} {slow_ms:>14.2f} {fast_ms:>12.2f} "
+                    f"{slow_ms / fast_ms:>5.1f}x"
+                )
+
+        await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--articles", type=int, default=2_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    asyncio.run(main(args.articles, args.repeat))
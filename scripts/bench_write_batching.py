@@ -0,0 +1,138 @@
+"""Compare le débit des petites écritures avec et sans regroupement des commits.
+
+Lance `--ops` mises en favori concurrentes (couples article/utilisateur
+distincts) sur une base temporaire configurée comme l'application (connexion
+d'écriture unique, pragmas SQLite des settings), d'abord avec un commit par
+opération, puis via le regroupeur d'écritures. Une fraction des opérations
+vise un article inexistant pour vérifier l'isolation des erreurs.
+
+Usage : python scripts/bench_write_batching.py [--ops 2000] [--synchronous FULL]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from sqlalchemy import func, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+from database import Base, create_db_engine
+from models.article_sql import ArticleModel, article_favorites
+from models.user_sql import UserModel
+from repositories.article_repository import favorite_article
+from repositories.write_queue import start_write_batcher, stop_write_batcher
+from settings import Settings
+
+USERS = 100
+MISSING_ARTICLE_ID = 10**9
+
+
+async def seed(engine, articles: int) -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"}
+                for i in range(1, USERS + 1)
+            ],
+        )
+        await conn.execute(
+            insert(ArticleModel),
+            [
+                {
+                    "id": i,
+                    "slug": f"article-{i}",
+                    "title": f"Article {i}",
+                    "description": "Benchmark",
+                    "body": "Body",
+                    "author_id": 1,
+                }
+                for i in range(1, articles + 1)
+            ],
+        )
+
+
+async def favorite(session_factory, article_id: int, user_id: int) -> bool:
+    """Une requête : sa propre session, une écriture, True si elle a réussi."""
+    async with session_factory() as session:
+        article = await favorite_article(session, article_id, user_id)
+        return article is not None
+
+
+async def run(config: Settings, ops: int, batched: bool) -> float:
+    """Exécute `ops` favoris concurrents et retourne le débit (opérations/s)."""
+    articles = ops // USERS + 1
+    engine = create_db_engine(config)
+    await seed(engine, articles)
+    session_factory = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+
+    if batched:
+        await start_write_batcher(
+            session_factory,
+            max_batch_size=config.WRITE_BATCH_MAX_SIZE,
+            max_delay=config.WRITE_BATCH_MAX_DELAY_MS / 1000,
+        )
+
+    calls = []
+    for i in range(ops):
+        # Une opération sur 50 échoue (article inexistant : favorite_article
+        # retourne None)
+        article_id = MISSING_ARTICLE_ID if i % 50 == 0 else i // USERS + 1
+        calls.append(favorite(session_factory, article_id, i % USERS + 1))
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*calls)
+    elapsed = time.perf_counter() - start
+
+    if batched:
+        await stop_write_batcher()
+
+    async with session_factory() as session:
+        stored = (
+            await session.execute(select(func.count()).select_from(article_favorites))
+        ).scalar_one()
+        counted = (
+            await session.execute(select(func.sum(ArticleModel.favorites_count)))
+        ).scalar_one()
+    await engine.dispose()
+
+    succeeded = sum(results)
+    if not (stored == counted == succeeded):
+        raise SystemExit(
+            f"Incohérence : {succeeded} succès, {stored} favoris, compteurs = {counted}"
+        )
+    return ops / elapsed
+
+
+async def main(ops: int, synchronous: str) -> None:
+    print(f"{ops} mises en favori concurrentes, synchronous={synchronous}")
+    print(f"{'mode':>20} {'ops/s':>10}")
+    rates = {}
+    for batched in (False, True):
+        with tempfile.TemporaryDirectory() as tmp:
+            config = Settings(
+                DATABASE_URL=f"sqlite+aiosqlite:///{os.path.join(tmp, 'bench.db')}",
+                SQLITE_SYNCHRONOUS=synchronous,
+            )
+            label = "commit regroupé" if batched else "commit par requête"
+            rates[batched] = await run(config, ops, batched)
+            print(f"{label:>20} {rates[batched]:>10.0f}")
+    print(f"gain : {rates[True] / rates[False]:.1f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ops", type=int, default=2_000)
+    parser.add_argument(
+        "--synchronous", default="FULL", choices=["OFF", "NORMAL", "FULL"]
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.ops, args.synchronous))
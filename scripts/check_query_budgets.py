@@ -0,0 +1,47 @@
+"""Vérifie le nombre de requêtes SQL de chaque route face à son budget.
+
+Raccourci vers tests/test_query_budgets.py (budgets par route, N+1, requêtes
+indépendantes de la taille de page), exécuté par pytest sur une base générée
+par `generate_dataset.py` ou copiée depuis `--database`. Les autres options
+sont transmises à pytest.
+
+Usage : python scripts/check_query_budgets.py [--scale 0.01 | --database loadtest.db]
+        [options pytest]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+import pytest
+
+ROOT = Path(__file__).parent.parent
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument(
+        "--database", type=Path, help="base peuplée à copier (sinon générée)"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=0.01, help="volume du jeu généré"
+    )
+    args, pytest_args = parser.parse_known_args()
+
+    options = ["--dataset-scale", str(args.scale)]
+    if args.database:
+        options += ["--dataset", str(args.database.resolve())]
+    return pytest.main(
+        [
+            str(ROOT / "tests" / "test_query_budgets.py"),
+            "--rootdir",
+            str(ROOT),
+            *options,
+        ]
+        + pytest_args
+    )
+
+
+if __name__ == "__main__":
+    sys.exit(main())
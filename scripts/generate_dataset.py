@@ -0,0 +1,493 @@
+"""Génère un jeu de données synthétique volumineux pour les tests de charge.
+
+Crée une base SQLite neuve au schéma courant, puis la peuple par insertions
+en masse (SQLAlchemy Core, une grande transaction par table) :
+
+- utilisateurs partageant un même mot de passe, haché une seule fois ;
+- articles répartis sur `--days` jours, auteurs tirés selon une loi de Zipf ;
+- tags par article, favoris, abonnements et commentaires tirés eux aussi
+  selon des lois de Zipf (quelques articles, tags et auteurs très populaires,
+  une longue traîne d'éléments rares).
+
+Les index secondaires et le déclencheur d'indexation plein texte sont
+désactivés pendant le chargement puis reconstruits en une passe ; les
+compteurs dénormalisés et les timelines sont calculés en SQL à la fin, et la
+base est marquée à la dernière révision Alembic. Le même `--seed` produit
+toujours les mêmes données.
+
+Les volumes par défaut (1M articles) se génèrent en quelques minutes ;
+`--scale` les multiplie tous.
+
+Usage : python scripts/generate_dataset.py [--output loadtest.db] [--scale 1.0]
+        [--users 100000] [--articles 1000000] [--comments 3000000] [--seed 42]
+"""
+import argparse
+import asyncio
+import itertools
+import os
+import random
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Iterator, List, Sequence
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import func, insert, select, text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession, create_async_engine
+
+from database import Base
+from models.article_sql import (
+    ARTICLES_FTS_DDL,
+    ArticleModel,
+    ArticleTag,
+    CommentModel,
+    article_favorites,
+    article_tags,
+)
+from models.user_sql import UserModel, user_follows
+from repositories.counter_repository import recompute_counters
+from settings import settings
+from utils.security import get_password_hash
+
+ROOT = Path(__file__).parent.parent
+START = datetime(2024, 1, 1)
+
+WORDS = (
+    "python sqlite fastapi async index cache requête latence débit pool "
+    "serveur client réseau mémoire disque journal transaction verrou lecture "
+    "écriture schéma migration article commentaire profil abonné favori tag "
+    "recherche tri pagination curseur performance mesure charge test production "
+    "déploiement conteneur image volume sauvegarde restauration réplique "
+    "cluster noeud file message événement tâche planification erreur trace "
+    "métrique alerte tableau bord analyse rapport tendance croissance"
+).split()
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    """Volumes et paramètres de génération."""
+
+    users: int
+    articles: int
+    comments: int
+    favorites: int
+    follows: int
+    tags: int
+    max_tags_per_article: int
+    days: int
+    zipf_exponent: float
+    password: str
+    seed: int
+    batch_size: int
+
+    def scaled(self, scale: float) -> "DatasetSpec":
+        def size(value: int) -> int:
+            return max(1, int(value * scale))
+
+        return DatasetSpec(
+            users=max(2, size(self.users)),
+            articles=size(self.articles),
+            comments=size(self.comments),
+            favorites=size(self.favorites),
+            follows=size(self.follows),
+            tags=self.tags,
+            max_tags_per_article=self.max_tags_per_article,
+            days=self.days,
+            zipf_exponent=self.zipf_exponent,
+            password=self.password,
+            seed=self.seed,
+            batch_size=self.batch_size,
+        )
+
+
+class ZipfSampler:
+    """Tire des identifiants selon une loi de Zipf.
+
+    L'élément de rang k a un poids 1/k^s ; les rangs sont attribués aux
+    identifiants dans un ordre aléatoire (sauf `shuffle=False`, où l'identifiant
+    1 est le plus populaire).
+    """
+
+    def __init__(
+        self,
+        rng: random.Random,
+        ids: Sequence[int],
+        exponent: float,
+        shuffle: bool = True,
+    ) -> None:
+        self._rng = rng
+        self._ids = list(ids)
+        if shuffle:
+            rng.shuffle(self._ids)
+        self._cum_weights = list(
+            itertools.accumulate(
+                1 / rank**exponent for rank in range(1, len(self._ids) + 1)
+            )
+        )
+
+    def sample(self, k: int) -> List[int]:
+        return self._rng.choices(self._ids, cum_weights=self._cum_weights, k=k)
+
+
+class Generator:
+    """Produit les lignes de chaque table, par lots, à partir d'une graine."""
+
+    def __init__(self, spec: DatasetSpec) -> None:
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+        self.article_step = timedelta(days=spec.days) / max(spec.articles, 1)
+        # Corps d'articles assemblés à partir d'un réservoir de paragraphes
+        self.paragraphs = [
+            " ".join(self.rng.choices(WORDS, k=self.rng.randint(20, 80))).capitalize()
+            + "."
+            for _ in range(1_000)
+        ]
+        user_ids = range(1, spec.users + 1)
+        self.authors = ZipfSampler(self.rng, user_ids, spec.zipf_exponent)
+        self.celebrities = ZipfSampler(self.rng, user_ids, spec.zipf_exponent)
+        self.popular_articles = ZipfSampler(
+            self.rng, range(1, spec.articles + 1), spec.zipf_exponent
+        )
+        self.popular_tags = ZipfSampler(
+            self.rng, range(1, spec.tags + 1), spec.zipf_exponent, shuffle=False
+        )
+
+    def article_created_at(self, article_id: int) -> datetime:
+        return START + self.article_step * (article_id - 1)
+
+    def users(self, hashed_password: str) -> Iterator[dict]:
+        for i in range(1, self.spec.users + 1):
+            yield {
+                "id": i,
+                "username": f"user{i}",
+                "email": f"user{i}@example.com",
+                "hashed_password": hashed_password,
+                "bio": f"Bio de user{i}" if i % 3 else None,
+                "image": f"https://example.com/avatars/{i}.png" if i % 4 else None,
+                "created_at": START,
+                "updated_at": START,
+            }
+
+    def tags(self) -> Iterator[dict]:
+        for i in range(1, self.spec.tags + 1):
+            yield {"id": i, "name": f"tag{i}"}
+
+    def articles(self) -> Iterator[dict]:
+        rng = self.rng
+        for start in range(1, self.spec.articles + 1, self.spec.batch_size):
+            stop = min(start + self.spec.batch_size, self.spec.articles + 1)
+            authors = self.authors.sample(stop - start)
+            for article_id, author_id in zip(range(start, stop), authors):
+                title = " ".join(rng.choices(WORDS, k=rng.randint(3, 8))).capitalize()
+                created_at = self.article_created_at(article_id)
+                yield {
+                    "id": article_id,
+                    "slug": f"{title.lower().replace(' ', '-')}-{article_id:x}",
+                    "title": title,
+                    "description": rng.choice(self.paragraphs)[:200],
+                    "body": "\n\n".join(
+                        rng.choices(self.paragraphs, k=rng.randint(1, 6))
+                    ),
+                    "author_id": author_id,
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+    def article_tags(self) -> Iterator[dict]:
+        rng = self.rng
+        for article_id in range(1, self.spec.articles + 1):
+            count = rng.randint(0, self.spec.max_tags_per_article)
+            for tag_id in set(self.popular_tags.sample(count)):
+                yield {"article_id": article_id, "tag_id": tag_id}
+
+    def favorites(self) -> Iterator[dict]:
+        rng = self.rng
+        for start in range(0, self.spec.favorites, self.spec.batch_size):
+            count = min(self.spec.batch_size, self.spec.favorites - start)
+            for article_id in self.popular_articles.sample(count):
+                yield {
+                    "article_id": article_id,
+                    "user_id": rng.randint(1, self.spec.users),
+                }
+
+    def follows(self) -> Iterator[dict]:
+        rng = self.rng
+        for start in range(0, self.spec.follows, self.spec.batch_size):
+            count = min(self.spec.batch_size, self.spec.follows - start)
+            for followed_id in self.celebrities.sample(count):
+                follower_id = rng.randint(1, self.spec.users)
+                if follower_id != followed_id:
+                    yield {"follower_id": follower_id, "followed_id": followed_id}
+
+    def comments(self) -> Iterator[dict]:
+        rng = self.rng
+        span = timedelta(days=self.spec.days).total_seconds()
+        for start in range(0, self.spec.comments, self.spec.batch_size):
+            count = min(self.spec.batch_size, self.spec.comments - start)
+            for article_id in self.popular_articles.sample(count):
+                # Après la publication de l'article, dans la fenêtre de génération
+                created_at = self.article_created_at(article_id) + timedelta(
+                    seconds=rng.random() * span / 10
+                )
+                yield {
+                    "body": rng.choice(self.paragraphs)[: rng.randint(20, 400)],
+                    "article_id": article_id,
+                    "author_id": rng.randint(1, self.spec.users),
+                    "created_at": created_at,
+                    "updated_at": created_at,
+                }
+
+
+def batched(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    while True:
+        batch = list(itertools.islice(rows, size))
+        if not batch:
+            return
+        yield batch
+
+
+async def bulk_insert(
+    conn: AsyncConnection,
+    table,
+    rows: Iterator[dict],
+    batch_size: int,
+    ignore: bool = False,
+) -> int:
+    """Insère toutes les lignes dans une seule transaction, par lots.
+
+    Retourne le nombre de lignes de la table (doublons ignorés exclus).
+    """
+    statement = insert(table)
+    if ignore:
+        statement = statement.prefix_with("OR IGNORE")
+    for batch in batched(rows, batch_size):
+        await conn.execute(statement, batch)
+    await conn.commit()
+    result = await conn.execute(select(func.count()).select_from(table))
+    return result.scalar_one()
+
+
+async def create_schema(conn: AsyncConnection) -> None:
+    """Crée le schéma sans index secondaires ni indexation plein texte à l'insertion."""
+    await conn.run_sync(Base.metadata.create_all)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            await conn.run_sync(index.drop)
+    await conn.execute(text("DROP TRIGGER IF EXISTS articles_fts_ai"))
+    await conn.commit()
+
+
+async def finalize_schema(conn: AsyncConnection) -> None:
+    """Recrée les index et l'index plein texte, puis met à jour les statistiques."""
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            await conn.run_sync(index.create)
+    for statement in ARTICLES_FTS_DDL:
+        await conn.execute(text(statement))
+    await conn.execute(
+        text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+    )
+    await conn.execute(text("ANALYZE"))
+    await conn.commit()
+
+
+async def fill_timelines(conn: AsyncConnection) -> None:
+    """Matérialise les timelines comme le ferait l'application à chaque abonnement.
+
+    Les FEED_BACKFILL_LIMIT articles les plus récents de chaque auteur suivi,
+    sauf pour les auteurs lus à la demande (plus de FEED_FANOUT_MAX_FOLLOWERS abonnés).
+    """
+    await conn.execute(
+        text(
+            "INSERT OR IGNORE INTO timeline_entries "
+            "(user_id, article_id, author_id, created_at) "
+            "SELECT user_follows.follower_id, recent.id, recent.author_id, "
+            "recent.created_at "
+            "FROM user_follows "
+            "JOIN users ON users.id = user_follows.followed_id "
+            "JOIN (SELECT id, author_id, created_at, ROW_NUMBER() OVER ("
+            "PARTITION BY author_id ORDER BY created_at DESC, id DESC) AS position "
+            "FROM articles) AS recent "
+            "ON recent.author_id = user_follows.followed_id "
+            "AND recent.position <= :limit "
+            "WHERE users.followers_count <= :max_followers"
+        ),
+        {
+            "limit": settings.FEED_BACKFILL_LIMIT,
+            "max_followers": settings.FEED_FANOUT_MAX_FOLLOWERS,
+        },
+    )
+    await conn.commit()
+
+
+async def stamp_head(conn: AsyncConnection) -> None:
+    """Marque la base à la dernière révision Alembic."""
+    script = ScriptDirectory.from_config(Config(str(ROOT / "alembic.ini")))
+    head = script.get_current_head()
+    await conn.execute(
+        text(
+            "CREATE TABLE alembic_version "
+            "(version_num VARCHAR(32) NOT NULL PRIMARY KEY)"
+        )
+    )
+    await conn.execute(
+        text("INSERT INTO alembic_version VALUES (:head)"), {"head": head}
+    )
+    await conn.commit()
+
+
+async def generate(output: Path, spec: DatasetSpec) -> None:
+    generator = Generator(spec)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{output}")
+
+    async with engine.connect() as conn:
+        # Chargement sans journal ni synchronisation : la base est jetable tant
+        # qu'elle n'est pas terminée
+        for pragma in (
+            "PRAGMA journal_mode=OFF",
+            "PRAGMA synchronous=OFF",
+            "PRAGMA temp_store=MEMORY",
+            "PRAGMA cache_size=-262144",
+        ):
+            await conn.exec_driver_sql(pragma)
+
+        async def step(label: str, work) -> None:
+            started = time.perf_counter()
+            count = await work
+            detail = f"{count:>10} lignes" if isinstance(count, int) else " " * 17
+            print(
+                f"{label:>24} {detail} {time.perf_counter() - started:>8.1f} s",
+                flush=True,
+            )
+
+        size = spec.batch_size
+        hashed_password = get_password_hash(spec.password)
+        await step("schéma", create_schema(conn))
+        await step(
+            "users",
+            bulk_insert(
+                conn, UserModel.__table__, generator.users(hashed_password), size
+            ),
+        )
+        await step(
+            "tags", bulk_insert(conn, ArticleTag.__table__, generator.tags(), size)
+        )
+        await step(
+            "articles",
+            bulk_insert(conn, ArticleModel.__table__, generator.articles(), size),
+        )
+        await step(
+            "article_tags",
+            bulk_insert(conn, article_tags, generator.article_tags(), size),
+        )
+        await step(
+            "article_favorites",
+            bulk_insert(
+                conn, article_favorites, generator.favorites(), size, ignore=True
+            ),
+        )
+        await step(
+            "user_follows",
+            bulk_insert(conn, user_follows, generator.follows(), size, ignore=True),
+        )
+        await step(
+            "comments",
+            bulk_insert(conn, CommentModel.__table__, generator.comments(), size),
+        )
+        await step("index", finalize_schema(conn))
+
+        async with AsyncSession(bind=conn) as session:
+            await step("compteurs", recompute_counters(session))
+        await step("timelines", fill_timelines(conn))
+        await step("révision alembic", stamp_head(conn))
+        await conn.exec_driver_sql(
+            f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}"
+        )
+
+    await engine.dispose()
+
+
+DEFAULTS = DatasetSpec(
+    users=100_000,
+    articles=1_000_000,
+    comments=3_000_000,
+    favorites=5_000_000,
+    follows=1_000_000,
+    tags=500,
+    max_tags_per_article=5,
+    days=730,
+    zipf_exponent=1.1,
+    password="password",
+    seed=42,
+    batch_size=50_000,
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--output", type=Path, default=ROOT / "loadtest.db")
+    parser.add_argument(
+        "--force", action="store_true", help="remplace le fichier existant"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiplie tous les volumes"
+    )
+    parser.add_argument("--users", type=int, default=DEFAULTS.users)
+    parser.add_argument("--articles", type=int, default=DEFAULTS.articles)
+    parser.add_argument("--comments", type=int, default=DEFAULTS.comments)
+    parser.add_argument("--favorites", type=int, default=DEFAULTS.favorites)
+    parser.add_argument("--follows", type=int, default=DEFAULTS.follows)
+    parser.add_argument("--tags", type=int, default=DEFAULTS.tags)
+    parser.add_argument(
+        "--max-tags-per-article", type=int, default=DEFAULTS.max_tags_per_article
+    )
+    parser.add_argument("--days", type=int, default=DEFAULTS.days)
+    parser.add_argument("--zipf", type=float, default=DEFAULTS.zipf_exponent)
+    parser.add_argument("--password", default=DEFAULTS.password)
+    parser.add_argument("--seed", type=int, default=DEFAULTS.seed)
+    parser.add_argument("--batch-size", type=int, default=DEFAULTS.batch_size)
+    args = parser.parse_args()
+
+    if args.output.exists():
+        if not args.force:
+            sys.exit(f"{args.output} existe déjà (utiliser --force pour le remplacer)")
+        for suffix in ("", "-wal", "-shm"):
+            path = Path(f"{args.output}{suffix}")
+            if path.exists():
+                os.remove(path)
+
+    spec = DatasetSpec(
+        users=args.users,
+        articles=args.articles,
+        comments=args.comments,
+        favorites=args.favorites,
+        follows=args.follows,
+        tags=args.tags,
+        max_tags_per_article=args.max_tags_per_article,
+        days=args.days,
+        zipf_exponent=args.zipf,
+        password=args.password,
+        seed=args.seed,
+        batch_size=args.batch_size,
+    ).scaled(args.scale)
+
+    print(
+        f"{spec.users} utilisateurs, {spec.articles} articles, "
+        f"{spec.comments} commentaires, {spec.favorites} favoris, "
+        f"{spec.follows} abonnements (graine {spec.seed})"
+    )
+    started = time.perf_counter()
+    asyncio.run(generate(args.output, spec))
+    print(f"{args.output} généré en {time.perf_counter() - started:.0f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,23 @@
+"""Reconstruit l'index plein texte des articles (articles_fts).
+
+Usage : python scripts/reindex_search.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database import async_session
+from repositories.article_repository import rebuild_search_index
+
+
+async def main():
+    async with async_session() as session:
+        await rebuild_search_index(session)
+    print("Index de recherche reconstruit avec succès!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
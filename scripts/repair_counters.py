@@ -0,0 +1,23 @@
+"""Recalcule les compteurs dénormalisés (favoris, commentaires, abonnés).
+
+Usage : python scripts/repair_counters.py
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from database import async_session
+from repositories.counter_repository import recompute_counters
+
+
+async def main():
+    async with async_session() as session:
+        await recompute_counters(session)
+    print("Compteurs recalculés avec succès!")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
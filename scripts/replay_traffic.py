@@ -0,0 +1,314 @@
+"""Rejoue un trafic enregistré par TrafficCaptureMiddleware et mesure les latences.
+
+Lit un fichier JSONL produit par la capture (TRAFFIC_CAPTURE_ENABLED) et
+réémet chaque requête contre l'application : en mémoire (transport ASGI, sur
+une copie de `--database` ou un jeu généré à `--scale`), ou contre un serveur
+en cours d'exécution (`--base-url`).
+
+Deux modes de cadence :
+
+- par défaut, boucle ouverte : chaque requête part à son instant d'origine,
+  divisé par `--speed` (2 = deux fois plus vite) ; la concurrence d'origine
+  est ainsi reproduite, à l'échelle près ;
+- avec `--concurrency N`, boucle fermée : N clients enchaînent les requêtes
+  aussi vite que possible, dans l'ordre du fichier.
+
+Un token est émis pour chaque sujet enregistré (les tokens d'origine ne sont
+pas capturés) ; les mots de passe masqués sont remplacés par `--password`.
+Les requêtes dont le corps n'a pas été enregistré (trop volumineux ou non
+JSON, champ `body_omitted`) ne sont pas rejouées : elles sont comptées à part.
+Le rapport donne, par route, les latences p50/p95/p99, les erreurs et les
+statuts différents de ceux d'origine, ainsi que le retard au départ en boucle
+ouverte. `--output` enregistre le rapport en JSON.
+
+Usage : python scripts/replay_traffic.py traffic.jsonl [--speed 1.0 | --concurrency 8]
+        [--database loadtest.db | --scale 0.01 | --base-url http://localhost:8000]
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import timedelta
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+import httpx
+from bench_api import percentile, prepare_database
+
+REDACTED = "<redacted>"
+
+
+@dataclass
+class RouteStats:
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    status_mismatches: int = 0
+    skipped: int = 0
+
+
+def load_records(path: Path, limit: Optional[int]) -> List[dict]:
+    records = []
+    with open(path, encoding="utf-8") as capture:
+        for line in capture:
+            line = line.strip()
+            if line:
+                records.append(json.loads(line))
+            if limit is not None and len(records) >= limit:
+                break
+    records.sort(key=lambda record: record["started_at"])
+    return records
+
+
+def restore_secrets(value: Any, password: str) -> Any:
+    """Remplace les valeurs masquées à la capture par le mot de passe de rejeu."""
+    if isinstance(value, dict):
+        return {key: restore_secrets(item, password) for key, item in value.items()}
+    if isinstance(value, list):
+        return [restore_secrets(item, password) for item in value]
+    return password if value == REDACTED else value
+
+
+class Replayer:
+    def __init__(self, client: httpx.AsyncClient, password: str) -> None:
+        from utils.security import create_access_token
+
+        self.client = client
+        self.password = password
+        self._create_access_token = create_access_token
+        self._tokens: Dict[str, str] = {}
+        self.routes: Dict[str, RouteStats] = defaultdict(RouteStats)
+        self.lags: List[float] = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def token(self, subject: str) -> str:
+        if subject not in self._tokens:
+            self._tokens[subject] = self._create_access_token(
+                {"sub": subject}, expires_delta=timedelta(hours=12)
+            )
+        return self._tokens[subject]
+
+    async def send(self, record: dict) -> None:
+        label = f"{record['method']} {record.get('route') or record['path']}"
+        if record.get("body_omitted"):
+            # Réémise sans son corps, la requête échouerait (422) : non rejouée
+            self.routes[label].skipped += 1
+            return
+
+        headers = {}
+        if record.get("subject"):
+            headers["Authorization"] = f"Bearer {self.token(record['subject'])}"
+        kwargs: Dict[str, Any] = {"headers": headers}
+        if record.get("body") is not None:
+            kwargs["json"] = restore_secrets(record["body"], self.password)
+        url = record["path"] + (f"?{record['query']}" if record.get("query") else "")
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        start = time.perf_counter()
+        try:
+            response = await self.client.request(record["method"], url, **kwargs)
+            status: Optional[int] = response.status_code
+        except Exception:
+            status = None
+        elapsed = (time.perf_counter() - start) * 1000
+        self.in_flight -= 1
+
+        stats = self.routes[label]
+        stats.latencies.append(elapsed)
+        if status is None or status >= 500:
+            stats.errors += 1
+        if status != record.get("status"):
+            stats.status_mismatches += 1
+
+    async def open_loop(self, records: List[dict], speed: float) -> None:
+        """Chaque requête part à son instant d'origine (mis à l'échelle)."""
+        origin = records[0]["started_at"]
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = []
+        for record in records:
+            due = start + (record["started_at"] - origin) / speed
+            delay = due - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            self.lags.append(max(0.0, loop.time() - due) * 1000)
+            tasks.append(asyncio.create_task(self.send(record)))
+        await asyncio.gather(*tasks)
+
+    async def closed_loop(self, records: List[dict], concurrency: int) -> None:
+        """`concurrency` clients enchaînent les requêtes dans l'ordre du fichier."""
+        queue = iter(records)
+
+        async def worker() -> None:
+            for record in queue:
+                await self.send(record)
+
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+
+
+def summarize(latencies: List[float]) -> dict:
+    ordered = sorted(latencies) or [0.0]
+    return {
+        "count": len(latencies),
+        "p50_ms": round(percentile(ordered, 0.50), 3),
+        "p95_ms": round(percentile(ordered, 0.95), 3),
+        "p99_ms": round(percentile(ordered, 0.99), 3),
+        "max_ms": round(ordered[-1], 3),
+    }
+
+
+def build_report(replayer: Replayer, records: List[dict], elapsed: float, args) -> dict:
+    all_latencies = [
+        value for stats in replayer.routes.values() for value in stats.latencies
+    ]
+    span = records[-1]["started_at"] - records[0]["started_at"]
+    report = {
+        "requests": len(records),
+        "mode": f"concurrency={args.concurrency}"
+        if args.concurrency
+        else f"speed={args.speed}",
+        "recorded_span_s": round(span, 3),
+        "replay_span_s": round(elapsed, 3),
+        "throughput_rps": round(len(all_latencies) / elapsed, 1),
+        "max_in_flight": replayer.max_in_flight,
+        **summarize(all_latencies),
+        "errors": sum(stats.errors for stats in replayer.routes.values()),
+        "status_mismatches": sum(
+            stats.status_mismatches for stats in replayer.routes.values()
+        ),
+        "skipped": sum(stats.skipped for stats in replayer.routes.values()),
+        "routes": {
+            label: {
+                **summarize(stats.latencies),
+                "errors": stats.errors,
+                "status_mismatches": stats.status_mismatches,
+                "skipped": stats.skipped,
+            }
+            for label, stats in sorted(replayer.routes.items())
+        },
+    }
+    if replayer.lags:
+        report["start_lag"] = summarize(replayer.lags)
+    return report
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"\n{report['requests']} requêtes ({report['mode']}) "
+        f"en {report['replay_span_s']} s "
+        f"(enregistrées sur {report['recorded_span_s']} s) : "
+        f"{report['throughput_rps']} req/s, "
+        f"jusqu'à {report['max_in_flight']} simultanées"
+    )
+    print(
+        f"latence p50 {report['p50_ms']:.2f} ms, p95 {report['p95_ms']:.2f} ms, "
+        f"p99 {report['p99_ms']:.2f} ms ; {report['errors']} erreurs, "
+        f"{report['status_mismatches']} statuts différents de l'enregistrement"
+    )
+    if report["skipped"]:
+        print(f"{report['skipped']} requêtes non rejouées (corps non enregistré)")
+    if "start_lag" in report:
+        print(f"retard au départ p99 : {report['start_lag']['p99_ms']:.2f} ms")
+    print(
+        f"\n{'route':>40} {'n':>6} {'p50':>8} {'p95':>8} {'p99':>8} {'err':>5} "
+        f"{'statut≠':>8} {'ignorées':>9}"
+    )
+    for label, stats in report["routes"].items():
+        print(
+            f"{label:>40} {stats['count']:>6} {stats['p50_ms']:>8.2f} "
+            f"{stats['p95_ms']:>8.2f} {stats['p99_ms']:>8.2f} {stats['errors']:>5} "
+            f"{stats['status_mismatches']:>8} {stats['skipped']:>9}"
+        )
+
+
+async def replay(args, records: List[dict]) -> dict:
+    if args.base_url:
+        client = httpx.AsyncClient(base_url=args.base_url, timeout=60)
+        lifespan = None
+    else:
+        from api import app
+
+        client = httpx.AsyncClient(
+            transport=httpx.ASGITransport(app=app), base_url="http://replay"
+        )
+        lifespan = app.router.lifespan_context(app)
+
+    async with client:
+        if lifespan is not None:
+            await lifespan.__aenter__()
+        try:
+            replayer = Replayer(client, args.password)
+            start = time.perf_counter()
+            if args.concurrency:
+                await replayer.closed_loop(records, args.concurrency)
+            else:
+                await replayer.open_loop(records, args.speed)
+            elapsed = time.perf_counter() - start
+        finally:
+            if lifespan is not None:
+                await lifespan.__aexit__(None, None, None)
+
+    return build_report(replayer, records, elapsed, args)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("capture", type=Path, help="fichier JSONL enregistré")
+    parser.add_argument(
+        "--speed", type=float, default=1.0, help="accélération de la cadence d'origine"
+    )
+    parser.add_argument("--concurrency", type=int, help="boucle fermée avec N clients")
+    parser.add_argument("--limit", type=int, help="nombre maximal de requêtes rejouées")
+    parser.add_argument(
+        "--base-url", help="serveur cible (sinon application en mémoire)"
+    )
+    parser.add_argument(
+        "--database", type=Path, help="base peuplée à copier (en mémoire)"
+    )
+    parser.add_argument(
+        "--scale", type=float, default=0.01, help="volume du jeu généré (en mémoire)"
+    )
+    parser.add_argument(
+        "--password", default="password", help="remplace les mots de passe masqués"
+    )
+    parser.add_argument("--output", type=Path, help="fichier JSON du rapport")
+    args = parser.parse_args()
+
+    if args.speed <= 0:
+        parser.error("--speed doit être positif")
+    records = load_records(args.capture, args.limit)
+    if not records:
+        parser.error(f"{args.capture} ne contient aucune requête")
+
+    if args.base_url:
+        report = asyncio.run(replay(args, records))
+    else:
+        with tempfile.TemporaryDirectory() as tmp:
+            database = Path(tmp) / "bench.db"
+            # À définir avant tout import de l'application (lecture des settings)
+            os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{database}"
+            # La capture ne doit pas s'enregistrer elle-même pendant le rejeu
+            os.environ["TRAFFIC_CAPTURE_ENABLED"] = "false"
+            prepare_database(args, Path(tmp))
+            report = asyncio.run(replay(args, records))
+
+    print_report(report)
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2, ensure_ascii=False))
+        print(f"\nrapport enregistré dans {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""Rapport des requêtes SQL les plus lentes, agrégé depuis les journaux.
+
+Chaque worker journalise ses requêtes lentes en JSON (core/slow_queries.py,
+SLOW_QUERY_THRESHOLD_MS) ; ce script lit un ou plusieurs fichiers de journaux,
+y retrouve ces lignes quel que soit le préfixe du formateur de logs, et
+agrège par forme de requête : nombre d'exécutions lentes, temps total, moyen
+et maximal, fonctions de repository appelantes, routes et plan d'exécution.
+
+Usage : python scripts/slow_query_report.py app.log [worker2.log ...]
+        [--top 20] [--order-by total_ms|max_ms|count] [--json]
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any, Dict, Iterable, List
+
+# Ajouter le répertoire src au chemin Python
+sys.path.append(str(Path(__file__).parent.parent / "src"))
+
+from core.slow_queries import SlowQueryStats
+
+
+def read_events(paths: Iterable[Path]) -> Iterable[dict]:
+    for path in paths:
+        with open(path, encoding="utf-8", errors="replace") as log:
+            for line in log:
+                start = line.find('{"event": "slow_query"')
+                if start < 0:
+                    continue
+                try:
+                    yield json.loads(line[start:])
+                except ValueError:
+                    continue
+
+
+def aggregate(events: Iterable[dict]) -> Dict[str, SlowQueryStats]:
+    stats: Dict[str, SlowQueryStats] = {}
+    for record in events:
+        entry = stats.get(record["statement"])
+        if entry is None:
+            entry = stats[record["statement"]] = SlowQueryStats(record["statement"])
+        entry.add(
+            record["duration_ms"],
+            record["parameters"],
+            record["caller"],
+            record["route"],
+        )
+        # Le plan n'est capturé qu'à la première occurrence, par worker
+        entry.plan = entry.plan or record.get("plan")
+    return stats
+
+
+def format_report(entries: List[Dict[str, Any]]) -> str:
+    lines = []
+    for rank, entry in enumerate(entries, 1):
+        lines.append(
+            f"{rank:>3}. {entry['total_ms']:.1f} ms au total, {entry['count']} fois, "
+            f"moyenne {entry['mean_ms']:.1f} ms, max {entry['max_ms']:.1f} ms"
+        )
+        lines.append(f"     {entry['statement']}")
+        lines.append(f"     paramètres : {entry['parameters']}")
+        for caller, count in entry["callers"].items():
+            lines.append(f"     appelant : {caller} ({count})")
+        for route, count in entry["routes"].items():
+            lines.append(f"     route : {route} ({count})")
+        for step in entry["plan"] or ():
+            lines.append(f"       {step}")
+    return "\n".join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("logs", type=Path, nargs="+", help="fichiers de journaux")
+    parser.add_argument(
+        "--top", type=int, default=20, help="nombre de formes de requête"
+    )
+    parser.add_argument(
+        "--order-by", choices=("total_ms", "max_ms", "count"), default="total_ms"
+    )
+    parser.add_argument("--json", action="store_true", help="rapport au format JSON")
+    args = parser.parse_args()
+
+    stats = aggregate(read_events(args.logs))
+    ranked = sorted(
+        stats.values(), key=lambda entry: getattr(entry, args.order_by), reverse=True
+    )
+    entries = [entry.as_dict() for entry in ranked[: args.top]]
+
+    if args.json:
+        print(json.dumps(entries, indent=2, ensure_ascii=False))
+    elif not entries:
+        print("Aucune requête lente dans les journaux.")
+    else:
+        print(format_report(entries))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
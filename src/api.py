@@ -1,16 +1,33 @@
-from typing import Tuple
+import asyncio
+from typing import Literal, Optional
 
 import uvicorn
 from fastapi import APIRouter, FastAPI
 from fastapi.openapi.utils import get_openapi
 from starlette.middleware.cors import CORSMiddleware
-
-from database import Base, engine
+from starlette.responses import Response
+
+from core.compression import CompressionMiddleware, available_encoders
+from core.metrics import (
+    MetricsMiddleware,
+    monitor_event_loop_lag,
+    pool_gauges,
+    registry,
+)
+from core.query_budget import QueryBudgetMiddleware, watch_engine
+from core.slow_queries import SlowQueryLog
+from core.sql_events import SqlActivityMiddleware, install_statement_hooks
+from core.traffic_capture import TrafficCaptureMiddleware
+from database import Base, async_session, engine, read_engine
 from endpoints.article_sql import router as article_router
 from endpoints.comment_sql import router as comment_router
 from endpoints.profile_sql import router as profile_router
 from endpoints.tag_sql import router as tag_router
 from endpoints.user_sql import router as user_router
+from repositories.user_cache import user_cache
+from repositories.write_queue import start_write_batcher, stop_write_batcher
+from settings import settings
+from utils.security import password_hasher
 # from endpoints import dateparser
 
 
@@ -50,18 +67,140 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        encoders=available_encoders(
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+            zstd_level=settings.COMPRESSION_ZSTD_LEVEL,
+        ),
+        min_size=settings.COMPRESSION_MIN_SIZE,
+        routes=settings.COMPRESSION_ROUTES,
+        cache_size=settings.COMPRESSION_CACHE_SIZE,
+        stream_threshold=settings.COMPRESSION_STREAM_THRESHOLD,
+    )
+
+if settings.TRAFFIC_CAPTURE_ENABLED:
+    app.add_middleware(
+        TrafficCaptureMiddleware,
+        path=settings.TRAFFIC_CAPTURE_PATH,
+        sample_rate=settings.TRAFFIC_CAPTURE_SAMPLE_RATE,
+        max_body=settings.TRAFFIC_CAPTURE_MAX_BODY,
+    )
+
+if settings.QUERY_BUDGET_ENABLED:
+    app.add_middleware(
+        QueryBudgetMiddleware,
+        max_queries=settings.QUERY_BUDGET_MAX_QUERIES,
+        repeat_threshold=settings.QUERY_BUDGET_REPEAT_THRESHOLD,
+    )
+    watch_engine(engine)
+    watch_engine(read_engine)
+
+slow_query_log = SlowQueryLog(
+    settings.SLOW_QUERY_THRESHOLD_MS,
+    explain=settings.SLOW_QUERY_EXPLAIN,
+    max_statements=settings.SLOW_QUERY_MAX_STATEMENTS,
+)
+if settings.SLOW_QUERY_LOG_ENABLED:
+    slow_query_log.install(engine)
+    slow_query_log.install(read_engine)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
+    install_statement_hooks(engine)
+    install_statement_hooks(read_engine)
+    pool_gauges({"write": engine, "read": read_engine})
+    registry.sampled(
+        "user_cache_lookups_total",
+        "Recherches dans le cache des utilisateurs authentifiés.",
+        lambda: {("hit",): user_cache.hits, ("miss",): user_cache.misses},
+        ("result",),
+        kind="counter",
+    )
+    registry.sampled(
+        "user_cache_entries",
+        "Utilisateurs en cache.",
+        lambda: {(): user_cache.stats()["size"]},
+    )
+    registry.sampled(
+        "password_hash_pending",
+        "Hachages bcrypt en cours ou en attente.",
+        lambda: {(): password_hasher.pending},
+    )
+    registry.sampled(
+        "password_hash_rejected_total",
+        "Hachages bcrypt refusés (503) faute de place dans la file.",
+        lambda: {(): password_hasher.rejected},
+        kind="counter",
+    )
+
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return Response(
+            registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+if settings.METRICS_ENABLED or settings.SLOW_QUERY_LOG_ENABLED:
+    # Ajouté en dernier, donc le plus externe : une seule activité SQL par requête,
+    # lue par les métriques et le journal des requêtes lentes
+    app.add_middleware(SqlActivityMiddleware)
+
+# Tâche de mesure du retard de la boucle d'événements
+_loop_lag_task: Optional[asyncio.Task] = None
+
 
 @app.get("/health", tags=["health"])
 async def health_check():
     return {"status": "ok"}
 
 
+@app.get("/health/user-cache", tags=["health"])
+async def user_cache_stats():
+    # Compteurs du cache des utilisateurs authentifiés (succès, échecs, évictions)
+    return user_cache.stats()
+
+
+@app.get("/health/slow-queries", tags=["health"])
+async def slow_queries(
+    limit: int = 20, order_by: Literal["total_ms", "max_ms", "count"] = "total_ms"
+):
+    # Formes de requête SQL lentes les plus coûteuses depuis le démarrage du worker
+    return {
+        "threshold_ms": settings.SLOW_QUERY_THRESHOLD_MS,
+        "queries": slow_query_log.top(limit, order_by),
+    }
+
+
 @app.on_event("startup")
 async def startup():
+    global _loop_lag_task
     # Créer les tables au démarrage de l'application
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
 
+    if settings.WRITE_BATCH_ENABLED:
+        await start_write_batcher(
+            async_session,
+            max_batch_size=settings.WRITE_BATCH_MAX_SIZE,
+            max_delay=settings.WRITE_BATCH_MAX_DELAY_MS / 1000,
+        )
+
+    if settings.METRICS_ENABLED:
+        _loop_lag_task = asyncio.create_task(
+            monitor_event_loop_lag(settings.METRICS_LOOP_LAG_INTERVAL)
+        )
+
+
+@app.on_event("shutdown")
+async def shutdown():
+    # Valider les écritures encore en file avant l'arrêt
+    await stop_write_batcher()
+
+    if _loop_lag_task is not None:
+        _loop_lag_task.cancel()
+
 
 app.include_router(user_router, tags=["user"])
 app.include_router(article_router, tags=["article"])
@@ -0,0 +1,313 @@
+import gzip
+import zlib
+from collections import OrderedDict
+from typing import Dict, List, Mapping, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli est une dépendance optionnelle (extra "perf")
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # zstandard est une dépendance optionnelle (extra "perf")
+    zstandard = None
+
+COMPRESSIBLE_TYPES = (
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+    "text/",
+)
+
+# Taille des tranches envoyées pour un grand corps compressé au fil de l'eau
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, quality: int) -> None:
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstandard.ZstdCompressor(level=level).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+
+class Encoder:
+    """Un codage de contenu : compression en une fois ou au fil de l'eau."""
+
+    def __init__(self, name: str, level: int) -> None:
+        self.name = name
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        if self.name == "br":
+            return brotli.compress(data, quality=self.level)
+        if self.name == "zstd":
+            return zstandard.ZstdCompressor(level=self.level).compress(data)
+        # mtime=0 : même corps, mêmes octets (réponses en cache, ETag)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def stream(self):
+        if self.name == "br":
+            return _BrotliStream(self.level)
+        if self.name == "zstd":
+            return _ZstdStream(self.level)
+        return _GzipStream(self.level)
+
+
+def available_encoders(
+    gzip_level: int, brotli_quality: int, zstd_level: int
+) -> List[Encoder]:
+    """Codages disponibles, par ordre de préférence à qualité d'acceptation égale."""
+    encoders = []
+    if zstandard is not None:
+        encoders.append(Encoder("zstd", zstd_level))
+    if brotli is not None:
+        encoders.append(Encoder("br", brotli_quality))
+    encoders.append(Encoder("gzip", gzip_level))
+    return encoders
+
+
+def negotiate(accept_encoding: str, encoders: List[Encoder]) -> Optional[Encoder]:
+    """Choisit le codage le mieux accepté (valeurs q de l'en-tête Accept-Encoding)."""
+    weights: Dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        name, _, params = item.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                continue
+        weights[name.strip().lower()] = quality
+
+    best, best_quality = None, 0.0
+    for encoder in encoders:
+        quality = weights.get(encoder.name, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoder, quality
+    return best
+
+
+class CompressionMiddleware:
+    """Compresse les réponses selon Accept-Encoding, avec un seuil par route.
+
+    `routes` associe un modèle de chemin (`/articles/{slug}`) à sa taille
+    minimale de compression, ou à None pour ne jamais le compresser ; les
+    autres routes utilisent `min_size`. Les réponses portant un ETag sont
+    mises en cache une fois compressées (`cache_size` entrées, LRU) : un même
+    contenu n'est compressé qu'une fois par codage. Les réponses en flux et
+    les corps dépassant `stream_threshold` sont compressés et envoyés par
+    tranches, sans copie complète du corps compressé.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        encoders: List[Encoder],
+        min_size: int = 1024,
+        routes: Optional[Mapping[str, Optional[int]]] = None,
+        cache_size: int = 256,
+        stream_threshold: int = 1024 * 1024,
+    ) -> None:
+        self.app = app
+        self.encoders = encoders
+        self.min_size = min_size
+        self.routes = dict(routes or {})
+        self.cache_size = cache_size
+        self.stream_threshold = stream_threshold
+        self._cache: "OrderedDict[Tuple, bytes]" = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accept_encoding = Headers(scope=scope).get("accept-encoding", "")
+        encoder = negotiate(accept_encoding, self.encoders)
+        if encoder is None:
+            await self.app(scope, receive, _vary_sender(send))
+            return
+
+        responder = _CompressionResponder(self, scope, send, encoder)
+        await self.app(scope, receive, responder.send)
+
+    def threshold(self, scope: Scope) -> Optional[int]:
+        route = getattr(scope.get("route"), "path", None)
+        return self.routes.get(route, self.min_size)
+
+    def cached(self, key: Tuple) -> Optional[bytes]:
+        body = self._cache.get(key)
+        if body is None:
+            self.cache_misses += 1
+            return None
+        self._cache.move_to_end(key)
+        self.cache_hits += 1
+        return body
+
+    def store(self, key: Tuple, body: bytes) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = body
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+
+def _is_compressible(headers: MutableHeaders) -> bool:
+    if "content-encoding" in headers:
+        return False
+    if "no-transform" in headers.get("cache-control", ""):
+        return False
+    return headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+
+
+def _vary_sender(send: Send) -> Send:
+    """Ajoute Vary: Accept-Encoding aux réponses compressibles envoyées en clair."""
+
+    async def wrapper(message: Message) -> None:
+        if message["type"] == "http.response.start":
+            headers = MutableHeaders(scope=message)
+            if _is_compressible(headers):
+                headers.add_vary_header("Accept-Encoding")
+        await send(message)
+
+    return wrapper
+
+
+class _CompressionResponder:
+    def __init__(
+        self,
+        middleware: CompressionMiddleware,
+        scope: Scope,
+        send: Send,
+        encoder: Encoder,
+    ) -> None:
+        self.middleware = middleware
+        self.scope = scope
+        self._send = send
+        self.encoder = encoder
+        self.start: Optional[Message] = None
+        self.stream = None
+        self.passthrough = False
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            # Retenu jusqu'au premier corps : les en-têtes dépendent de sa taille
+            self.start = message
+            return
+        if message["type"] != "http.response.body":
+            await self._send(message)
+            return
+
+        if self.passthrough:
+            await self._send(message)
+            return
+        if self.stream is not None:
+            await self._send_stream_chunk(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        headers = MutableHeaders(scope=self.start)
+        threshold = self.middleware.threshold(self.scope)
+
+        if (
+            threshold is None
+            or self.start["status"] in (204, 206, 304)
+            or not _is_compressible(headers)
+            or (not more_body and len(body) < threshold)
+        ):
+            self.passthrough = True
+            if threshold is not None and _is_compressible(headers):
+                headers.add_vary_header("Accept-Encoding")
+            await self._send(self.start)
+            await self._send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoder.name
+        headers.add_vary_header("Accept-Encoding")
+
+        if more_body or len(body) > self.middleware.stream_threshold:
+            # Corps en flux ou volumineux : compressé et envoyé par tranches
+            del headers["Content-Length"]
+            self.stream = self.encoder.stream()
+            await self._send(self.start)
+            if more_body:
+                await self._send_stream_chunk(message)
+            else:
+                await self._send_large_body(body)
+            return
+
+        etag = headers.get("etag")
+        key = None
+        if etag is not None:
+            key = (
+                self.scope["path"],
+                self.scope["query_string"],
+                etag,
+                self.encoder.name,
+            )
+            compressed = self.middleware.cached(key)
+        else:
+            compressed = None
+        if compressed is None:
+            compressed = self.encoder.compress(body)
+            if key is not None:
+                self.middleware.store(key, compressed)
+
+        headers["Content-Length"] = str(len(compressed))
+        await self._send(self.start)
+        await self._send({"type": "http.response.body", "body": compressed})
+
+    async def _send_stream_chunk(self, message: Message) -> None:
+        more_body = message.get("more_body", False)
+        data = self.stream.compress(message.get("body", b""))
+        if not more_body:
+            data += self.stream.flush()
+        if data or not more_body:
+            await self._send(
+                {"type": "http.response.body", "body": data, "more_body": more_body}
+            )
+
+    async def _send_large_body(self, body: bytes) -> None:
+        view = memoryview(body)
+        for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+            data = self.stream.compress(view[offset : offset + STREAM_CHUNK_SIZE])
+            if data:
+                await self._send(
+                    {"type": "http.response.body", "body": data, "more_body": True}
+                )
+        await self._send({"type": "http.response.body", "body": self.stream.flush()})
@@ -35,10 +35,10 @@ class ProfileNotFoundException(HTTPException):
 
 
 class NotArticleAuthorException(HTTPException):
-    def __init__(self) -> None:
+    def __init__(self, detail: str = "User is not author of the article") -> None:
         super().__init__(
             status_code=status.HTTP_403_FORBIDDEN,
-            detail="User is not author of the article",
+            detail=detail,
         )
 
 
@@ -75,3 +75,19 @@ class InvalidCredentialsException(HTTPException):
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid pagination cursor"
+        )
+
+
+class ServiceOverloadedException(HTTPException):
+    def __init__(self, retry_after: int = 1) -> None:
+        super().__init__(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Server is busy, please retry later",
+            headers={"Retry-After": str(retry_after)},
+        )
@@ -0,0 +1,300 @@
+"""Métriques de l'application, exposées au format texte de Prometheus.
+
+Implémentation minimale (compteurs, jauges, histogrammes) sans dépendance :
+chaque mesure coûte quelques opérations en mémoire, ce qui permet de laisser
+l'instrumentation active en production. Les valeurs sont propres au
+processus ; avec plusieurs workers, Prometheus interroge chacun d'eux.
+"""
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from core.sql_events import current_activity
+
+LATENCY_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89)
+
+Labels = Tuple[str, ...]
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape_label(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._values.items():
+            label_set = _format_labels(self.labelnames, labels)
+            yield f"{self.name}{label_set} {_format_value(value)}"
+
+
+class Sampled:
+    """Métrique lue à la demande : `callback` retourne les valeurs par étiquettes.
+
+    Expose sans surcoût les compteurs déjà tenus ailleurs (cache, pools).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Labels, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.kind = kind
+        self._callback = callback
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in self._callback().items():
+            label_set = _format_labels(self.labelnames, labels)
+            yield f"{self.name}{label_set} {_format_value(value)}"
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Par étiquettes : effectifs non cumulés par intervalle (+Inf en dernier), somme
+        self._values: Dict[Labels, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        entry = self._values.get(labels)
+        if entry is None:
+            entry = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    def samples(self) -> Iterable[str]:
+        for labels, (counts, total) in self._values.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                bucket_labels = _format_labels(self.labelnames, labels, le)
+                yield f"{self.name}_bucket{bucket_labels} {cumulative}"
+            label_set = _format_labels(self.labelnames, labels)
+            yield f"{self.name}_sum{label_set} {_format_value(total[0])}"
+            yield f"{self.name}_count{label_set} {cumulative}"
+
+
+class MetricsRegistry:
+    def __init__(self) -> None:
+        self._metrics: List = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def sampled(
+        self,
+        name: str,
+        documentation: str,
+        callback: Callable[[], Dict[Labels, float]],
+        labelnames: Sequence[str] = (),
+        kind: str = "gauge",
+    ) -> Sampled:
+        return self.register(Sampled(name, documentation, callback, labelnames, kind))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        labelnames: Sequence[str] = (),
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, buckets, labelnames))
+
+    def render(self) -> str:
+        """Exporte toutes les métriques au format texte 0.0.4 de Prometheus."""
+        lines = []
+        for metric in self._metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+http_requests = registry.counter(
+    "http_requests_total", "Requêtes HTTP traitées.", ("method", "route", "status")
+)
+http_duration = registry.histogram(
+    "http_request_duration_seconds",
+    "Durée de traitement des requêtes HTTP.",
+    labelnames=("method", "route"),
+)
+http_sql_statements = registry.histogram(
+    "http_request_sql_statements",
+    "Requêtes SQL exécutées par requête HTTP.",
+    buckets=COUNT_BUCKETS,
+    labelnames=("method", "route"),
+)
+http_db_time = registry.histogram(
+    "http_request_db_seconds",
+    "Temps passé dans la base par requête HTTP.",
+    labelnames=("method", "route"),
+)
+pool_wait = registry.histogram(
+    "db_pool_checkout_seconds",
+    "Attente d'une connexion du pool (ouverture comprise).",
+    labelnames=("pool",),
+)
+event_loop_lag = registry.histogram(
+    "event_loop_lag_seconds",
+    "Retard de la boucle d'événements sur un réveil programmé.",
+)
+
+
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Pool qui mesure l'attente de chaque connexion.
+
+    Le pool d'écriture n'a qu'une connexion : cette attente est la file des
+    écritures. L'étiquette est le `pool_logging_name` du moteur.
+    """
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            elapsed = time.perf_counter() - start
+            pool_wait.observe(elapsed, self.logging_name or "default")
+
+
+def pool_gauges(engines: Dict[str, AsyncEngine]) -> None:
+    """Expose la taille et l'occupation des pools de connexions.
+
+    Seuls les pools à file d'attente sont mesurés : une base en mémoire
+    (StaticPool) n'a qu'une connexion partagée.
+    """
+    engines = {
+        name: engine
+        for name, engine in engines.items()
+        if isinstance(engine.pool, QueuePool)
+    }
+    registry.sampled(
+        "db_pool_size",
+        "Connexions permanentes du pool.",
+        lambda: {(name,): engine.pool.size() for name, engine in engines.items()},
+        ("pool",),
+    )
+    registry.sampled(
+        "db_pool_checked_out",
+        "Connexions du pool actuellement utilisées.",
+        lambda: {(name,): engine.pool.checkedout() for name, engine in engines.items()},
+        ("pool",),
+    )
+
+
+class MetricsMiddleware:
+    """Mesure chaque requête HTTP : durée, statut, requêtes SQL et temps base.
+
+    Les requêtes SQL et le temps base sont lus dans l'activité ouverte par
+    SqlActivityMiddleware (core/sql_events.py), placé autour. La route est le
+    modèle de chemin (`/articles/{slug}`) pour borner le nombre de séries ;
+    les requêtes sans route sont regroupées sous `unmatched`.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        activity = current_activity()
+        status = 500
+        start = time.perf_counter()
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            route = getattr(scope.get("route"), "path", None) or "unmatched"
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_duration.observe(elapsed, method, route)
+            if activity is not None:
+                http_sql_statements.observe(activity.statements, method, route)
+                http_db_time.observe(activity.db_time, method, route)
+
+
+async def monitor_event_loop_lag(interval: float) -> None:
+    """Mesure en continu le retard de la boucle d'événements sur `interval`."""
+    loop = asyncio.get_running_loop()
+    while True:
+        expected = loop.time() + interval
+        await asyncio.sleep(interval)
+        event_loop_lag.observe(max(0.0, loop.time() - expected))
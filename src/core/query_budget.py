@@ -0,0 +1,186 @@
+import functools
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar, Token
+from typing import Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from core.sql_events import add_statement_listener, install_statement_hooks
+
+logger = logging.getLogger(__name__)
+
+# Au-delà, une même forme de requête répétée dans un budget est signalée en N+1
+N_PLUS_ONE_THRESHOLD = 3
+
+_WHITESPACE_RE = re.compile(r"\s+")
+# Listes de paramètres de longueur variable : IN (?, ?, ?) et VALUES (?, ?), (?, ?)
+_PARAM_LIST_RE = re.compile(r"\(\?(?:, \?)+\)")
+_VALUES_RE = re.compile(r"VALUES \(\?[^)]*\)(?:, \([^)]*\))+")
+
+
+def statement_shape(statement: str) -> str:
+    """Forme d'une requête : espaces et listes de paramètres normalisés.
+
+    Deux requêtes de même forme ne diffèrent que par leurs valeurs : répétées
+    dans une même requête HTTP, c'est le symptôme d'un chargement par ligne.
+    """
+    shape = _WHITESPACE_RE.sub(" ", statement).strip()
+    shape = _VALUES_RE.sub("VALUES (...)", shape)
+    return _PARAM_LIST_RE.sub("(...)", shape)
+
+
+class QueryBudgetExceeded(Exception):
+    """Budget de requêtes dépassé ou requêtes N+1 détectées."""
+
+
+class QueryBudget:
+    """Compte les requêtes SQL émises dans un bloc et vérifie un budget.
+
+    S'utilise comme gestionnaire de contexte ou comme décorateur de fonction
+    asynchrone (un repository, par exemple) :
+
+        with QueryBudget(3, name="GET /articles"):
+            ...
+
+        @QueryBudget(2)
+        async def get_article_row_by_slug(session, slug): ...
+
+    À la sortie, un dépassement de `max_queries` ou une même forme de requête
+    répétée au moins `repeat_threshold` fois (N+1) lève QueryBudgetExceeded,
+    ou est seulement journalisé si `raise_on_violation` est faux. Les budgets
+    s'imbriquent : chaque requête est comptée dans tous les budgets actifs.
+    Les moteurs doivent être surveillés par `watch_engine`.
+    """
+
+    def __init__(
+        self,
+        max_queries: Optional[int] = None,
+        *,
+        name: Optional[str] = None,
+        repeat_threshold: Optional[int] = N_PLUS_ONE_THRESHOLD,
+        raise_on_violation: bool = True,
+    ) -> None:
+        self.max_queries = max_queries
+        self.name = name
+        self.repeat_threshold = repeat_threshold
+        self.raise_on_violation = raise_on_violation
+        self.statements: List[str] = []
+        self._token: Optional[Token] = None
+
+    @property
+    def count(self) -> int:
+        return len(self.statements)
+
+    def repeated(self) -> Dict[str, int]:
+        """Formes de requête répétées au moins `repeat_threshold` fois."""
+        if self.repeat_threshold is None:
+            return {}
+        return {
+            shape: count
+            for shape, count in Counter(self.statements).items()
+            if count >= self.repeat_threshold
+        }
+
+    def violations(self) -> List[str]:
+        problems = []
+        if self.max_queries is not None and self.count > self.max_queries:
+            problems.append(
+                f"{self.count} requêtes pour un budget de {self.max_queries}"
+            )
+        for shape, count in self.repeated().items():
+            problems.append(f"N+1 probable, {count} fois : {shape}")
+        return problems
+
+    def __enter__(self) -> "QueryBudget":
+        self.statements = []
+        self._token = _active_budgets.set(_active_budgets.get() + (self,))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _active_budgets.reset(self._token)
+        self._token = None
+        if exc_type is not None:
+            # L'exception d'origine prime sur le bilan des requêtes
+            return
+        problems = self.violations()
+        if not problems:
+            return
+        message = f"{self.name or 'budget de requêtes'} : " + " ; ".join(problems)
+        if self.raise_on_violation:
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    def __call__(self, func: Callable) -> Callable:
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            # Un budget neuf par appel : les appels concurrents ne se mélangent pas
+            budget = QueryBudget(
+                self.max_queries,
+                name=self.name or func.__qualname__,
+                repeat_threshold=self.repeat_threshold,
+                raise_on_violation=self.raise_on_violation,
+            )
+            with budget:
+                return await func(*args, **kwargs)
+
+        return wrapper
+
+
+# Budgets actifs dans le contexte courant, hérité par les greenlets de SQLAlchemy
+_active_budgets: ContextVar[Tuple[QueryBudget, ...]] = ContextVar(
+    "query_budgets", default=()
+)
+
+
+def _record_statement(
+    conn, statement, parameters, executemany, elapsed, activity
+) -> None:
+    budgets = _active_budgets.get()
+    if budgets:
+        shape = statement_shape(statement)
+        for budget in budgets:
+            budget.statements.append(shape)
+
+
+def watch_engine(engine: AsyncEngine) -> None:
+    """Compte les requêtes de `engine` dans les budgets actifs."""
+    install_statement_hooks(engine)
+    add_statement_listener(_record_statement)
+
+
+class QueryBudgetMiddleware:
+    """Ouvre un budget par requête HTTP et journalise les N+1 détectés.
+
+    Pensé pour le développement et la préproduction : `max_queries` borne
+    toutes les routes, les budgets par route sont vérifiés par
+    tests/test_query_budgets.py.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        max_queries: Optional[int] = None,
+        repeat_threshold: Optional[int] = N_PLUS_ONE_THRESHOLD,
+    ) -> None:
+        self.app = app
+        self.max_queries = max_queries
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        budget = QueryBudget(
+            self.max_queries,
+            repeat_threshold=self.repeat_threshold,
+            raise_on_violation=False,
+        )
+        with budget:
+            await self.app(scope, receive, send)
+            # La route n'est connue qu'une fois la requête aiguillée
+            route = getattr(scope.get("route"), "path", None) or scope["path"]
+            budget.name = f"{scope['method']} {route}"
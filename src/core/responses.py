@@ -0,0 +1,32 @@
+import json
+from datetime import date, datetime
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # orjson est une dépendance optionnelle (extra "perf")
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    """Encode les types non natifs pour le repli sur le module json standard."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONResponse(JSONResponse):
+    """Réponse JSON encodée par orjson si disponible, sinon par json en mode compact.
+
+    Destinée aux contenus déjà construits en dictionnaires (voir
+    schemas.serializers) : aucune validation pydantic n'est refaite à l'envoi.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(content)
+        return json.dumps(
+            content, ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode("utf-8")
@@ -0,0 +1,185 @@
+import json
+import logging
+import sys
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+import greenlet
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from core.query_budget import statement_shape
+from core.sql_events import add_statement_listener, install_statement_hooks
+
+logger = logging.getLogger(__name__)
+
+# Modules traversés par toute requête, jamais retenus comme appelant
+_INTERNAL_MODULES = ("sqlalchemy", "asyncio", "core.sql_events", __name__)
+
+
+def parameters_shape(parameters: Any, executemany: bool) -> str:
+    """Types des paramètres liés, sans leurs valeurs (jamais journalisées)."""
+    if executemany:
+        rows = list(parameters)
+        return f"{len(rows)} x {parameters_shape(rows[0], False)}" if rows else "[]"
+    if isinstance(parameters, dict):
+        types = (f"{key}: {type(value).__name__}" for key, value in parameters.items())
+        return "{" + ", ".join(types) + "}"
+    return "(" + ", ".join(type(value).__name__ for value in parameters or ()) + ")"
+
+
+def calling_function() -> Optional[str]:
+    """Fonction de repository à l'origine de la requête en cours.
+
+    La requête s'exécute dans un greenlet de SQLAlchemy : la pile de la
+    coroutine appelante est celle du greenlet parent, suspendu pendant
+    l'exécution. La première fonction d'un module `repositories.` l'emporte,
+    à défaut la première hors de SQLAlchemy et d'asyncio.
+    """
+    frames = []
+    parent = greenlet.getcurrent().parent
+    for frame in (sys._getframe(1), parent.gr_frame if parent is not None else None):
+        while frame is not None:
+            frames.append(frame)
+            frame = frame.f_back
+
+    fallback = None
+    for frame in frames:
+        module = frame.f_globals.get("__name__", "")
+        if module.startswith("repositories."):
+            return f"{module}.{frame.f_code.co_name}"
+        if fallback is None and not module.startswith(_INTERNAL_MODULES):
+            fallback = f"{module}.{frame.f_code.co_name}"
+    return fallback
+
+
+@dataclass
+class SlowQueryStats:
+    """Agrégat des exécutions lentes d'une même forme de requête."""
+
+    statement: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+    parameters: str = ""
+    callers: Counter = field(default_factory=Counter)
+    routes: Counter = field(default_factory=Counter)
+    plan: Optional[List[str]] = None
+
+    def add(
+        self,
+        duration_ms: float,
+        parameters: str,
+        caller: Optional[str],
+        route: Optional[str],
+    ) -> None:
+        self.count += 1
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.parameters = parameters
+        self.callers[caller] += 1
+        self.routes[route] += 1
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "statement": self.statement,
+            "count": self.count,
+            "total_ms": round(self.total_ms, 3),
+            "mean_ms": round(self.total_ms / self.count, 3),
+            "max_ms": round(self.max_ms, 3),
+            "parameters": self.parameters,
+            "callers": dict(self.callers.most_common()),
+            "routes": dict(self.routes.most_common()),
+            "plan": self.plan,
+        }
+
+
+class SlowQueryLog:
+    """Journal des requêtes SQL dépassant `threshold_ms`.
+
+    Chaque requête lente est journalisée en JSON (durée, forme de la requête,
+    types des paramètres, fonction de repository appelante, route) et agrégée
+    par forme de requête pour le rapport `top()`. Le plan (EXPLAIN QUERY PLAN)
+    est capturé une fois par forme, sur la connexion qui vient de l'exécuter.
+    Un seuil nul journalise toutes les requêtes, comme `echo=True`.
+    """
+
+    def __init__(
+        self, threshold_ms: float, explain: bool = True, max_statements: int = 1000
+    ) -> None:
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self.max_statements = max_statements
+        self._stats: Dict[str, SlowQueryStats] = {}
+
+    def install(self, engine: AsyncEngine) -> None:
+        install_statement_hooks(engine)
+        add_statement_listener(self._record_statement)
+
+    def _record_statement(
+        self, conn, statement, parameters, executemany, elapsed, activity
+    ):
+        if elapsed < self.threshold:
+            return
+
+        shape = statement_shape(statement)
+        stats = self._stats.get(shape)
+        if stats is None:
+            if len(self._stats) >= self.max_statements:
+                # Formes en nombre borné : les suivantes sont journalisées seulement
+                stats = SlowQueryStats(shape)
+            else:
+                stats = self._stats[shape] = SlowQueryStats(shape)
+                if self.explain and conn.dialect.name == "sqlite":
+                    stats.plan = self._explain(conn, statement, parameters, executemany)
+
+        route = activity.route if activity is not None else None
+        caller = calling_function()
+        duration_ms = elapsed * 1000
+        stats.add(duration_ms, parameters_shape(parameters, executemany), caller, route)
+
+        logger.warning(
+            json.dumps(
+                {
+                    "event": "slow_query",
+                    "duration_ms": round(duration_ms, 3),
+                    "statement": shape,
+                    "parameters": stats.parameters,
+                    "caller": caller,
+                    "route": route,
+                    "plan": stats.plan,
+                },
+                ensure_ascii=False,
+            )
+        )
+
+    @staticmethod
+    def _explain(
+        conn, statement: str, parameters: Any, executemany: bool
+    ) -> Optional[List[str]]:
+        if executemany:
+            parameters = next(iter(parameters), ())
+        cursor = conn.connection.cursor()
+        try:
+            cursor.execute(f"EXPLAIN QUERY PLAN {statement}", parameters)
+            return [row[-1] for row in cursor.fetchall()]
+        except Exception:
+            # Un plan indisponible ne doit jamais faire échouer la requête
+            logger.debug(
+                "EXPLAIN QUERY PLAN impossible pour : %s", statement, exc_info=True
+            )
+            return None
+        finally:
+            cursor.close()
+
+    def top(self, limit: int = 20, order_by: str = "total_ms") -> List[Dict[str, Any]]:
+        """Formes de requête les plus coûteuses (`total_ms`, `max_ms` ou `count`)."""
+        ranked = sorted(
+            self._stats.values(),
+            key=lambda stats: getattr(stats, order_by),
+            reverse=True,
+        )
+        return [stats.as_dict() for stats in ranked[:limit]]
+
+    def reset(self) -> None:
+        self._stats.clear()
@@ -0,0 +1,115 @@
+"""Suivi des requêtes SQL : un seul couple d'écouteurs par moteur.
+
+Chaque requête est chronométrée une fois, puis comptée dans l'activité de la
+requête HTTP en cours (`SqlActivity`) et transmise aux observateurs inscrits
+par `add_statement_listener` : budgets de requêtes (core/query_budget.py) et
+journal des requêtes lentes (core/slow_queries.py). Les métriques et les
+bancs d'essai lisent l'activité de la requête au lieu de tenir leurs propres
+compteurs.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Callable, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+
+@dataclass
+class SqlActivity:
+    """Activité base de données de la requête HTTP en cours."""
+
+    scope: Optional[Scope] = None
+    statements: int = 0
+    db_time: float = 0.0
+
+    @property
+    def route(self) -> Optional[str]:
+        if self.scope is None:
+            return None
+        # Modèle de chemin si la requête a déjà été aiguillée (cas des handlers)
+        path = getattr(self.scope.get("route"), "path", None) or self.scope["path"]
+        return f"{self.scope['method']} {path}"
+
+
+# Partagé avec les greenlets de SQLAlchemy, qui héritent du contexte de la requête
+_current_activity: ContextVar[Optional[SqlActivity]] = ContextVar(
+    "sql_activity", default=None
+)
+
+# Observateur : (connexion, requête, paramètres, executemany, durée, activité)
+StatementListener = Callable[[Any, str, Any, bool, float, Optional[SqlActivity]], None]
+
+_listeners: List[StatementListener] = []
+
+
+def current_activity() -> Optional[SqlActivity]:
+    return _current_activity.get()
+
+
+@contextmanager
+def track_statements(scope: Optional[Scope] = None) -> Iterator[SqlActivity]:
+    """Compte les requêtes SQL du bloc.
+
+    Une activité déjà ouverte par l'appelant (banc d'essai qui pilote
+    l'application en processus) est réutilisée : ses compteurs voient alors
+    les requêtes de l'application.
+    """
+    activity = _current_activity.get()
+    if activity is not None:
+        if activity.scope is None:
+            activity.scope = scope
+        yield activity
+        return
+    activity = SqlActivity(scope)
+    token = _current_activity.set(activity)
+    try:
+        yield activity
+    finally:
+        _current_activity.reset(token)
+
+
+def add_statement_listener(listener: StatementListener) -> None:
+    """Transmet chaque requête exécutée, et sa durée, à `listener`."""
+    if listener not in _listeners:
+        _listeners.append(listener)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._statement_start = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - context._statement_start
+    activity = _current_activity.get()
+    if activity is not None:
+        activity.statements += 1
+        activity.db_time += elapsed
+    for listener in _listeners:
+        listener(conn, statement, parameters, executemany, elapsed, activity)
+
+
+def install_statement_hooks(engine: AsyncEngine) -> None:
+    """Installe les écouteurs sur `engine`, une seule fois quel que soit l'appelant."""
+    sync_engine = engine.sync_engine
+    if event.contains(sync_engine, "after_cursor_execute", _after_cursor_execute):
+        return
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+
+
+class SqlActivityMiddleware:
+    """Ouvre l'activité SQL de chaque requête HTTP (métriques, requêtes lentes)."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        with track_statements(scope):
+            await self.app(scope, receive, send)
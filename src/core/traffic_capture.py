@@ -0,0 +1,146 @@
+import json
+import random
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional, TextIO
+
+from jose import JWTError, jwt
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from settings import settings
+
+# Champs de corps JSON jamais enregistrés en clair
+REDACTED_FIELDS = {"password"}
+REDACTED = "<redacted>"
+
+
+def redact(value: Any) -> Any:
+    """Masque récursivement les champs sensibles d'un document JSON."""
+    if isinstance(value, dict):
+        return {
+            key: REDACTED if key in REDACTED_FIELDS else redact(item)
+            for key, item in value.items()
+        }
+    if isinstance(value, list):
+        return [redact(item) for item in value]
+    return value
+
+
+def token_subject(authorization: Optional[str]) -> Optional[str]:
+    """Sujet (nom d'utilisateur) d'un en-tête `Bearer`, sans vérifier l'expiration."""
+    if not authorization:
+        return None
+    scheme, _, token = authorization.partition(" ")
+    if scheme.lower() != "bearer" or not token:
+        return None
+    try:
+        payload = jwt.decode(
+            token,
+            settings.SECRET_KEY.get_secret_value(),
+            algorithms=[settings.ALGORITHM],
+            options={"verify_exp": False},
+        )
+    except JWTError:
+        return None
+    return payload.get("sub")
+
+
+class TrafficCaptureMiddleware:
+    """Enregistre un échantillon des requêtes reçues dans un fichier JSONL.
+
+    Chaque ligne décrit une requête : instant de début, méthode, route, chemin,
+    query string, corps (JSON masqué), sujet du token, statut et durée. Un corps
+    de plus de `max_body` octets ou non JSON n'est pas enregistré : `body` est
+    alors nul et `body_omitted` en donne la raison (`truncated`, `not_json`),
+    pour que le rejeu ne le réémette pas sans corps. Le token lui-même n'est
+    jamais enregistré : la rejouer (scripts/replay_traffic.py) en émet un
+    nouveau pour le même sujet.
+    """
+
+    def __init__(
+        self, app: ASGIApp, path: str, sample_rate: float, max_body: int
+    ) -> None:
+        self.app = app
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_body = max_body
+        self._file: Optional[TextIO] = None
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or random.random() >= self.sample_rate:
+            await self.app(scope, receive, send)
+            return
+
+        started_at = time.time()
+        started = time.perf_counter()
+        body = bytearray()
+        truncated = False
+        status = 500
+
+        async def capture_receive() -> Message:
+            nonlocal truncated
+            message = await receive()
+            if message["type"] == "http.request":
+                chunk = message.get("body", b"")
+                if len(body) + len(chunk) > self.max_body:
+                    truncated = True
+                else:
+                    body.extend(chunk)
+            return message
+
+        async def capture_send(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, capture_receive, capture_send)
+        finally:
+            self._write(scope, started_at, started, bytes(body), truncated, status)
+
+    def _write(
+        self,
+        scope: Scope,
+        started_at: float,
+        started: float,
+        body: bytes,
+        truncated: bool,
+        status: int,
+    ) -> None:
+        headers = {
+            key.decode("latin-1"): value.decode("latin-1")
+            for key, value in scope["headers"]
+        }
+        route = scope.get("route")
+        record = {
+            "timestamp": datetime.fromtimestamp(started_at, timezone.utc).isoformat(),
+            "started_at": started_at,
+            "method": scope["method"],
+            "route": getattr(route, "path", None),
+            "path": scope["path"],
+            "query": scope["query_string"].decode("latin-1"),
+            "content_type": headers.get("content-type"),
+            **self._encode_body(body, truncated),
+            "subject": token_subject(headers.get("authorization")),
+            "status": status,
+            "duration_ms": round((time.perf_counter() - started) * 1000, 3),
+        }
+        if self._file is None:
+            self._file = open(self.path, "a", encoding="utf-8")
+        # Écriture synchrone d'une ligne : l'échantillonnage en borne le coût
+        self._file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self._file.flush()
+
+    @staticmethod
+    def _encode_body(body: bytes, truncated: bool) -> Dict[str, Any]:
+        """Champs `body` et `body_omitted` de l'enregistrement."""
+        if truncated:
+            return {"body": None, "body_omitted": "truncated"}
+        if not body:
+            return {"body": None, "body_omitted": None}
+        try:
+            return {"body": redact(json.loads(body)), "body_omitted": None}
+        except ValueError:
+            # Corps non JSON : non rejouable sans risque de divulgation, ignoré
+            return {"body": None, "body_omitted": "not_json"}
@@ -1,18 +1,86 @@
-from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
-# Chemin vers la base de données SQLite
-SQLITE_URL = "sqlite+aiosqlite:///./realworld.db"
+from core.metrics import InstrumentedPool
+from settings import Settings, settings
 
-# Création du moteur asynchrone
-engine = create_async_engine(
-    SQLITE_URL,
-    echo=True,  # Active les logs SQL pour le débogage
-    future=True,
-)
 
-# Création de la session asynchrone
+def is_memory_database(database_url: str) -> bool:
+    """Indique si l'URL désigne une base SQLite en mémoire."""
+    url = make_url(database_url)
+    if url.get_backend_name() != "sqlite":
+        return False
+    return url.database in (None, "", ":memory:") or url.query.get("mode") == "memory"
+
+
+def create_db_engine(config: Settings, readonly: bool = False) -> AsyncEngine:
+    """Crée un moteur asynchrone à partir de la configuration.
+
+    Le moteur d'écriture n'ouvre qu'une connexion : SQLite n'admet qu'un
+    écrivain à la fois, les écritures attendent donc leur tour dans le pool
+    plutôt que sur le verrou de la base. Le moteur de lecture ouvre un petit
+    pool de connexions en lecture seule (PRAGMA query_only), qui en mode WAL
+    lisent sans bloquer ni être bloquées par l'écrivain.
+
+    Une base en mémoire garde le pool par défaut de SQLAlchemy (StaticPool,
+    une connexion partagée), sans lequel chaque connexion verrait sa propre
+    base vide.
+    """
+    if is_memory_database(config.DATABASE_URL):
+        engine = create_async_engine(config.DATABASE_URL)
+    else:
+        pool_size = config.DATABASE_READ_POOL_SIZE if readonly else 1
+        engine = create_async_engine(
+            config.DATABASE_URL,
+            poolclass=(
+                InstrumentedPool if config.METRICS_ENABLED else AsyncAdaptedQueuePool
+            ),
+            pool_logging_name="read" if readonly else "write",
+            pool_size=pool_size,
+            max_overflow=0,
+            pool_timeout=config.DATABASE_POOL_TIMEOUT,
+        )
+
+    if engine.dialect.name == "sqlite":
+        pragmas = [
+            f"PRAGMA journal_mode={config.SQLITE_JOURNAL_MODE}",
+            f"PRAGMA synchronous={config.SQLITE_SYNCHRONOUS}",
+            f"PRAGMA mmap_size={config.SQLITE_MMAP_SIZE}",
+            f"PRAGMA cache_size={config.SQLITE_CACHE_SIZE}",
+            f"PRAGMA busy_timeout={config.SQLITE_BUSY_TIMEOUT}",
+            # Applique les ondelete="CASCADE" déclarés par les modèles
+            "PRAGMA foreign_keys=ON",
+        ]
+        if readonly:
+            pragmas.append("PRAGMA query_only=ON")
+
+        @event.listens_for(engine.sync_engine, "connect")
+        def apply_pragmas(dbapi_connection, connection_record):
+            cursor = dbapi_connection.cursor()
+            for pragma in pragmas:
+                cursor.execute(pragma)
+            cursor.close()
+
+    return engine
+
+
+# Moteur d'écriture (connexion unique) et moteur de lecture (pool en lecture seule).
+# Une base en mémoire n'existe que dans sa connexion : lectures et écritures
+# passent alors par le même moteur.
+engine = create_db_engine(settings)
+if is_memory_database(settings.DATABASE_URL):
+    read_engine = engine
+else:
+    read_engine = create_db_engine(settings, readonly=True)
+
+# Création des sessions asynchrones
 async_session = sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+async_read_session = sessionmaker(
+    read_engine, class_=AsyncSession, expire_on_commit=False
+)
 
 
 # Classe de base pour tous les modèles
@@ -24,3 +92,9 @@ class Base(DeclarativeBase):
 async def get_session() -> AsyncSession:
     async with async_session() as session:
         yield session
+
+
+# Fonction pour obtenir une session en lecture seule
+async def get_read_session() -> AsyncSession:
+    async with async_read_session() as session:
+        yield session
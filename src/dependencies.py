@@ -1,29 +1,47 @@
 from typing import AsyncGenerator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError, jwt
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from database import get_session
-from models.user_sql import UserModel
-from repositories.user_repository import get_user_by_username
+from database import get_read_session, get_session
+from repositories.user_cache import UserSnapshot
+from repositories.user_repository import get_user_snapshot
 from settings import settings as SETTINGS
 
 bearer_scheme = HTTPBearer(auto_error=False)
 
+# Méthodes HTTP servies par une session en lecture seule
+READ_METHODS = {"GET", "HEAD", "OPTIONS"}
 
-async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    """Dépendance pour obtenir une session de base de données."""
-    async for session in get_session():
+
+async def get_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Dépendance pour obtenir une session de base de données.
+
+    Les requêtes de lecture reçoivent une session du pool en lecture seule ;
+    les mutations, une session sur la connexion d'écriture.
+    """
+    sessions = get_read_session if request.method in READ_METHODS else get_session
+    async for session in sessions():
+        yield session
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """Dépendance pour obtenir une session en lecture, quelle que soit la méthode."""
+    async for session in get_read_session():
         yield session
 
 
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> UserModel:
-    """Dépendance pour obtenir l'utilisateur actuel à partir du token JWT."""
+) -> UserSnapshot:
+    """Dépendance pour obtenir l'utilisateur actuel à partir du token JWT.
+
+    L'utilisateur est servi depuis le cache des utilisateurs authentifiés ;
+    la base n'est interrogée qu'en cas d'échec du cache.
+    """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -45,7 +63,7 @@ async def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = await get_user_by_username(db, username)
+    user = await get_user_snapshot(db, username)
     if user is None:
         raise credentials_exception
 
@@ -53,8 +71,8 @@ async def get_current_user(
 
 
 async def get_current_active_user(
-    current_user: UserModel = Depends(get_current_user),
-) -> UserModel:
+    current_user: UserSnapshot = Depends(get_current_user),
+) -> UserSnapshot:
     """Dépendance pour obtenir l'utilisateur actuel actif."""
     return current_user
 
@@ -62,7 +80,7 @@ async def get_current_active_user(
 async def get_current_user_optional(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
     db: AsyncSession = Depends(get_db),
-) -> Optional[UserModel]:
+) -> Optional[UserSnapshot]:
     """Dépendance pour obtenir l'utilisateur actuel optionnel (pour les endpoints qui ne nécessitent pas d'authentification)."""
     if credentials is None:
         return None
@@ -79,5 +97,4 @@ async def get_current_user_optional(
     except JWTError:
         return None
 
-    user = await get_user_by_username(db, username, raise_exception=False)
-    return user
+    return await get_user_snapshot(db, username)
@@ -1,91 +1,248 @@
 from datetime import datetime
-from typing import Optional
+from typing import Awaitable, Callable, Optional
 
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Query, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import ArticleNotFoundException, NotArticleAuthorException
-from dependencies import get_current_active_user, get_db
-from models.article_sql import ArticleModel
-from models.user_sql import UserModel
+from core.responses import FastJSONResponse
+from dependencies import get_current_active_user, get_current_user_optional, get_db
 from repositories.article_repository import (
+    FavoriteState,
     create_article,
     delete_article,
     favorite_article,
-    get_article_by_slug,
-    get_articles,
-    get_articles_count,
+    get_article_for_update,
+    get_article_ref,
+    get_article_row_by_slug,
+    get_article_rows_page,
+    get_article_version,
+    get_favorited_article_ids,
+    is_following,
+    search_articles,
     unfavorite_article,
     update_article,
 )
+from repositories.comment_repository import has_comments_from_others
+from repositories.feed_repository import get_feed_rows_page
+from repositories.tag_repository import get_tag_usage_for_article
+from repositories.user_cache import UserSnapshot
 from schemas.article import (
+    ArticleSearchResponse,
     MultipleArticlesResponse,
     NewArticle,
     SingleArticleResponse,
     UpdateArticle,
 )
+from schemas.serializers import serialize_article_row, serialize_article_rows
+from utils.http_cache import conditional_response, etag_matches, not_modified, weak_etag
+from utils.pagination import next_cursor
 
 router = APIRouter()
 
 
+async def _article_response(
+    db: AsyncSession,
+    slug: str,
+    current_user: Optional[UserSnapshot],
+    favorited: Optional[bool] = None,
+    following: Optional[bool] = None,
+) -> FastJSONResponse:
+    """Construit la réponse détail d'un article depuis sa projection à plat.
+
+    `favorited` et `following` peuvent être fournis quand l'appelant les
+    connaît déjà (mutation, calcul de l'ETag).
+    """
+    row, tag_list = await get_article_row_by_slug(db, slug)
+    if current_user is not None:
+        if favorited is None:
+            favorited = row.id in await get_favorited_article_ids(
+                db, current_user.id, [row.id]
+            )
+        if following is None:
+            following = await is_following(db, current_user.id, row.author_id)
+
+    return FastJSONResponse(
+        serialize_article_row(
+            row, tag_list, favorited=bool(favorited), following=bool(following)
+        )
+    )
+
+
+async def _favorite_response(
+    db: AsyncSession,
+    slug: str,
+    current_user: UserSnapshot,
+    write: Callable[[AsyncSession, int, int], Awaitable[Optional[FavoriteState]]],
+) -> FastJSONResponse:
+    """Applique une (dé)mise en favori et construit la réponse détail.
+
+    L'article est lu une seule fois, avant l'écriture ; le nombre de favoris
+    affiché est celui retourné par l'écriture (UPDATE ... RETURNING).
+    """
+    row, tag_list = await get_article_row_by_slug(db, slug)
+    following = await is_following(db, current_user.id, row.author_id)
+    state = await write(db, row.id, current_user.id)
+    if state is None:
+        raise ArticleNotFoundException()
+
+    content = serialize_article_row(
+        row, tag_list, favorited=state.favorited, following=following
+    )
+    content["article"]["favoritesCount"] = state.favorites_count
+    return FastJSONResponse(content)
+
+
 @router.get("/articles", response_model=MultipleArticlesResponse)
 async def get_articles_endpoint(
+    request: Request,
     author: str | None = None,
     favorited: str | None = None,
     tag: str | None = None,
     limit: int = 20,
     offset: int = 0,
-    current_user: Optional[UserModel] = Depends(get_current_active_user),
+    cursor: str | None = None,
+    current_user: Optional[UserSnapshot] = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    """Récupère les articles avec filtres optionnels."""
-    articles = await get_articles(
-        db, author=author, favorited=favorited, tag=tag, limit=limit, offset=offset
-    )
-    articles_count = await get_articles_count(
-        db, author=author, favorited=favorited, tag=tag
+    """Récupère les articles avec filtres optionnels.
+
+    `cursor` (valeur `nextCursor` de la page précédente) active la pagination
+    par clé ; sans curseur, `offset` reste supporté. L'ETag est l'empreinte de
+    la page : un client à jour reçoit un 304 sans corps.
+    """
+    rows, tags_by_article, articles_count = await get_article_rows_page(
+        db,
+        author=author,
+        favorited=favorited,
+        tag=tag,
+        limit=limit,
+        offset=offset,
+        cursor=cursor,
     )
+    favorited_ids = set()
+    if current_user is not None:
+        favorited_ids = await get_favorited_article_ids(
+            db, current_user.id, [row.id for row in rows]
+        )
 
-    return MultipleArticlesResponse(
-        articles=articles,
-        articles_count=articles_count,
+    response = FastJSONResponse(
+        serialize_article_rows(
+            rows,
+            tags_by_article,
+            total_count=articles_count,
+            favorited_ids=favorited_ids,
+            next_cursor=next_cursor(rows, limit),
+        )
     )
+    return conditional_response(request, response, vary="Authorization")
 
 
 @router.get("/articles/feed", response_model=MultipleArticlesResponse)
 async def get_feed_articles(
+    request: Request,
     limit: int = 20,
     offset: int = 0,
-    current_user: UserModel = Depends(get_current_active_user),
+    cursor: str | None = None,
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Récupère les articles des utilisateurs suivis."""
-    articles = await get_articles(
-        db, followed_by=current_user.id, limit=limit, offset=offset
+    rows, tags_by_article, articles_count = await get_feed_rows_page(
+        db, current_user.id, limit=limit, offset=offset, cursor=cursor
+    )
+    favorited_ids = await get_favorited_article_ids(
+        db, current_user.id, [row.id for row in rows]
+    )
+
+    response = FastJSONResponse(
+        serialize_article_rows(
+            rows,
+            tags_by_article,
+            total_count=articles_count,
+            favorited_ids=favorited_ids,
+            next_cursor=next_cursor(rows, limit),
+        )
+    )
+    return conditional_response(request, response, vary="Authorization")
+
+
+@router.get("/articles/search", response_model=ArticleSearchResponse)
+async def search_articles_endpoint(
+    q: str = Query(..., min_length=1),
+    author: str | None = None,
+    favorited: str | None = None,
+    tag: str | None = None,
+    limit: int = 20,
+    offset: int = 0,
+    current_user: Optional[UserSnapshot] = Depends(get_current_user_optional),
+    db: AsyncSession = Depends(get_db),
+):
+    """Recherche plein texte dans les articles, classée par pertinence."""
+    results, articles_count = await search_articles(
+        db,
+        q,
+        author=author,
+        favorited=favorited,
+        tag=tag,
+        limit=limit,
+        offset=offset,
     )
-    articles_count = await get_articles_count(db, followed_by=current_user.id)
+    favorited_ids = set()
+    if current_user is not None:
+        favorited_ids = await get_favorited_article_ids(
+            db, current_user.id, [article.id for article, _ in results]
+        )
 
-    return MultipleArticlesResponse(
-        articles=articles,
-        articles_count=articles_count,
+    return ArticleSearchResponse.from_search_results(
+        results, total_count=articles_count, favorited_ids=favorited_ids
     )
 
 
 @router.get("/articles/{slug}", response_model=SingleArticleResponse)
 async def get_article(
     slug: str,
-    current_user: Optional[UserModel] = Depends(get_current_active_user),
+    request: Request,
+    current_user: Optional[UserSnapshot] = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    """Récupère un article par son slug."""
-    article = await get_article_by_slug(db, slug)
-    return SingleArticleResponse(article=article)
+    """Récupère un article par son slug.
+
+    L'ETag est calculé depuis la version de l'article et de son auteur (sans
+    charger le corps ni les tags) et l'état propre au lecteur : un client à
+    jour reçoit un 304 sans que l'article soit chargé ni sérialisé.
+    """
+    version = await get_article_version(db, slug)
+    favorited = following = False
+    if current_user is not None:
+        favorited = version.id in await get_favorited_article_ids(
+            db, current_user.id, [version.id]
+        )
+        following = await is_following(db, current_user.id, version.author_id)
+
+    etag = weak_etag(
+        version.id,
+        version.updated_at,
+        version.favorites_count,
+        version.author_updated_at,
+        favorited,
+        following,
+    )
+    if etag_matches(request, etag):
+        return not_modified(etag, vary="Authorization")
+
+    response = await _article_response(
+        db, slug, current_user, favorited=favorited, following=following
+    )
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Authorization"
+    return response
 
 
 @router.post("/articles", response_model=SingleArticleResponse)
 async def create_article_endpoint(
     article: NewArticle = Body(..., embed=True),
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Crée un nouvel article."""
@@ -97,18 +254,18 @@ async def create_article_endpoint(
         tag_list=article.tag_list,
         author_id=current_user.id,
     )
-    return SingleArticleResponse(article=new_article)
+    return SingleArticleResponse.from_article_instance(new_article)
 
 
 @router.put("/articles/{slug}", response_model=SingleArticleResponse)
 async def update_article_endpoint(
     slug: str,
     article: UpdateArticle = Body(..., embed=True),
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Met à jour un article existant."""
-    existing_article = await get_article_by_slug(db, slug)
+    existing_article = await get_article_for_update(db, slug)
 
     # Vérifier que l'utilisateur est l'auteur de l'article
     if existing_article.author_id != current_user.id:
@@ -126,45 +283,50 @@ async def update_article_endpoint(
         tag_list=update_data.get("tag_list"),
     )
 
-    return SingleArticleResponse(article=updated_article)
+    return SingleArticleResponse.from_article_instance(updated_article)
 
 
 @router.delete("/articles/{slug}")
 async def delete_article_endpoint(
     slug: str,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Supprime un article avec des vérifications complexes."""
-    existing_article = await get_article_by_slug(db, slug)
+    existing_article = await get_article_ref(db, slug)
 
     # Vérification complexe des conditions de suppression
     if existing_article.author_id != current_user.id:
-        if len(existing_article.favorited_by) > 0:
-            for user in existing_article.favorited_by:
-                if user.id == current_user.id:
-                    raise NotArticleAuthorException(
-                        "Cannot delete an article you've favorited but don't own"
-                    )
+        if existing_article.id in await get_favorited_article_ids(
+            db, current_user.id, [existing_article.id]
+        ):
+            raise NotArticleAuthorException(
+                "Cannot delete an article you've favorited but don't own"
+            )
         raise NotArticleAuthorException()
 
+    # Nombre d'articles utilisant chacun des tags de l'article
+    tag_usage = await get_tag_usage_for_article(db, existing_article.id)
+
     # Vérification de l'âge de l'article et des interactions
     current_time = datetime.utcnow()
     article_age = (current_time - existing_article.created_at).days
 
     if article_age > 30:  # Article plus vieux que 30 jours
-        if len(existing_article.comments) > 0:
-            if any(comment.author_id != current_user.id for comment in existing_article.comments):
-                if len(existing_article.tags) >= 3:
-                    raise HTTPException(
-                        status_code=status.HTTP_403_FORBIDDEN,
-                        detail="Cannot delete old articles with comments from others and multiple tags",
-                    )
+        if await has_comments_from_others(db, existing_article.id, current_user.id):
+            if len(tag_usage) >= 3:
+                raise HTTPException(
+                    status_code=status.HTTP_403_FORBIDDEN,
+                    detail=(
+                        "Cannot delete old articles with comments from others "
+                        "and multiple tags"
+                    ),
+                )
 
     # Vérification des tags et du contenu
-    if existing_article.body and len(existing_article.body) > 1000:
-        if len(existing_article.tags) > 0:
-            if any(tag.articles for tag in existing_article.tags if len(tag.articles) > 5):
+    if existing_article.body_length and existing_article.body_length > 1000:
+        if len(tag_usage) > 0:
+            if any(usage > 5 for usage in tag_usage):
                 raise HTTPException(
                     status_code=status.HTTP_403_FORBIDDEN,
                     detail="Cannot delete articles with popular tags",
@@ -177,22 +339,18 @@ async def delete_article_endpoint(
 @router.post("/articles/{slug}/favorite", response_model=SingleArticleResponse)
 async def favorite_article_endpoint(
     slug: str,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Ajoute un article aux favoris."""
-    article = await get_article_by_slug(db, slug)
-    await favorite_article(db, article.id, current_user.id)
-    return SingleArticleResponse(article=article)
+    return await _favorite_response(db, slug, current_user, favorite_article)
 
 
 @router.delete("/articles/{slug}/favorite", response_model=SingleArticleResponse)
 async def unfavorite_article_endpoint(
     slug: str,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Retire un article des favoris."""
-    article = await get_article_by_slug(db, slug)
-    await unfavorite_article(db, article.id, current_user.id)
-    return SingleArticleResponse(article=article)
+    return await _favorite_response(db, slug, current_user, unfavorite_article)
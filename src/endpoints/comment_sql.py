@@ -1,16 +1,20 @@
-from fastapi import APIRouter, Body, Depends, HTTPException, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Request, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import NotCommentAuthorException
+from core.responses import FastJSONResponse
 from dependencies import get_current_active_user, get_db
-from models.user_sql import UserModel
 from repositories.comment_repository import (
     create_comment,
     delete_comment,
-    get_article_comments,
-    get_comment_by_id,
+    get_article_comment_rows,
 )
+from repositories.user_cache import UserSnapshot
 from schemas.comment import MultipleCommentsResponse, NewComment, SingleCommentResponse
+from schemas.serializers import serialize_comment_rows
+from settings import settings
+from utils.http_cache import conditional_response
+from utils.pagination import next_cursor
 
 router = APIRouter()
 
@@ -18,18 +22,28 @@ router = APIRouter()
 @router.get("/articles/{slug}/comments", response_model=MultipleCommentsResponse)
 async def get_article_comments_endpoint(
     slug: str,
+    request: Request,
+    limit: int = settings.COMMENTS_PAGE_SIZE,
+    cursor: str | None = None,
     db: AsyncSession = Depends(get_db),
 ):
-    """Récupère tous les commentaires d'un article."""
-    comments = await get_article_comments(db, slug)
-    return MultipleCommentsResponse(comments=comments)
+    """Récupère une page de commentaires d'un article, du plus ancien au plus récent.
+
+    `limit` est borné par COMMENTS_MAX_PAGE_SIZE ; `cursor` (valeur `nextCursor`
+    de la page précédente) donne la page suivante. L'ETag est l'empreinte de la
+    page : un client à jour reçoit un 304 sans corps.
+    """
+    limit = min(max(limit, 1), settings.COMMENTS_MAX_PAGE_SIZE)
+    rows = await get_article_comment_rows(db, slug, limit=limit, cursor=cursor)
+    response = FastJSONResponse(serialize_comment_rows(rows, next_cursor(rows, limit)))
+    return conditional_response(request, response)
 
 
 @router.post("/articles/{slug}/comments", response_model=SingleCommentResponse)
 async def create_comment_endpoint(
     slug: str,
     comment: NewComment = Body(..., embed=True),
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Crée un nouveau commentaire pour un article."""
@@ -39,14 +53,14 @@ async def create_comment_endpoint(
         body=comment.body,
         author_id=current_user.id,
     )
-    return SingleCommentResponse(comment=new_comment)
+    return SingleCommentResponse.from_comment_instance(new_comment)
 
 
 @router.delete("/articles/{slug}/comments/{comment_id}")
 async def delete_comment_endpoint(
     slug: str,
     comment_id: int,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Supprime un commentaire."""
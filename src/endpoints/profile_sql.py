@@ -1,13 +1,14 @@
 from typing import Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies import get_current_active_user, get_current_user_optional, get_db
-from models.user_sql import UserModel
-from repositories.article_repository import follow_user, unfollow_user
+from repositories.article_repository import follow_user, is_following, unfollow_user
+from repositories.user_cache import UserSnapshot
 from repositories.user_repository import get_user_by_username
 from schemas.user import Profile, ProfileResponse
+from utils.http_cache import etag_matches, not_modified, weak_etag
 
 router = APIRouter()
 
@@ -15,24 +16,35 @@ router = APIRouter()
 @router.get("/profiles/{username}", response_model=ProfileResponse)
 async def get_profile(
     username: str,
-    current_user: Optional[UserModel] = Depends(get_current_user_optional),
+    request: Request,
+    response: Response,
+    current_user: Optional[UserSnapshot] = Depends(get_current_user_optional),
     db: AsyncSession = Depends(get_db),
 ):
-    """Récupère le profil d'un utilisateur."""
+    """Récupère le profil d'un utilisateur (ETag : version du profil et abonnement)."""
     user = await get_user_by_username(db, username)
     following = False
 
     if current_user is not None:
         # Vérifier si l'utilisateur actuel suit cet utilisateur
-        following = user.id in [f.id for f in current_user.following]
+        following = await is_following(db, current_user.id, user.id)
 
-    return ProfileResponse(profile=Profile(following=following, **user.dict()))
+    # updated_at ne change qu'avec le profil : les abonnements le conservent
+    etag = weak_etag(user.id, user.updated_at, following)
+    if etag_matches(request, etag):
+        return not_modified(etag, vary="Authorization")
+
+    response.headers["ETag"] = etag
+    response.headers["Vary"] = "Authorization"
+    return ProfileResponse(
+        profile=Profile.from_user_instance(user, following=following)
+    )
 
 
 @router.post("/profiles/{username}/follow", response_model=ProfileResponse)
 async def follow_user_endpoint(
     username: str,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Suit un utilisateur."""
@@ -46,17 +58,21 @@ async def follow_user_endpoint(
 
     await follow_user(db, current_user.id, user_to_follow.id)
 
-    return ProfileResponse(profile=Profile(following=True, **user_to_follow.dict()))
+    return ProfileResponse(
+        profile=Profile.from_user_instance(user_to_follow, following=True)
+    )
 
 
 @router.delete("/profiles/{username}/follow", response_model=ProfileResponse)
 async def unfollow_user_endpoint(
     username: str,
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Ne suit plus un utilisateur."""
     user_to_unfollow = await get_user_by_username(db, username)
     await unfollow_user(db, current_user.id, user_to_unfollow.id)
 
-    return ProfileResponse(profile=Profile(following=False, **user_to_unfollow.dict()))
+    return ProfileResponse(
+        profile=Profile.from_user_instance(user_to_unfollow, following=False)
+    )
@@ -1,17 +1,26 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from dependencies import get_db
-from repositories.article_repository import get_all_tags
+from repositories.tag_repository import get_tag_cloud
 from schemas.tag import TagsResponse
+from utils.http_cache import etag_matches
 
 router = APIRouter()
 
 
 @router.get("/tags", response_model=TagsResponse)
 async def get_tags(
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db),
 ):
-    """Récupère tous les tags disponibles."""
-    tags = await get_all_tags(db)
+    """Récupère les tags utilisés, du plus populaire au moins populaire."""
+    tags, _, etag = await get_tag_cloud(db)
+    if etag_matches(request, etag):
+        return Response(
+            status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag}
+        )
+
+    response.headers["ETag"] = etag
     return TagsResponse(tags=tags)
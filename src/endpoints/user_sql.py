@@ -1,52 +1,64 @@
 from fastapi import APIRouter, Body, Depends, HTTPException, status
-from passlib.context import CryptContext
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import InvalidCredentialsException
-from dependencies import get_current_active_user, get_db
+from dependencies import get_current_active_user, get_db, get_read_db
 from models.user_sql import UserModel
+from repositories.user_cache import UserSnapshot
 from repositories.user_repository import (
     create_user,
     get_user_by_email,
+    get_user_by_id,
     get_user_by_username,
     update_user,
 )
 from schemas.user import LoginUser, NewUser, UpdateUser, User, UserResponse
-from utils.security import create_access_token
+from utils.security import authenticate_user, create_access_token, password_hasher
 
 router = APIRouter()
 
-# Configuration pour le hachage des mots de passe
-PWD_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+@router.post("/users", response_model=UserResponse)
+async def register_user(
+    user: NewUser = Body(..., embed=True),
+    db: AsyncSession = Depends(get_db),
+):
+    """Enregistre un nouvel utilisateur.
 
-def get_password_hash(password: str) -> str:
-    """Hache un mot de passe."""
-    return PWD_CONTEXT.hash(password)
+    Le mot de passe est haché avant toute requête : la connexion d'écriture
+    n'est pas tenue pendant le hachage, et les vérifications d'unicité sont
+    suivies immédiatement de l'insertion.
+    """
+    hashed_password = await password_hasher.hash(user.password)
 
+    # Vérifier si l'utilisateur existe déjà
+    await _check_registration_available(db, user)
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
-    """Vérifie un mot de passe."""
-    return PWD_CONTEXT.verify(plain_password, hashed_password)
+    # Créer le nouvel utilisateur
+    db_user = UserModel(
+        username=user.username,
+        email=user.email,
+        hashed_password=hashed_password,
+    )
 
+    # Sauvegarder l'utilisateur ; une inscription concurrente (autre worker)
+    # peut encore l'emporter entre la vérification et l'insertion
+    try:
+        db_user = await create_user(db, db_user)
+    except IntegrityError:
+        await db.rollback()
+        await _check_registration_available(db, user)
+        raise
 
-async def authenticate_user(db: AsyncSession, email: str, password: str) -> UserModel:
-    """Vérifie les identifiants de l'utilisateur."""
-    user = await get_user_by_email(db, email)
-    if user is None:
-        return None
-    if not verify_password(password, user.hashed_password):
-        return None
-    return user
+    # Générer le token
+    token = create_access_token(db_user)
 
+    return UserResponse(user=User(token=token, **user.dict()))
 
-@router.post("/users", response_model=UserResponse)
-async def register_user(
-    user: NewUser = Body(..., embed=True),
-    db: AsyncSession = Depends(get_db),
-):
-    """Enregistre un nouvel utilisateur."""
-    # Vérifier si l'utilisateur existe déjà
+
+async def _check_registration_available(db: AsyncSession, user: NewUser) -> None:
+    """Refuse l'inscription si l'email ou le nom d'utilisateur est déjà pris."""
     existing_user = await get_user_by_email(db, user.email)
     if existing_user:
         raise HTTPException(
@@ -61,26 +73,11 @@ async def register_user(
             detail="Username already taken",
         )
 
-    # Créer le nouvel utilisateur
-    db_user = UserModel(
-        username=user.username,
-        email=user.email,
-        hashed_password=get_password_hash(user.password),
-    )
-
-    # Sauvegarder l'utilisateur
-    db_user = await create_user(db, db_user)
-
-    # Générer le token
-    token = create_access_token(db_user)
-
-    return UserResponse(user=User(token=token, **user.dict()))
-
 
 @router.post("/users/login", response_model=UserResponse)
 async def login_user(
     user_input: LoginUser = Body(..., embed=True, alias="user_input"),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ):
     """Connecte un utilisateur existant."""
     try:
@@ -110,7 +107,7 @@ async def login_user(
 @router.get("/user", response_model=UserResponse, 
             responses={401: {"description": "Unauthorized"}})
 async def current_user(
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
 ):
     """Récupère l'utilisateur actuel."""
     return UserResponse(
@@ -128,17 +125,29 @@ async def current_user(
             responses={401: {"description": "Unauthorized"}})
 async def update_current_user(
     user_update: UpdateUser = Body(..., embed=True, alias="user"),
-    current_user: UserModel = Depends(get_current_active_user),
+    current_user: UserSnapshot = Depends(get_current_active_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Met à jour l'utilisateur actuel."""
-    # Mettre à jour les champs
+    """Met à jour l'utilisateur actuel.
+
+    Le sujet du token étant le nom d'utilisateur, un nouveau token est renvoyé :
+    après un changement de nom, l'ancien ne résout plus vers cet utilisateur.
+    """
     update_data = user_update.dict(exclude_unset=True)
+    # Un nouveau mot de passe est haché avant toute requête, comme à l'inscription
+    password = update_data.pop("password", None)
+    if password is not None:
+        update_data["hashed_password"] = await password_hasher.hash(password)
+
+    # L'utilisateur courant est un instantané du cache : recharger le modèle
+    user = await get_user_by_id(db, current_user.id)
+
+    # Mettre à jour les champs
     for field, value in update_data.items():
-        setattr(current_user, field, value)
+        setattr(user, field, value)
 
     # Sauvegarder les modifications
-    updated_user = await update_user(db, current_user)
+    updated_user = await update_user(db, user)
 
     return UserResponse(
         user=User(
@@ -146,6 +155,6 @@ async def update_current_user(
             username=updated_user.username,
             bio=updated_user.bio,
             image=updated_user.image,
-            token="",  # Le token n'est pas nécessaire ici
+            token=create_access_token(updated_user),
         )
     )
@@ -2,7 +2,20 @@ from datetime import datetime
 from typing import List
 from uuid import uuid4
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table, Text
+from sqlalchemy import (
+    DDL,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    Table,
+    Text,
+    column,
+    event,
+    table,
+)
 from sqlalchemy.orm import Mapped, relationship
 
 from database import Base
@@ -18,8 +31,19 @@ def generate_random_str():
 article_tags = Table(
     "article_tags",
     Base.metadata,
-    Column("article_id", Integer, ForeignKey("articles.id", ondelete="CASCADE")),
-    Column("tag_id", Integer, ForeignKey("tags.id", ondelete="CASCADE")),
+    Column(
+        "article_id",
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "tag_id",
+        Integer,
+        ForeignKey("tags.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Index("ix_article_tags_tag_id", "tag_id", "article_id"),
 )
 
 # Table de liaison pour les articles favoris
@@ -33,14 +57,35 @@ article_favorites = Table(
         primary_key=True,
     ),
     Column("user_id", Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True),
+    Index("ix_article_favorites_user_id", "user_id", "article_id"),
 )
 
-# Table d'association pour les relations de suivi
-user_following = Table(
-    "user_following",
+# Fil d'actualité matérialisé : une entrée par (lecteur, article d'un auteur suivi),
+# alimentée à l'écriture (fan-out) et lue par parcours d'index
+timeline_entries = Table(
+    "timeline_entries",
     Base.metadata,
-    Column("follower_id", Integer, ForeignKey("users.id"), primary_key=True),
-    Column("followed_id", Integer, ForeignKey("users.id"), primary_key=True),
+    Column(
+        "user_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "article_id",
+        Integer,
+        ForeignKey("articles.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "author_id",
+        Integer,
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+    ),
+    Column("created_at", DateTime, nullable=False),
+    Index("ix_timeline_entries_user_created", "user_id", "created_at", "article_id"),
+    Index("ix_timeline_entries_user_author", "user_id", "author_id"),
 )
 
 
@@ -67,6 +112,9 @@ class CommentModel(Base):
     """Modèle pour les commentaires."""
 
     __tablename__ = "comments"
+    __table_args__ = (
+        Index("ix_comments_article_id_created_at", "article_id", "created_at"),
+    )
 
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
     body: Mapped[str] = Column(Text)
@@ -89,18 +137,30 @@ class ArticleModel(Base):
     """Modèle pour les articles."""
 
     __tablename__ = "articles"
+    __table_args__ = (
+        Index("ix_articles_author_id_created_at", "author_id", "created_at"),
+    )
 
     id: Mapped[int] = Column(Integer, primary_key=True, index=True)
     slug: Mapped[str] = Column(String(255), unique=True, index=True)
     title: Mapped[str] = Column(String(255))
     description: Mapped[str] = Column(String(255))
     body: Mapped[str] = Column(Text)
-    created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow)
+    # Indexé : clé de tri et de pagination par curseur (created_at, id)
+    created_at: Mapped[datetime] = Column(DateTime, default=datetime.utcnow, index=True)
     updated_at: Mapped[datetime] = Column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
     author_id: Mapped[int] = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"))
 
+    # Compteurs dénormalisés, maintenus par les repositories
+    favorites_count: Mapped[int] = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    comments_count: Mapped[int] = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     # Relations
     author: Mapped[UserModel] = relationship(UserModel, back_populates="articles")
     comments: Mapped[List[CommentModel]] = relationship(
@@ -119,3 +179,33 @@ class ArticleModel(Base):
 
     def __repr__(self):
         return f"<Article {self.slug}>"
+
+
+# Index plein texte FTS5 (contenu externe : articles), synchronisé par triggers.
+# Hors des métadonnées : créé avec la table articles via les DDL ci-dessous.
+articles_fts = table("articles_fts", column("rowid"), column("articles_fts"))
+
+ARTICLES_FTS_DDL = [
+    "CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5("
+    "title, description, body, content='articles', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN "
+    "INSERT INTO articles_fts(rowid, title, description, body) "
+    "VALUES (new.id, new.title, new.description, new.body); END",
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+    "VALUES ('delete', old.id, old.title, old.description, old.body); END",
+    # Limité aux colonnes indexées : les mises à jour de compteurs ne réindexent pas
+    "CREATE TRIGGER IF NOT EXISTS articles_fts_au "
+    "AFTER UPDATE OF title, description, body ON articles BEGIN "
+    "INSERT INTO articles_fts(articles_fts, rowid, title, description, body) "
+    "VALUES ('delete', old.id, old.title, old.description, old.body); "
+    "INSERT INTO articles_fts(rowid, title, description, body) "
+    "VALUES (new.id, new.title, new.description, new.body); END",
+]
+
+for _statement in ARTICLES_FTS_DDL:
+    event.listen(ArticleModel.__table__, "after_create", DDL(_statement))
+event.listen(
+    ArticleModel.__table__, "before_drop", DDL("DROP TABLE IF EXISTS articles_fts")
+)
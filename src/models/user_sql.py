@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import List, Optional, TYPE_CHECKING
 
-from sqlalchemy import Column, DateTime, ForeignKey, Integer, String, Table
+from sqlalchemy import Column, DateTime, ForeignKey, Index, Integer, String, Table
 from sqlalchemy.orm import Mapped, relationship
 
 from database import Base
@@ -27,6 +27,7 @@ user_follows = Table(
         ForeignKey("users.id", ondelete="CASCADE"),
         primary_key=True,
     ),
+    Index("ix_user_follows_followed_id", "followed_id", "follower_id"),
 )
 
 class UserModel(Base):
@@ -45,6 +46,14 @@ class UserModel(Base):
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
 
+    # Compteurs dénormalisés, maintenus par les repositories
+    followers_count: Mapped[int] = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+    following_count: Mapped[int] = Column(
+        Integer, default=0, server_default="0", nullable=False
+    )
+
     # Relations
     articles: Mapped[List["ArticleModel"]] = relationship(
         "ArticleModel", back_populates="author", cascade="all, delete-orphan"
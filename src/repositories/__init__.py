@@ -3,13 +3,23 @@ Repositories pour l'accès aux données avec SQLAlchemy
 """
 
 from repositories.article_repository import (
+    FavoriteState,
     create_article,
     delete_article,
     favorite_article,
     follow_user,
     get_article_by_slug,
+    get_article_for_update,
+    get_article_ref,
+    get_article_row_by_slug,
+    get_article_rows_page,
     get_articles,
     get_articles_count,
+    get_articles_page,
+    get_favorited_article_ids,
+    is_following,
+    rebuild_search_index,
+    search_articles,
     unfavorite_article,
     unfollow_user,
     update_article,
@@ -17,38 +27,79 @@ from repositories.article_repository import (
 from repositories.comment_repository import (
     create_comment,
     delete_comment,
+    get_article_comment_rows,
     get_article_comments,
     get_comment_by_id,
+    has_comments_from_others,
+)
+from repositories.counter_repository import recompute_counters
+from repositories.feed_repository import get_feed_page, get_feed_rows_page
+from repositories.tag_repository import (
+    get_tag_cloud,
+    get_tag_names_by_article,
+    get_tag_usage_for_article,
+    invalidate_tag_cache,
 )
 from repositories.user_repository import (
     create_user,
     delete_user,
     get_user_by_email,
+    get_user_by_id,
     get_user_by_username,
+    get_user_snapshot,
     update_user,
 )
+from repositories.write_queue import run_write, start_write_batcher, stop_write_batcher
 
 __all__ = [
     # User repository
     "get_user_by_username",
     "get_user_by_email",
+    "get_user_by_id",
+    "get_user_snapshot",
     "create_user",
     "update_user",
     "delete_user",
     # Article repository
     "get_article_by_slug",
+    "get_article_row_by_slug",
+    "get_article_ref",
+    "get_article_for_update",
     "get_articles",
     "get_articles_count",
+    "get_articles_page",
+    "get_article_rows_page",
+    "get_favorited_article_ids",
+    "search_articles",
+    "rebuild_search_index",
     "create_article",
     "update_article",
     "delete_article",
+    "FavoriteState",
     "favorite_article",
     "unfavorite_article",
     "follow_user",
+    "is_following",
     "unfollow_user",
     # Comment repository
     "get_article_comments",
+    "get_article_comment_rows",
     "get_comment_by_id",
     "create_comment",
     "delete_comment",
+    "has_comments_from_others",
+    # Counter repository
+    "recompute_counters",
+    # Feed repository
+    "get_feed_page",
+    "get_feed_rows_page",
+    # Tag repository
+    "get_tag_cloud",
+    "get_tag_names_by_article",
+    "get_tag_usage_for_article",
+    "invalidate_tag_cache",
+    # Write queue
+    "run_write",
+    "start_write_batcher",
+    "stop_write_batcher",
 ]
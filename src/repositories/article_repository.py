@@ -1,14 +1,71 @@
+import re
+import time
+from dataclasses import dataclass
 from datetime import datetime
-from typing import List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Sequence, Set, Tuple
 from uuid import uuid4
 
-from sqlalchemy import desc, func, select
+from sqlalchemy import (
+    Row,
+    delete,
+    desc,
+    exists,
+    func,
+    insert,
+    literal,
+    literal_column,
+    select,
+    text,
+    tuple_,
+    update,
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import joinedload
+from sqlalchemy.orm import joinedload, selectinload
 
 from core.exceptions import ArticleNotFoundException
-from models.article_sql import ArticleModel, ArticleTag, CommentModel
-from models.user_sql import UserModel
+from models.article_sql import (
+    ArticleModel,
+    ArticleTag,
+    CommentModel,
+    article_favorites,
+    article_tags,
+    articles_fts,
+)
+from models.user_sql import UserModel, user_follows
+from repositories.feed_repository import (
+    backfill_followers_timelines,
+    backfill_timeline,
+    fan_out_article,
+    prune_timeline,
+    remove_article_from_timelines,
+)
+from repositories.projections import article_row_select
+from repositories.tag_repository import (
+    get_tag_cloud,
+    get_tag_names_by_article,
+    invalidate_tag_cache,
+)
+from repositories.write_queue import run_write
+from settings import settings
+from utils.pagination import decode_cursor
+
+
+@dataclass(frozen=True)
+class FavoriteState:
+    """État d'un article pour un utilisateur après (dé)mise en favori."""
+
+    article_id: int
+    favorited: bool
+    favorites_count: int
+
+
+# Cache en mémoire du nombre d'articles pour les listes non filtrées ou filtrées
+# par tag seulement : clé -> (total, expiration). Vidé à chaque écriture d'article.
+_articles_count_cache: Dict[Tuple[str, Optional[str]], Tuple[int, float]] = {}
+# Incrémenté à chaque invalidation : un total lu avant n'est pas mis en cache
+_articles_count_generation = 0
 
 
 def generate_slug(title: str) -> str:
@@ -19,17 +76,97 @@ def generate_slug(title: str) -> str:
 
 
 async def get_article_by_slug(session: AsyncSession, slug: str) -> ArticleModel:
-    """Récupère un article par son slug."""
+    """Récupère un article par son slug, avec son auteur et ses tags.
+
+    Les commentaires ne sont pas chargés : ils sont servis page par page par
+    l'endpoint des commentaires.
+    """
     query = (
         select(ArticleModel)
         .options(
             joinedload(ArticleModel.author),
-            joinedload(ArticleModel.comments).joinedload(CommentModel.author),
-            joinedload(ArticleModel.tags),
+            selectinload(ArticleModel.tags),
+        )
+        .where(ArticleModel.slug == slug)
+    )
+    result = await session.execute(query)
+    article = result.scalar_one_or_none()
+
+    if article is None:
+        raise ArticleNotFoundException()
+
+    return article
+
+
+async def get_article_row_by_slug(
+    session: AsyncSession, slug: str
+) -> Tuple[Row, List[str]]:
+    """Charge la vue détail d'un article : une ligne à plat (article et auteur)
+    et ses noms de tags, sans instancier d'objets ORM.
+    """
+    query = article_row_select().where(ArticleModel.slug == slug)
+    result = await session.execute(query)
+    row = result.one_or_none()
+
+    if row is None:
+        raise ArticleNotFoundException()
+
+    tags_by_article = await get_tag_names_by_article(session, [row.id])
+    return row, tags_by_article[row.id]
+
+
+async def get_article_version(session: AsyncSession, slug: str) -> Row:
+    """Charge ce qui versionne la vue détail d'un article, sans son corps ni ses tags :
+    id, author_id, updated_at, favorites_count et author_updated_at.
+
+    Sert à calculer l'ETag avant de charger l'article complet. Les écritures
+    de compteurs (favoris, commentaires, abonnements) conservent updated_at :
+    seules une modification de l'article ou du profil de son auteur changent
+    ces deux dates, favorites_count couvrant le compteur affiché.
+    """
+    query = (
+        select(
+            ArticleModel.id,
+            ArticleModel.author_id,
+            ArticleModel.updated_at,
+            ArticleModel.favorites_count,
+            UserModel.updated_at.label("author_updated_at"),
         )
+        .join(UserModel, UserModel.id == ArticleModel.author_id)
         .where(ArticleModel.slug == slug)
     )
     result = await session.execute(query)
+    version = result.one_or_none()
+
+    if version is None:
+        raise ArticleNotFoundException()
+
+    return version
+
+
+async def get_article_ref(session: AsyncSession, slug: str) -> Row:
+    """Charge le minimum nécessaire aux mutations : id, author_id, created_at
+    et la longueur du corps (sans le charger).
+    """
+    query = select(
+        ArticleModel.id,
+        ArticleModel.author_id,
+        ArticleModel.created_at,
+        func.length(ArticleModel.body).label("body_length"),
+    ).where(ArticleModel.slug == slug)
+    result = await session.execute(query)
+    ref = result.one_or_none()
+
+    if ref is None:
+        raise ArticleNotFoundException()
+
+    return ref
+
+
+async def get_article_for_update(session: AsyncSession, slug: str) -> ArticleModel:
+    """Charge un article sans ses relations, pour une mise à jour."""
+    query = select(ArticleModel).where(ArticleModel.slug == slug)
+    result = await session.execute(query)
     article = result.scalar_one_or_none()
 
     if article is None:
@@ -43,35 +180,66 @@ async def get_articles(
     author: Optional[str] = None,
     favorited: Optional[str] = None,
     tag: Optional[str] = None,
+    followed_by: Optional[int] = None,
     limit: int = 20,
     offset: int = 0,
+    cursor: Optional[str] = None,
 ) -> List[ArticleModel]:
-    """Récupère les articles avec filtres optionnels."""
-    query = select(ArticleModel).options(
-        joinedload(ArticleModel.author),
-        joinedload(ArticleModel.tags),
-    )
+    """Récupère les articles avec filtres optionnels.
 
-    # Appliquer les filtres
-    if author:
-        query = query.join(UserModel).where(UserModel.username == author)
-
-    if favorited:
-        query = query.join(UserModel, ArticleModel.favorited_by).where(
-            UserModel.username == favorited
-        )
+    Si un curseur est fourni, la pagination se fait par clé (created_at, id) et
+    l'offset est ignoré : le coût d'une page ne dépend plus de sa profondeur.
+    """
+    query = _build_articles_query(
+        _article_entities(), author, favorited, tag, followed_by, limit, offset, cursor
+    )
+    result = await session.execute(query)
+    return list(result.scalars().all())
 
-    if tag:
-        query = query.join(ArticleTag, ArticleModel.tags).where(ArticleTag.name == tag)
 
-    # Trier par date de création décroissante
-    query = query.order_by(desc(ArticleModel.created_at))
+async def get_articles_page(
+    session: AsyncSession,
+    author: Optional[str] = None,
+    favorited: Optional[str] = None,
+    tag: Optional[str] = None,
+    followed_by: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ArticleModel], int]:
+    """Récupère une page d'articles et le total filtré en un seul aller-retour."""
+    query = _build_articles_query(
+        _article_entities(), author, favorited, tag, followed_by, limit, offset, cursor
+    )
+    rows, total = await _fetch_articles_page(
+        session, query, author, favorited, tag, followed_by, offset, cursor
+    )
+    return [row[0] for row in rows], total
 
-    # Pagination
-    query = query.limit(limit).offset(offset)
 
-    result = await session.execute(query)
-    return list(result.scalars().all())
+async def get_article_rows_page(
+    session: AsyncSession,
+    author: Optional[str] = None,
+    favorited: Optional[str] = None,
+    tag: Optional[str] = None,
+    followed_by: Optional[int] = None,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Row], Dict[int, List[str]], int]:
+    """Variante de get_articles_page retournant des lignes à plat, sans objets ORM.
+
+    Utilisée par le chemin de sérialisation rapide des listes : les lignes
+    (voir article_row_select) sont accompagnées des noms de tags par article.
+    """
+    query = _build_articles_query(
+        article_row_select(), author, favorited, tag, followed_by, limit, offset, cursor
+    )
+    rows, total = await _fetch_articles_page(
+        session, query, author, favorited, tag, followed_by, offset, cursor
+    )
+    tags_by_article = await get_tag_names_by_article(session, [row.id for row in rows])
+    return rows, tags_by_article, total
 
 
 async def get_articles_count(
@@ -79,13 +247,120 @@ async def get_articles_count(
     author: Optional[str] = None,
     favorited: Optional[str] = None,
     tag: Optional[str] = None,
+    followed_by: Optional[int] = None,
 ) -> int:
     """Compte le nombre d'articles avec les mêmes filtres."""
     query = select(func.count()).select_from(ArticleModel)
+    query = _apply_article_filters(query, author, favorited, tag, followed_by)
+
+    result = await session.execute(query)
+    return result.scalar_one()
+
+
+async def get_favorited_article_ids(
+    session: AsyncSession, user_id: int, article_ids: Sequence[int]
+) -> Set[int]:
+    """Retourne, parmi `article_ids`, ceux que l'utilisateur a mis en favori."""
+    if not article_ids:
+        return set()
+    query = select(article_favorites.c.article_id).where(
+        article_favorites.c.user_id == user_id,
+        article_favorites.c.article_id.in_(article_ids),
+    )
+    result = await session.execute(query)
+    return set(result.scalars().all())
+
+
+async def search_articles(
+    session: AsyncSession,
+    query_text: str,
+    author: Optional[str] = None,
+    favorited: Optional[str] = None,
+    tag: Optional[str] = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> Tuple[List[Tuple[ArticleModel, str]], int]:
+    """Recherche plein texte dans les titres, descriptions et corps d'articles.
+
+    Les résultats sont classés par pertinence (bm25, le titre pesant davantage)
+    et accompagnés d'un extrait ; le total est retourné dans la même requête.
+    """
+    match = build_match_expression(query_text)
+    if match is None:
+        return [], 0
+
+    fts = literal_column("articles_fts")
+    rank = func.bm25(fts, 10.0, 5.0, 1.0)
+    snippet = func.snippet(fts, -1, "<b>", "</b>", "…", 16)
+
+    count_query = _apply_article_filters(
+        select(func.count())
+        .select_from(articles_fts)
+        .join(ArticleModel, ArticleModel.id == articles_fts.c.rowid)
+        .where(articles_fts.c.articles_fts.match(match)),
+        author,
+        favorited,
+        tag,
+    )
+    query = (
+        select(ArticleModel, snippet, count_query.correlate(None).scalar_subquery())
+        .select_from(articles_fts)
+        .join(ArticleModel, ArticleModel.id == articles_fts.c.rowid)
+        .options(
+            joinedload(ArticleModel.author),
+            selectinload(ArticleModel.tags),
+        )
+        .where(articles_fts.c.articles_fts.match(match))
+    )
+    query = _apply_article_filters(query, author, favorited, tag)
+    query = query.order_by(rank).limit(limit).offset(offset)
+
+    result = await session.execute(query)
+    rows = result.all()
+    if rows:
+        total = rows[0][2]
+    elif offset:
+        total = (await session.execute(count_query)).scalar_one()
+    else:
+        total = 0
+
+    return [(row[0], row[1]) for row in rows], total
+
+
+def build_match_expression(query_text: str) -> Optional[str]:
+    """Convertit une saisie libre en expression MATCH FTS5 sûre.
+
+    Chaque mot est cité (la syntaxe FTS5 de l'utilisateur n'est pas interprétée),
+    les mots sont combinés en ET et le dernier est recherché par préfixe.
+    """
+    words = re.findall(r"\w+", query_text)
+    if not words:
+        return None
+    terms = [f'"{word}"' for word in words]
+    terms[-1] += "*"
+    return " ".join(terms)
+
+
+async def rebuild_search_index(session: AsyncSession) -> None:
+    """Reconstruit l'index plein texte à partir de la table articles."""
+    await session.execute(
+        text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')")
+    )
+    await session.commit()
+
 
-    # Appliquer les filtres
+def _apply_article_filters(
+    query,
+    author: Optional[str] = None,
+    favorited: Optional[str] = None,
+    tag: Optional[str] = None,
+    followed_by: Optional[int] = None,
+):
+    """Applique les filtres communs aux requêtes de liste d'articles."""
     if author:
-        query = query.join(UserModel).where(UserModel.username == author)
+        query = query.join(UserModel, ArticleModel.author).where(
+            UserModel.username == author
+        )
 
     if favorited:
         query = query.join(UserModel, ArticleModel.favorited_by).where(
@@ -95,8 +370,165 @@ async def get_articles_count(
     if tag:
         query = query.join(ArticleTag, ArticleModel.tags).where(ArticleTag.name == tag)
 
+    if followed_by is not None:
+        query = query.join(
+            user_follows, user_follows.c.followed_id == ArticleModel.author_id
+        ).where(user_follows.c.follower_id == followed_by)
+
+    return query
+
+
+def _article_entities():
+    """Sélection des articles ORM avec leur auteur et leurs tags."""
+    return select(ArticleModel).options(
+        joinedload(ArticleModel.author),
+        selectinload(ArticleModel.tags),
+    )
+
+
+async def _fetch_articles_page(
+    session: AsyncSession,
+    query,
+    author: Optional[str],
+    favorited: Optional[str],
+    tag: Optional[str],
+    followed_by: Optional[int],
+    offset: int,
+    cursor: Optional[str],
+) -> Tuple[List[Row], int]:
+    """Exécute une requête de page et retourne ses lignes et le total filtré.
+
+    Le total est calculé par une sous-requête scalaire non corrélée partageant
+    les mêmes filtres, évaluée une seule fois par SQLite. Si le cache de comptage
+    est activé, les listes non filtrées ou filtrées par tag réutilisent le total
+    en cache et n'exécutent que la requête de page.
+    """
+    cache_key = _count_cache_key(author, favorited, tag, followed_by)
+    cached_count = _get_cached_count(cache_key)
+    generation = _articles_count_generation
+
+    if cached_count is not None:
+        result = await session.execute(query)
+        return list(result.all()), cached_count
+
+    count_query = _apply_article_filters(
+        select(func.count()).select_from(ArticleModel),
+        author,
+        favorited,
+        tag,
+        followed_by,
+    )
+    query = query.add_columns(count_query.correlate(None).scalar_subquery())
     result = await session.execute(query)
-    return result.scalar_one()
+    rows = list(result.all())
+
+    if rows:
+        total = rows[0][-1]
+    elif offset or cursor:
+        # Page vide au-delà de la fin : le total n'est pas porté par les lignes
+        total = await get_articles_count(session, author, favorited, tag, followed_by)
+    else:
+        total = 0
+
+    _set_cached_count(cache_key, total, generation)
+    return rows, total
+
+
+def _build_articles_query(
+    query,
+    author: Optional[str],
+    favorited: Optional[str],
+    tag: Optional[str],
+    followed_by: Optional[int],
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+):
+    """Construit la requête paginée de liste d'articles à partir d'une sélection."""
+    query = _apply_article_filters(query, author, favorited, tag, followed_by)
+
+    # Trier par date de création décroissante (id pour départager les égalités)
+    query = query.order_by(desc(ArticleModel.created_at), desc(ArticleModel.id))
+
+    # Pagination
+    if cursor is not None:
+        created_at, article_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(ArticleModel.created_at, ArticleModel.id)
+            < tuple_(created_at, article_id)
+        )
+        return query.limit(limit)
+
+    return query.limit(limit).offset(offset)
+
+
+def _count_cache_key(
+    author: Optional[str],
+    favorited: Optional[str],
+    tag: Optional[str],
+    followed_by: Optional[int],
+) -> Optional[Tuple[str, Optional[str]]]:
+    """Retourne la clé de cache du total, ou None si la liste n'est pas cachable."""
+    if not settings.ARTICLES_COUNT_CACHE_ENABLED:
+        return None
+    if author or favorited or followed_by is not None:
+        return None
+    return ("tag", tag) if tag else ("all", None)
+
+
+def _get_cached_count(key: Optional[Tuple[str, Optional[str]]]) -> Optional[int]:
+    if key is None:
+        return None
+    entry = _articles_count_cache.get(key)
+    if entry is None or entry[1] < time.monotonic():
+        return None
+    return entry[0]
+
+
+def _set_cached_count(
+    key: Optional[Tuple[str, Optional[str]]], total: int, generation: int
+) -> None:
+    if key is None or generation != _articles_count_generation:
+        # Une écriture a invalidé le cache pendant la lecture : total périmé
+        return
+    expires_at = time.monotonic() + settings.ARTICLES_COUNT_CACHE_TTL
+    _articles_count_cache[key] = (total, expires_at)
+
+
+def invalidate_articles_count_cache() -> None:
+    """Vide le cache des totaux d'articles (appelé à chaque écriture d'article)."""
+    global _articles_count_generation
+    _articles_count_generation += 1
+    _articles_count_cache.clear()
+
+
+def normalize_tag_names(tag_list: Sequence[str]) -> List[str]:
+    """Normalise les noms de tags (espaces, casse) et retire les doublons."""
+    names: List[str] = []
+    for tag_name in tag_list:
+        name = tag_name.strip().lower()
+        if name and name not in names:
+            names.append(name)
+    return names
+
+
+async def resolve_tags(session: AsyncSession, names: List[str]) -> List[ArticleTag]:
+    """Récupère ou crée les tags en deux requêtes, quel que soit leur nombre.
+
+    L'insertion en masse ignore les noms déjà présents (ON CONFLICT DO NOTHING),
+    ce qui évite la course entre deux écritures créant le même tag.
+    """
+    if not names:
+        return []
+
+    await session.execute(
+        sqlite_insert(ArticleTag)
+        .values([{"name": name} for name in names])
+        .on_conflict_do_nothing(index_elements=[ArticleTag.name])
+    )
+    result = await session.execute(select(ArticleTag).where(ArticleTag.name.in_(names)))
+    tags_by_name = {tag.name: tag for tag in result.scalars().all()}
+    return [tags_by_name[name] for name in names]
 
 
 async def create_article(
@@ -122,22 +554,17 @@ async def create_article(
 
     # Ajouter les tags
     if tag_list:
-        for tag_name in tag_list:
-            # Vérifier si le tag existe déjà
-            tag_query = select(ArticleTag).where(ArticleTag.name == tag_name)
-            tag_result = await session.execute(tag_query)
-            tag = tag_result.scalar_one_or_none()
-
-            if tag is None:
-                # Créer un nouveau tag
-                tag = ArticleTag(name=tag_name)
-                session.add(tag)
-
-            article.tags.append(tag)
+        article.tags = await resolve_tags(session, normalize_tag_names(tag_list))
 
     session.add(article)
+    await session.flush()
+    await fan_out_article(session, article)
     await session.commit()
-    await session.refresh(article)
+    invalidate_articles_count_cache()
+    if tag_list:
+        invalidate_tag_cache()
+    # Charger les relations de la réponse (pas de chargement paresseux en async)
+    await session.refresh(article, attribute_names=["author", "tags"])
 
     return article
 
@@ -163,123 +590,253 @@ async def update_article(
         article.body = body
 
     if tag_list is not None:
-        # Supprimer tous les tags existants
-        article.tags = []
-
-        # Ajouter les nouveaux tags
-        for tag_name in tag_list:
-            # Vérifier si le tag existe déjà
-            tag_query = select(ArticleTag).where(ArticleTag.name == tag_name)
-            tag_result = await session.execute(tag_query)
-            tag = tag_result.scalar_one_or_none()
-
-            if tag is None:
-                # Créer un nouveau tag
-                tag = ArticleTag(name=tag_name)
-                session.add(tag)
-
-            article.tags.append(tag)
+        tags = await resolve_tags(session, normalize_tag_names(tag_list))
+        # Charger les associations actuelles seulement quand elles changent
+        await session.refresh(article, attribute_names=["tags"])
+        # Appliquer seulement la différence avec les associations existantes
+        wanted_ids = {tag.id for tag in tags}
+        current_ids = {tag.id for tag in article.tags}
+        for tag in [t for t in article.tags if t.id not in wanted_ids]:
+            article.tags.remove(tag)
+        for tag in tags:
+            if tag.id not in current_ids:
+                article.tags.append(tag)
+        if wanted_ids != current_ids:
+            # Les tags ne sont pas des colonnes de l'article : sans cela, une
+            # modification des seuls tags ne changerait ni updatedAt ni l'ETag
+            article.updated_at = datetime.utcnow()
 
     await session.commit()
-    await session.refresh(article)
+    if tag_list is not None:
+        invalidate_articles_count_cache()
+        invalidate_tag_cache()
+    await session.refresh(article, attribute_names=["author", "tags"])
 
     return article
 
 
-async def delete_article(session: AsyncSession, article: ArticleModel) -> None:
-    """Supprime un article."""
-    await session.delete(article)
+async def delete_article(session: AsyncSession, article_id: int) -> None:
+    """Supprime un article et ses dépendances par des DELETE directs.
+
+    Évite la cascade ORM, qui chargerait tous les commentaires de l'article
+    pour les supprimer un par un.
+    """
+    await remove_article_from_timelines(session, article_id)
+    await session.execute(
+        delete(CommentModel).where(CommentModel.article_id == article_id)
+    )
+    await session.execute(
+        delete(article_tags).where(article_tags.c.article_id == article_id)
+    )
+    await session.execute(
+        delete(article_favorites).where(article_favorites.c.article_id == article_id)
+    )
+    await session.execute(delete(ArticleModel).where(ArticleModel.id == article_id))
     await session.commit()
+    invalidate_articles_count_cache()
+    invalidate_tag_cache()
 
 
 async def favorite_article(
     session: AsyncSession, article_id: int, user_id: int
-) -> ArticleModel:
-    """Marque un article comme favori pour un utilisateur."""
-    # Récupérer l'article et l'utilisateur
-    article_query = select(ArticleModel).where(ArticleModel.id == article_id)
-    article_result = await session.execute(article_query)
-    article = article_result.scalar_one_or_none()
+) -> Optional[FavoriteState]:
+    """Marque un article comme favori pour un utilisateur.
 
-    user_query = select(UserModel).where(UserModel.id == user_id)
-    user_result = await session.execute(user_query)
-    user = user_result.scalar_one_or_none()
+    Retourne None si l'article n'existe pas.
+    """
+    return await run_write(
+        session, partial(_favorite_article, article_id=article_id, user_id=user_id)
+    )
 
-    if article and user and user not in article.favorited_by:
-        article.favorited_by.append(user)
-        await session.commit()
-        await session.refresh(article)
 
-    return article
+async def _favorite_article(
+    session: AsyncSession, article_id: int, user_id: int
+) -> Optional[FavoriteState]:
+    # Insertion idempotente, sans lire la liste des favoris de l'article ;
+    # l'existence est vérifiée ici pour ne rien insérer plutôt que violer une
+    # clé étrangère.
+    candidate = select(literal(article_id), literal(user_id)).where(
+        exists().where(ArticleModel.id == article_id),
+        exists().where(UserModel.id == user_id),
+    )
+    result = await session.execute(
+        insert(article_favorites)
+        .prefix_with("OR IGNORE")
+        .from_select(["article_id", "user_id"], candidate)
+    )
+    return await _favorite_state(session, article_id, result.rowcount, favorited=True)
 
 
 async def unfavorite_article(
     session: AsyncSession, article_id: int, user_id: int
-) -> ArticleModel:
-    """Retire un article des favoris d'un utilisateur."""
-    # Récupérer l'article et l'utilisateur
-    article_query = select(ArticleModel).where(ArticleModel.id == article_id)
-    article_result = await session.execute(article_query)
-    article = article_result.scalar_one_or_none()
+) -> Optional[FavoriteState]:
+    """Retire un article des favoris d'un utilisateur.
 
-    user_query = select(UserModel).where(UserModel.id == user_id)
-    user_result = await session.execute(user_query)
-    user = user_result.scalar_one_or_none()
+    Retourne None si l'article n'existe pas.
+    """
+    return await run_write(
+        session, partial(_unfavorite_article, article_id=article_id, user_id=user_id)
+    )
 
-    if article and user and user in article.favorited_by:
-        article.favorited_by.remove(user)
-        await session.commit()
-        await session.refresh(article)
 
-    return article
+async def _unfavorite_article(
+    session: AsyncSession, article_id: int, user_id: int
+) -> Optional[FavoriteState]:
+    result = await session.execute(
+        delete(article_favorites).where(
+            article_favorites.c.article_id == article_id,
+            article_favorites.c.user_id == user_id,
+        )
+    )
+    return await _favorite_state(session, article_id, -result.rowcount, favorited=False)
+
+
+async def _favorite_state(
+    session: AsyncSession, article_id: int, delta: int, favorited: bool
+) -> Optional[FavoriteState]:
+    """Applique `delta` au compteur de favoris (dans la même transaction que
+    l'association) et retourne l'état résultant.
+    """
+    if delta:
+        # updated_at est conservé : un favori ne modifie pas l'article
+        query = (
+            update(ArticleModel)
+            .where(ArticleModel.id == article_id)
+            .values(
+                favorites_count=ArticleModel.favorites_count + delta,
+                updated_at=ArticleModel.updated_at,
+            )
+            .returning(ArticleModel.favorites_count)
+        )
+    else:
+        query = select(ArticleModel.favorites_count).where(
+            ArticleModel.id == article_id
+        )
+
+    result = await session.execute(query)
+    favorites_count = result.scalar_one_or_none()
+    if favorites_count is None:
+        return None
+    return FavoriteState(
+        article_id=article_id, favorited=favorited, favorites_count=favorites_count
+    )
 
 
 async def follow_user(
     session: AsyncSession, user_id: int, user_to_follow_id: int
-) -> UserModel:
-    """Fait suivre un utilisateur par un autre."""
-    # Récupérer les utilisateurs
-    user_query = select(UserModel).where(UserModel.id == user_id)
-    user_result = await session.execute(user_query)
-    user = user_result.scalar_one_or_none()
+) -> bool:
+    """Fait suivre un utilisateur par un autre.
+
+    Idempotent : retourne True si la relation vient d'être créée.
+    """
+    return await run_write(
+        session,
+        partial(_follow_user, user_id=user_id, user_to_follow_id=user_to_follow_id),
+    )
 
-    user_to_follow_query = select(UserModel).where(UserModel.id == user_to_follow_id)
-    user_to_follow_result = await session.execute(user_to_follow_query)
-    user_to_follow = user_to_follow_result.scalar_one_or_none()
 
-    if user and user_to_follow and user_to_follow not in user.following:
-        user.following.append(user_to_follow)
-        await session.commit()
-        await session.refresh(user)
+async def _follow_user(
+    session: AsyncSession, user_id: int, user_to_follow_id: int
+) -> bool:
+    # Insertion idempotente, sans charger la liste des abonnements ; l'existence
+    # est vérifiée ici pour ne rien insérer plutôt que violer une clé étrangère.
+    candidate = select(literal(user_id), literal(user_to_follow_id)).where(
+        exists().where(UserModel.id == user_id),
+        exists().where(UserModel.id == user_to_follow_id),
+    )
+    result = await session.execute(
+        insert(user_follows)
+        .prefix_with("OR IGNORE")
+        .from_select(["follower_id", "followed_id"], candidate)
+    )
+    if not result.rowcount:
+        return False
 
-    return user
+    await _update_follow_counters(session, user_id, user_to_follow_id, 1)
+    await backfill_timeline(session, user_id, user_to_follow_id)
+    return True
 
 
 async def unfollow_user(
     session: AsyncSession, user_id: int, user_to_unfollow_id: int
-) -> UserModel:
-    """Fait ne plus suivre un utilisateur."""
-    # Récupérer les utilisateurs
-    user_query = select(UserModel).where(UserModel.id == user_id)
-    user_result = await session.execute(user_query)
-    user = user_result.scalar_one_or_none()
+) -> bool:
+    """Fait ne plus suivre un utilisateur.
+
+    Idempotent : retourne True si la relation vient d'être supprimée.
+    """
+    return await run_write(
+        session,
+        partial(
+            _unfollow_user, user_id=user_id, user_to_unfollow_id=user_to_unfollow_id
+        ),
+    )
 
-    user_to_unfollow_query = select(UserModel).where(
-        UserModel.id == user_to_unfollow_id
+
+async def _unfollow_user(
+    session: AsyncSession, user_id: int, user_to_unfollow_id: int
+) -> bool:
+    result = await session.execute(
+        delete(user_follows).where(
+            user_follows.c.follower_id == user_id,
+            user_follows.c.followed_id == user_to_unfollow_id,
+        )
     )
-    user_to_unfollow_result = await session.execute(user_to_unfollow_query)
-    user_to_unfollow = user_to_unfollow_result.scalar_one_or_none()
+    if not result.rowcount:
+        return False
 
-    if user and user_to_unfollow and user_to_unfollow in user.following:
-        user.following.remove(user_to_unfollow)
-        await session.commit()
-        await session.refresh(user)
+    followers_count = await _update_follow_counters(
+        session, user_id, user_to_unfollow_id, -1
+    )
+    await prune_timeline(session, user_id, user_to_unfollow_id)
+    if followers_count == settings.FEED_FANOUT_MAX_FOLLOWERS:
+        # L'auteur repasse sous le seuil : ses articles sont de nouveau poussés
+        await backfill_followers_timelines(session, user_to_unfollow_id)
+    return True
+
+
+async def is_following(
+    session: AsyncSession, follower_id: int, followed_id: int
+) -> bool:
+    """Indique si `follower_id` suit `followed_id`."""
+    query = select(
+        exists().where(
+            user_follows.c.follower_id == follower_id,
+            user_follows.c.followed_id == followed_id,
+        )
+    )
+    result = await session.execute(query)
+    return result.scalar_one()
 
-    return user
+
+async def _update_follow_counters(
+    session: AsyncSession, follower_id: int, followed_id: int, delta: int
+) -> int:
+    """Met à jour following_count du suiveur et followers_count du suivi, et
+    retourne le nouveau followers_count du suivi.
+
+    updated_at est conservé : un abonnement ne modifie aucun des deux profils.
+    """
+    await session.execute(
+        update(UserModel)
+        .where(UserModel.id == follower_id)
+        .values(
+            following_count=UserModel.following_count + delta,
+            updated_at=UserModel.updated_at,
+        )
+    )
+    result = await session.execute(
+        update(UserModel)
+        .where(UserModel.id == followed_id)
+        .values(
+            followers_count=UserModel.followers_count + delta,
+            updated_at=UserModel.updated_at,
+        )
+        .returning(UserModel.followers_count)
+    )
+    return result.scalar_one()
 
 
 async def get_all_tags(session: AsyncSession) -> List[str]:
-    """Récupère tous les tags disponibles."""
-    query = select(ArticleTag.name).distinct()
-    result = await session.execute(query)
-    return [tag[0] for tag in result.all()]
+    """Récupère les tags utilisés, du plus populaire au moins populaire."""
+    names, _, _ = await get_tag_cloud(session)
+    return names
@@ -1,6 +1,7 @@
-from typing import List
+from functools import partial
+from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import Row, exists, select, tuple_, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import joinedload
 
@@ -10,20 +11,54 @@ from core.exceptions import (
     NotCommentAuthorException,
 )
 from models.article_sql import ArticleModel, CommentModel
+from repositories.projections import comment_row_select
+from repositories.write_queue import run_write
+from utils.pagination import decode_cursor
 
 
-async def get_article_comments(session: AsyncSession, article_slug: str) -> List[CommentModel]:
-    """Récupère tous les commentaires d'un article."""
-    query = (
-        select(CommentModel)
-        .join(ArticleModel, CommentModel.article_id == ArticleModel.id)
-        .options(joinedload(CommentModel.author))
-        .where(ArticleModel.slug == article_slug)
-    )
+async def get_article_comments(
+    session: AsyncSession,
+    article_slug: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> List[CommentModel]:
+    """Récupère une page de commentaires d'un article, du plus ancien au plus récent."""
+    query = select(CommentModel).options(joinedload(CommentModel.author))
+    query = _build_comments_query(query, article_slug, limit, cursor)
     result = await session.execute(query)
     return list(result.scalars().all())
 
 
+async def get_article_comment_rows(
+    session: AsyncSession,
+    article_slug: str,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> List[Row]:
+    """Récupère une page de commentaires d'un article sous forme de lignes à plat.
+
+    La pagination se fait par clé (created_at, id) sur l'index
+    (article_id, created_at) : le coût d'une page ne dépend ni de sa profondeur
+    ni du nombre total de commentaires de l'article.
+    """
+    query = _build_comments_query(comment_row_select(), article_slug, limit, cursor)
+    result = await session.execute(query)
+    return list(result.all())
+
+
+async def has_comments_from_others(
+    session: AsyncSession, article_id: int, user_id: int
+) -> bool:
+    """Indique si un article porte des commentaires d'autres que `user_id`."""
+    query = select(
+        exists().where(
+            CommentModel.article_id == article_id, CommentModel.author_id != user_id
+        )
+    )
+    result = await session.execute(query)
+    return result.scalar_one()
+
+
 async def get_comment_by_id(session: AsyncSession, comment_id: int) -> CommentModel:
     """Récupère un commentaire par son ID."""
     query = (
@@ -47,6 +82,17 @@ async def create_comment(
     author_id: int,
 ) -> CommentModel:
     """Crée un nouveau commentaire."""
+    return await run_write(
+        session,
+        partial(
+            _create_comment, article_slug=article_slug, body=body, author_id=author_id
+        ),
+    )
+
+
+async def _create_comment(
+    session: AsyncSession, article_slug: str, body: str, author_id: int
+) -> CommentModel:
     # Récupérer l'article
     article_query = select(ArticleModel).where(ArticleModel.slug == article_slug)
     article_result = await session.execute(article_query)
@@ -63,8 +109,19 @@ async def create_comment(
     )
 
     session.add(comment)
-    await session.commit()
-    await session.refresh(comment)
+    # updated_at est conservé : un commentaire ne modifie pas l'article
+    await session.execute(
+        update(ArticleModel)
+        .where(ArticleModel.id == article.id)
+        .values(
+            comments_count=ArticleModel.comments_count + 1,
+            updated_at=ArticleModel.updated_at,
+        )
+    )
+    await session.flush()
+    await session.refresh(
+        comment, attribute_names=["created_at", "updated_at", "author"]
+    )
 
     return comment
 
@@ -80,4 +137,26 @@ async def delete_comment(session: AsyncSession, comment_id: int, user_id: int) -
 
     # Supprimer le commentaire
     await session.delete(comment)
+    await session.execute(
+        update(ArticleModel)
+        .where(ArticleModel.id == comment.article_id)
+        .values(
+            comments_count=ArticleModel.comments_count - 1,
+            updated_at=ArticleModel.updated_at,
+        )
+    )
     await session.commit()
+
+
+def _build_comments_query(query, article_slug: str, limit: int, cursor: Optional[str]):
+    """Restreint une sélection de commentaires à une page d'un article."""
+    query = query.join(ArticleModel, CommentModel.article_id == ArticleModel.id).where(
+        ArticleModel.slug == article_slug
+    )
+    if cursor is not None:
+        created_at, comment_id = decode_cursor(cursor)
+        query = query.where(
+            tuple_(CommentModel.created_at, CommentModel.id)
+            > tuple_(created_at, comment_id)
+        )
+    return query.order_by(CommentModel.created_at, CommentModel.id).limit(limit)
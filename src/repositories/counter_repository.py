@@ -0,0 +1,54 @@
+from sqlalchemy import func, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.article_sql import ArticleModel, CommentModel, article_favorites
+from models.user_sql import UserModel, user_follows
+
+
+async def recompute_counters(session: AsyncSession) -> None:
+    """Recalcule en masse les compteurs dénormalisés depuis les tables sources."""
+    favorites = (
+        select(func.count())
+        .select_from(article_favorites)
+        .where(article_favorites.c.article_id == ArticleModel.id)
+        .scalar_subquery()
+    )
+    comments = (
+        select(func.count())
+        .select_from(CommentModel)
+        .where(CommentModel.article_id == ArticleModel.id)
+        .scalar_subquery()
+    )
+    followers = (
+        select(func.count())
+        .select_from(user_follows)
+        .where(user_follows.c.followed_id == UserModel.id)
+        .scalar_subquery()
+    )
+    following = (
+        select(func.count())
+        .select_from(user_follows)
+        .where(user_follows.c.follower_id == UserModel.id)
+        .scalar_subquery()
+    )
+
+    # updated_at est conservé : recalculer un compteur ne modifie pas la ligne
+    await session.execute(
+        update(ArticleModel)
+        .values(
+            favorites_count=favorites,
+            comments_count=comments,
+            updated_at=ArticleModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.execute(
+        update(UserModel)
+        .values(
+            followers_count=followers,
+            following_count=following,
+            updated_at=UserModel.updated_at,
+        )
+        .execution_options(synchronize_session=False)
+    )
+    await session.commit()
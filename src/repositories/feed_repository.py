@@ -0,0 +1,257 @@
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import (
+    DateTime,
+    Row,
+    delete,
+    desc,
+    func,
+    insert,
+    literal,
+    select,
+    tuple_,
+    union,
+    union_all,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased, joinedload, selectinload
+
+from models.article_sql import ArticleModel, timeline_entries
+from models.user_sql import UserModel, user_follows
+from repositories.projections import article_row_select
+from repositories.tag_repository import get_tag_names_by_article
+from settings import settings
+from utils.pagination import decode_cursor
+
+
+async def is_fanout_on_read_author(session: AsyncSession, author_id: int) -> bool:
+    """Indique si les articles de l'auteur sont lus à la demande plutôt que poussés.
+
+    Au-delà de FEED_FANOUT_MAX_FOLLOWERS abonnés, pousser chaque article dans
+    toutes les timelines coûte trop cher à l'écriture : le fil les fusionne
+    alors à la lecture.
+    """
+    query = select(UserModel.followers_count).where(UserModel.id == author_id)
+    result = await session.execute(query)
+    followers_count = result.scalar_one_or_none() or 0
+    return followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+async def fan_out_article(session: AsyncSession, article: ArticleModel) -> None:
+    """Pousse un nouvel article dans la timeline de chaque abonné de son auteur.
+
+    Doit être appelé après le flush de l'article, dans la même transaction.
+    """
+    if await is_fanout_on_read_author(session, article.author_id):
+        return
+
+    followers = select(
+        user_follows.c.follower_id,
+        literal(article.id),
+        literal(article.author_id),
+        literal(article.created_at, DateTime),
+    ).where(user_follows.c.followed_id == article.author_id)
+    await session.execute(
+        insert(timeline_entries).from_select(
+            ["user_id", "article_id", "author_id", "created_at"], followers
+        )
+    )
+
+
+async def backfill_timeline(
+    session: AsyncSession, follower_id: int, author_id: int
+) -> None:
+    """Ajoute les articles récents d'un auteur à la timeline d'un nouvel abonné."""
+    if await is_fanout_on_read_author(session, author_id):
+        return
+
+    recent = (
+        select(
+            literal(follower_id),
+            ArticleModel.id,
+            ArticleModel.author_id,
+            ArticleModel.created_at,
+        )
+        .where(ArticleModel.author_id == author_id)
+        .order_by(desc(ArticleModel.created_at), desc(ArticleModel.id))
+        .limit(settings.FEED_BACKFILL_LIMIT)
+    )
+    await session.execute(
+        insert(timeline_entries)
+        .from_select(["user_id", "article_id", "author_id", "created_at"], recent)
+        .prefix_with("OR IGNORE")
+    )
+
+
+async def backfill_followers_timelines(session: AsyncSession, author_id: int) -> None:
+    """Repousse les articles récents d'un auteur dans la timeline de tous ses abonnés.
+
+    À appeler quand l'auteur repasse sous FEED_FANOUT_MAX_FOLLOWERS : ses
+    articles publiés pendant la lecture à la demande, et ceux des abonnés
+    arrivés entre-temps, n'ont jamais été poussés et disparaîtraient du fil.
+    Même borne que backfill_timeline ; les entrées existantes sont conservées.
+    """
+    recent = (
+        select(ArticleModel.id, ArticleModel.author_id, ArticleModel.created_at)
+        .where(ArticleModel.author_id == author_id)
+        .order_by(desc(ArticleModel.created_at), desc(ArticleModel.id))
+        .limit(settings.FEED_BACKFILL_LIMIT)
+        .subquery()
+    )
+    followers = select(
+        user_follows.c.follower_id, recent.c.id, recent.c.author_id, recent.c.created_at
+    ).join(recent, recent.c.author_id == user_follows.c.followed_id)
+    await session.execute(
+        insert(timeline_entries)
+        .from_select(["user_id", "article_id", "author_id", "created_at"], followers)
+        .prefix_with("OR IGNORE")
+    )
+
+
+async def prune_timeline(
+    session: AsyncSession, follower_id: int, author_id: int
+) -> None:
+    """Retire les articles d'un auteur de la timeline d'un ancien abonné."""
+    await session.execute(
+        delete(timeline_entries).where(
+            timeline_entries.c.user_id == follower_id,
+            timeline_entries.c.author_id == author_id,
+        )
+    )
+
+
+async def remove_article_from_timelines(session: AsyncSession, article_id: int) -> None:
+    """Retire un article supprimé de toutes les timelines."""
+    await session.execute(
+        delete(timeline_entries).where(timeline_entries.c.article_id == article_id)
+    )
+
+
+async def get_feed_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[ArticleModel], int]:
+    """Récupère une page du fil d'un utilisateur et son total en un aller-retour.
+
+    Les articles poussés sont lus par parcours de l'index (user_id, created_at)
+    de la timeline ; ceux des auteurs en fan-out à la lecture sont fusionnés
+    depuis la table articles. Chaque branche est bornée à la taille de la page.
+    """
+    entities = select(ArticleModel).options(
+        joinedload(ArticleModel.author),
+        selectinload(ArticleModel.tags),
+    )
+    rows, total = await _fetch_feed_page(
+        session, entities, user_id, limit, offset, cursor
+    )
+    return [row[0] for row in rows], total
+
+
+async def get_feed_rows_page(
+    session: AsyncSession,
+    user_id: int,
+    limit: int = 20,
+    offset: int = 0,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Row], Dict[int, List[str]], int]:
+    """Variante de get_feed_page retournant des lignes à plat, sans objets ORM."""
+    rows, total = await _fetch_feed_page(
+        session, article_row_select(), user_id, limit, offset, cursor
+    )
+    tags_by_article = await get_tag_names_by_article(session, [row.id for row in rows])
+    return rows, tags_by_article, total
+
+
+async def _fetch_feed_page(
+    session: AsyncSession,
+    query,
+    user_id: int,
+    limit: int,
+    offset: int,
+    cursor: Optional[str],
+) -> Tuple[List[Row], int]:
+    """Restreint une sélection d'articles à une page du fil et y ajoute le total."""
+    pulled_authors = _fanout_on_read_authors(user_id)
+    pulled_articles = aliased(ArticleModel)
+    window = limit if cursor is not None else limit + offset
+
+    pushed = select(timeline_entries.c.article_id).where(
+        timeline_entries.c.user_id == user_id
+    )
+    pulled = select(pulled_articles.id.label("article_id")).where(
+        pulled_articles.author_id.in_(pulled_authors)
+    )
+    if cursor is not None:
+        created_at, article_id = decode_cursor(cursor)
+        pushed = pushed.where(
+            tuple_(timeline_entries.c.created_at, timeline_entries.c.article_id)
+            < tuple_(created_at, article_id)
+        )
+        pulled = pulled.where(
+            tuple_(pulled_articles.created_at, pulled_articles.id)
+            < tuple_(created_at, article_id)
+        )
+    pushed = pushed.order_by(
+        desc(timeline_entries.c.created_at), desc(timeline_entries.c.article_id)
+    ).limit(window)
+    pulled = pulled.order_by(
+        desc(pulled_articles.created_at), desc(pulled_articles.id)
+    ).limit(window)
+
+    # SQLite n'accepte ORDER BY/LIMIT par branche que dans des sous-requêtes
+    pushed_sq = pushed.subquery()
+    pulled_sq = pulled.subquery()
+    candidates = union_all(
+        select(pushed_sq.c.article_id), select(pulled_sq.c.article_id)
+    )
+
+    query = (
+        query.add_columns(_feed_count_query(user_id).scalar_subquery())
+        .where(ArticleModel.id.in_(candidates))
+        .order_by(desc(ArticleModel.created_at), desc(ArticleModel.id))
+        .limit(limit)
+    )
+    if cursor is None:
+        query = query.offset(offset)
+
+    result = await session.execute(query)
+    rows = list(result.all())
+
+    if rows:
+        total = rows[0][-1]
+    elif offset or cursor:
+        # Page vide au-delà de la fin : le total n'est pas porté par les lignes
+        total = (await session.execute(_feed_count_query(user_id))).scalar_one()
+    else:
+        total = 0
+
+    return rows, total
+
+
+def _fanout_on_read_authors(user_id: int):
+    """Auteurs suivis par l'utilisateur dont les articles sont lus à la demande."""
+    return (
+        select(user_follows.c.followed_id)
+        .join(UserModel, UserModel.id == user_follows.c.followed_id)
+        .where(
+            user_follows.c.follower_id == user_id,
+            UserModel.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS,
+        )
+    )
+
+
+def _feed_count_query(user_id: int):
+    """Compte les articles distincts du fil (poussés et lus à la demande)."""
+    pulled_articles = aliased(ArticleModel)
+    ids = union(
+        select(timeline_entries.c.article_id).where(
+            timeline_entries.c.user_id == user_id
+        ),
+        select(pulled_articles.id).where(
+            pulled_articles.author_id.in_(_fanout_on_read_authors(user_id))
+        ),
+    ).subquery()
+    return select(func.count()).select_from(ids).correlate(None)
@@ -0,0 +1,44 @@
+from sqlalchemy import Select, select
+from sqlalchemy.orm import aliased
+
+from models.article_sql import ArticleModel, CommentModel
+from models.user_sql import UserModel
+
+# Alias dédié : les filtres de liste joignent déjà UserModel (auteur, favoris)
+article_author = aliased(UserModel, name="article_author")
+comment_author = aliased(UserModel, name="comment_author")
+
+
+def article_row_select() -> Select:
+    """Projection à plat d'un article et de son auteur, sans instancier d'objets ORM.
+
+    Les lignes exposent les attributs id, slug, title, description, body,
+    created_at, updated_at, favorites_count, author_id et author_username/bio/image.
+    """
+    return select(
+        ArticleModel.id,
+        ArticleModel.slug,
+        ArticleModel.title,
+        ArticleModel.description,
+        ArticleModel.body,
+        ArticleModel.created_at,
+        ArticleModel.updated_at,
+        ArticleModel.favorites_count,
+        ArticleModel.author_id,
+        article_author.username.label("author_username"),
+        article_author.bio.label("author_bio"),
+        article_author.image.label("author_image"),
+    ).join(article_author, article_author.id == ArticleModel.author_id)
+
+
+def comment_row_select() -> Select:
+    """Projection à plat d'un commentaire et de son auteur."""
+    return select(
+        CommentModel.id,
+        CommentModel.body,
+        CommentModel.created_at,
+        CommentModel.updated_at,
+        comment_author.username.label("author_username"),
+        comment_author.bio.label("author_bio"),
+        comment_author.image.label("author_image"),
+    ).join(comment_author, comment_author.id == CommentModel.author_id)
@@ -0,0 +1,94 @@
+import hashlib
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from sqlalchemy import desc, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.article_sql import ArticleTag, article_tags
+from settings import settings
+
+# Nuage de tags en mémoire : (noms par popularité, comptes, ETag, expiration).
+# Vidé à chaque écriture d'article touchant aux tags.
+_tag_cloud_cache: Optional[Tuple[List[str], List[int], str, float]] = None
+# Incrémenté à chaque invalidation : un nuage lu avant n'est pas mis en cache
+_tag_cloud_generation = 0
+
+
+async def get_tag_cloud(session: AsyncSession) -> Tuple[List[str], List[int], str]:
+    """Retourne les tags utilisés, triés par popularité, leurs comptes et un ETag.
+
+    Les tags orphelins (sans article) sont exclus. Le résultat est servi depuis
+    le cache tant qu'aucun article n'a été écrit et que le TTL n'est pas expiré.
+    """
+    global _tag_cloud_cache
+    if _tag_cloud_cache is not None and _tag_cloud_cache[3] >= time.monotonic():
+        names, counts, etag, _ = _tag_cloud_cache
+        return names, counts, etag
+
+    generation = _tag_cloud_generation
+    usage = func.count(article_tags.c.article_id).label("usage")
+    query = (
+        select(ArticleTag.name, usage)
+        .join(article_tags, article_tags.c.tag_id == ArticleTag.id)
+        .group_by(ArticleTag.id)
+        .order_by(desc(usage), ArticleTag.name)
+    )
+    result = await session.execute(query)
+    rows = result.all()
+    names = [row[0] for row in rows]
+    counts = [row[1] for row in rows]
+
+    # L'ETag ne dépend que de la réponse servie (liste ordonnée des noms)
+    digest = hashlib.sha1("\n".join(names).encode()).hexdigest()
+    etag = f'W/"{digest}"'
+
+    if generation == _tag_cloud_generation:
+        # Sinon un article a été écrit pendant la lecture : nuage périmé
+        expires_at = time.monotonic() + settings.TAGS_CACHE_TTL
+        _tag_cloud_cache = (names, counts, etag, expires_at)
+    return names, counts, etag
+
+
+def invalidate_tag_cache() -> None:
+    """Vide le nuage de tags en cache (appelé à chaque écriture d'article)."""
+    global _tag_cloud_cache, _tag_cloud_generation
+    _tag_cloud_generation += 1
+    _tag_cloud_cache = None
+
+
+async def get_tag_names_by_article(
+    session: AsyncSession, article_ids: Sequence[int]
+) -> Dict[int, List[str]]:
+    """Retourne les noms de tags de chaque article, en une seule requête."""
+    tags_by_article: Dict[int, List[str]] = {
+        article_id: [] for article_id in article_ids
+    }
+    if not article_ids:
+        return tags_by_article
+    query = (
+        select(article_tags.c.article_id, ArticleTag.name)
+        .join(ArticleTag, ArticleTag.id == article_tags.c.tag_id)
+        .where(article_tags.c.article_id.in_(article_ids))
+        .order_by(article_tags.c.article_id, ArticleTag.id)
+    )
+    result = await session.execute(query)
+    for article_id, name in result.all():
+        tags_by_article[article_id].append(name)
+    return tags_by_article
+
+
+async def get_tag_usage_for_article(
+    session: AsyncSession, article_id: int
+) -> List[int]:
+    """Retourne, pour chaque tag de l'article, le nombre d'articles qui l'utilisent."""
+    usage = article_tags.alias("usage")
+    query = (
+        select(func.count())
+        .select_from(article_tags)
+        .join(usage, usage.c.tag_id == article_tags.c.tag_id)
+        .where(article_tags.c.article_id == article_id)
+        .group_by(article_tags.c.tag_id)
+    )
+    result = await session.execute(query)
+    return list(result.scalars().all())
@@ -0,0 +1,91 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+from models.user_sql import UserModel
+from settings import settings
+
+
+@dataclass(frozen=True)
+class UserSnapshot:
+    """Copie immuable des champs d'un utilisateur authentifié.
+
+    Partagée entre requêtes par le cache : elle n'est attachée à aucune session.
+    Les handlers qui modifient l'utilisateur rechargent le modèle par son id.
+    """
+
+    id: int
+    username: str
+    email: str
+    bio: Optional[str]
+    image: Optional[str]
+
+    @classmethod
+    def from_user(cls, user: UserModel) -> "UserSnapshot":
+        return cls(
+            id=user.id,
+            username=user.username,
+            email=user.email,
+            bio=user.bio,
+            image=user.image,
+        )
+
+
+class UserCache:
+    """Cache LRU à durée de vie bornée des utilisateurs, indexé par nom d'utilisateur.
+
+    Le nom d'utilisateur est le sujet (`sub`) des tokens JWT. Les entrées sont
+    invalidées à chaque modification ou suppression ; le TTL borne l'écart
+    entre plusieurs workers.
+    """
+
+    def __init__(self, maxsize: int, ttl: float) -> None:
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[UserSnapshot, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, username: str) -> Optional[UserSnapshot]:
+        entry = self._entries.get(username)
+        if entry is None or entry[1] < time.monotonic():
+            if entry is not None:
+                del self._entries[username]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(username)
+        self.hits += 1
+        return entry[0]
+
+    def set(self, snapshot: UserSnapshot) -> None:
+        if self.maxsize <= 0:
+            return
+        self._entries[snapshot.username] = (snapshot, time.monotonic() + self.ttl)
+        self._entries.move_to_end(snapshot.username)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, *usernames: str) -> None:
+        for username in usernames:
+            self._entries.pop(username, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, float]:
+        """Compteurs du cache (taille, succès, échecs, évictions, taux de succès)."""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": self.hits / lookups if lookups else 0.0,
+        }
+
+
+user_cache = UserCache(maxsize=settings.USER_CACHE_SIZE, ttl=settings.USER_CACHE_TTL)
@@ -1,10 +1,11 @@
 from typing import List, Optional
 
-from sqlalchemy import select
+from sqlalchemy import inspect, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from core.exceptions import UserNotFoundException
 from models.user_sql import UserModel
+from repositories.user_cache import UserSnapshot, user_cache
 
 
 async def get_user_by_username(session: AsyncSession, username: str, raise_exception: bool = True) -> Optional[UserModel]:
@@ -19,12 +20,37 @@ async def get_user_by_username(session: AsyncSession, username: str, raise_excep
     return user
 
 
+async def get_user_by_id(session: AsyncSession, user_id: int) -> UserModel:
+    """Récupère un utilisateur par son ID."""
+    user = await session.get(UserModel, user_id)
+    if user is None:
+        raise UserNotFoundException()
+    return user
+
+
+async def get_user_snapshot(
+    session: AsyncSession, username: str
+) -> Optional[UserSnapshot]:
+    """Retourne l'utilisateur `username` depuis le cache, ou à défaut depuis la base."""
+    snapshot = user_cache.get(username)
+    if snapshot is not None:
+        return snapshot
+
+    user = await get_user_by_username(session, username, raise_exception=False)
+    if user is None:
+        return None
+    snapshot = UserSnapshot.from_user(user)
+    user_cache.set(snapshot)
+    return snapshot
+
+
 async def get_user_by_email(session: AsyncSession, email: str) -> Optional[UserModel]:
     """Récupère un utilisateur par son email."""
     query = select(UserModel).where(UserModel.email == email)
     result = await session.execute(query)
     return result.scalar_one_or_none()
 
+
 async def create_user(session: AsyncSession, user: UserModel) -> UserModel:
     """Crée un nouvel utilisateur."""
     session.add(user)
@@ -34,8 +60,14 @@ async def create_user(session: AsyncSession, user: UserModel) -> UserModel:
 
 
 async def update_user(session: AsyncSession, user: UserModel) -> UserModel:
-    """Met à jour un utilisateur existant."""
+    """Met à jour un utilisateur existant.
+
+    Invalide le cache pour le nom courant et, s'il a changé, pour l'ancien nom :
+    un token émis pour l'ancien nom ne doit plus résoudre vers cet utilisateur.
+    """
+    previous_usernames = inspect(user).attrs.username.history.deleted
     await session.commit()
+    user_cache.invalidate(user.username, *previous_usernames)
     await session.refresh(user)
     return user
 
@@ -44,3 +76,4 @@ async def delete_user(session: AsyncSession, user: UserModel) -> None:
     """Supprime un utilisateur."""
     await session.delete(user)
     await session.commit()
+    user_cache.invalidate(user.username)
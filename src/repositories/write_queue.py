@@ -0,0 +1,164 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import sessionmaker
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+WriteOperation = Callable[[AsyncSession], Awaitable[T]]
+
+# Regroupeur actif (None : chaque écriture fait son propre commit)
+_write_batcher: Optional["WriteBatcher"] = None
+
+
+class WriteBatcher:
+    """Regroupe de petites écritures dans une même transaction (group commit).
+
+    Les opérations soumises sont mises en file, puis exécutées par lots d'au
+    plus `max_batch_size` opérations ou toutes les `max_delay` secondes, sur
+    une seule session : SQLite ne synchronise le disque qu'une fois par lot.
+    Chaque opération s'exécute dans son propre SAVEPOINT ; une erreur n'annule
+    que l'opération fautive et n'est transmise qu'à son appelant. Le futur de
+    chaque appelant est résolu une fois le lot validé.
+    """
+
+    def __init__(
+        self,
+        session_factory: sessionmaker,
+        max_batch_size: int = 64,
+        max_delay: float = 0.002,
+    ) -> None:
+        self._session_factory = session_factory
+        self._max_batch_size = max_batch_size
+        self._max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    def start(self) -> None:
+        """Démarre la tâche de fond qui exécute les lots."""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Exécute les opérations en attente puis arrête la tâche de fond."""
+        if not self.running:
+            return
+        await self._queue.put(None)
+        await self._worker
+        self._worker = None
+
+    async def submit(self, operation: WriteOperation) -> T:
+        """Met une opération en file et attend la validation de son lot."""
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((operation, future))
+        return await future
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            item = await self._queue.get()
+            if item is None:
+                break
+            batch = [item]
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+            await self._execute_batch(batch)
+
+    async def _execute_batch(
+        self, batch: List[Tuple[WriteOperation, asyncio.Future]]
+    ) -> None:
+        outcomes: List[Tuple[asyncio.Future, Any, bool]] = []
+        try:
+            async with self._session_factory() as session:
+                # BEGIN explicite : sans transaction ouverte, pysqlite validerait
+                # chaque SAVEPOINT externe au moment de sa libération.
+                await session.execute(text("BEGIN IMMEDIATE"))
+                for operation, future in batch:
+                    try:
+                        async with session.begin_nested():
+                            result = await operation(session)
+                    except Exception as exc:
+                        outcomes.append((future, exc, False))
+                    else:
+                        outcomes.append((future, result, True))
+                await session.commit()
+        except Exception as exc:
+            logger.exception(
+                "Échec de la validation d'un lot de %d écritures", len(batch)
+            )
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+            return
+
+        for future, value, succeeded in outcomes:
+            if future.done():
+                continue
+            if succeeded:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+
+
+def get_write_batcher() -> Optional[WriteBatcher]:
+    """Retourne le regroupeur d'écritures actif, s'il y en a un."""
+    return _write_batcher
+
+
+async def start_write_batcher(
+    session_factory: sessionmaker, max_batch_size: int, max_delay: float
+) -> WriteBatcher:
+    """Crée et démarre le regroupeur d'écritures global."""
+    global _write_batcher
+    _write_batcher = WriteBatcher(session_factory, max_batch_size, max_delay)
+    _write_batcher.start()
+    return _write_batcher
+
+
+async def stop_write_batcher() -> None:
+    """Vide puis arrête le regroupeur d'écritures global."""
+    global _write_batcher
+    if _write_batcher is not None:
+        await _write_batcher.stop()
+        _write_batcher = None
+
+
+async def run_write(session: AsyncSession, operation: WriteOperation) -> T:
+    """Exécute une petite écriture et la valide.
+
+    Si le regroupement est actif, l'opération rejoint le prochain lot (sur la
+    session du regroupeur) ; sinon elle s'exécute dans `session`, suivie de
+    son propre commit. L'opération ne doit pas appeler commit elle-même.
+    """
+    batcher = get_write_batcher()
+    if batcher is None or not batcher.running:
+        result = await operation(session)
+        await session.commit()
+        return result
+
+    # Libère la connexion d'écriture tenue par les lectures de la requête :
+    # le lot en a besoin et le pool d'écriture n'en compte qu'une.
+    await session.commit()
+    return await batcher.submit(operation)
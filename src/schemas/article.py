@@ -1,10 +1,9 @@
 from datetime import datetime
-from typing import List, Optional, Sequence
+from typing import Collection, List, Optional, Sequence, Tuple
 
 from pydantic import Field
 
 from models.article_sql import ArticleModel
-from models.user_sql import UserModel
 from schemas.user import Profile
 
 from .base import BaseSchema
@@ -24,17 +23,19 @@ class Article(BaseSchema):
 
     @classmethod
     def from_article_instance(
-        cls, article: ArticleModel, user: Optional[UserModel] = None
+        cls, article: ArticleModel, favorited: bool = False
     ) -> "Article":
-        if user is None:
-            favorited = False
-        else:
-            favorited = user.id in article.favorited_user_ids
-
         return cls(
+            slug=article.slug,
+            title=article.title,
+            description=article.description,
+            body=article.body,
+            tag_list=[tag.name for tag in article.tags],
+            created_at=article.created_at,
+            updated_at=article.updated_at,
             favorited=favorited,
-            favorites_count=len(article.favorited_user_ids),
-            **article.dict()
+            favorites_count=article.favorites_count,
+            author=Profile.from_user_instance(article.author),
         )
 
 
@@ -43,23 +44,59 @@ class SingleArticleResponse(BaseSchema):
 
     @classmethod
     def from_article_instance(
-        cls, article: ArticleModel, user: Optional[UserModel] = None
+        cls, article: ArticleModel, favorited: bool = False
     ) -> "SingleArticleResponse":
-        return cls(article=Article.from_article_instance(article=article, user=user))
+        return cls(
+            article=Article.from_article_instance(article=article, favorited=favorited)
+        )
 
 
 class MultipleArticlesResponse(BaseSchema):
     articles: List[Article]
     articles_count: int = Field(..., alias="articlesCount")
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
 
     @classmethod
     def from_article_instances(
         cls,
         articles: Sequence[ArticleModel],
         total_count: int,
-        user: Optional[UserModel] = None,
+        favorited_ids: Collection[int] = (),
+        next_cursor: Optional[str] = None,
     ) -> "MultipleArticlesResponse":
-        articles = [Article.from_article_instance(a, user) for a in articles]
+        articles = [
+            Article.from_article_instance(a, favorited=a.id in favorited_ids)
+            for a in articles
+        ]
+        return cls(
+            articles=articles, articles_count=total_count, next_cursor=next_cursor
+        )
+
+
+class ArticleSearchResult(Article):
+    snippet: str
+
+
+class ArticleSearchResponse(BaseSchema):
+    articles: List[ArticleSearchResult]
+    articles_count: int = Field(..., alias="articlesCount")
+
+    @classmethod
+    def from_search_results(
+        cls,
+        results: Sequence[Tuple[ArticleModel, str]],
+        total_count: int,
+        favorited_ids: Collection[int] = (),
+    ) -> "ArticleSearchResponse":
+        articles = [
+            ArticleSearchResult(
+                **Article.from_article_instance(
+                    article, favorited=article.id in favorited_ids
+                ).model_dump(),
+                snippet=snippet,
+            )
+            for article, snippet in results
+        ]
         return cls(articles=articles, articles_count=total_count)
 
 
@@ -74,3 +111,4 @@ class UpdateArticle(BaseSchema):
     title: Optional[str] = None
     description: Optional[str] = None
     body: Optional[str] = None
+    tag_list: Optional[List[str]] = Field(None, alias="tagList")
@@ -4,4 +4,4 @@ from pydantic import BaseModel, ConfigDict
 class BaseSchema(BaseModel):
     """Schéma de base avec configuration commune."""
 
-    model_config = ConfigDict(from_attributes=True)
+    model_config = ConfigDict(from_attributes=True, populate_by_name=True)
@@ -1,12 +1,11 @@
 from datetime import datetime
-from typing import List, Optional, Tuple
+from typing import List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import Field
 
 from models.article_sql import CommentModel
-from models.user_sql import UserModel
 from schemas.base import BaseSchema
-from schemas.user import Profile, User
+from schemas.user import Profile
 
 
 class CommentBase(BaseSchema):
@@ -31,24 +30,41 @@ class Comment(CommentBase):
     """Schéma pour un commentaire."""
 
     id: int
-    created_at: datetime
-    updated_at: datetime
-    author: User
+    created_at: datetime = Field(..., alias="createdAt")
+    updated_at: datetime = Field(..., alias="updatedAt")
+    author: Profile
 
-    class Config:
-        from_attributes = True
+    @classmethod
+    def from_comment_instance(cls, comment: CommentModel) -> "Comment":
+        return cls(
+            id=comment.id,
+            body=comment.body,
+            created_at=comment.created_at,
+            updated_at=comment.updated_at,
+            author=Profile.from_user_instance(comment.author),
+        )
 
 
 class SingleCommentResponse(BaseSchema):
     comment: Comment
 
+    @classmethod
+    def from_comment_instance(cls, comment: CommentModel) -> "SingleCommentResponse":
+        return cls(comment=Comment.from_comment_instance(comment))
+
 
 class MultipleCommentsResponse(BaseSchema):
     comments: List[Comment]
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
 
     @classmethod
-    def from_comments_and_authors(cls, data: List[Tuple[CommentModel, UserModel]]):
-        return cls(comments=[{**comment.dict(), "author": author} for comment, author in data])
+    def from_comment_instances(
+        cls, comments: List[CommentModel], next_cursor: Optional[str] = None
+    ) -> "MultipleCommentsResponse":
+        return cls(
+            comments=[Comment.from_comment_instance(c) for c in comments],
+            next_cursor=next_cursor,
+        )
 
 
 class NewComment(BaseSchema):
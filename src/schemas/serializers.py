@@ -0,0 +1,84 @@
+"""Sérialisation rapide des listes à partir de lignes à plat.
+
+Ces fonctions produisent directement les dictionnaires de la réponse (clés en
+camelCase, identiques à celles des schémas pydantic) sans passer par la
+validation `from_attributes` ni par la revalidation du `response_model`.
+"""
+from typing import Collection, Dict, List, Mapping, Optional, Sequence
+
+from sqlalchemy import Row
+
+
+def _author_dict(row: Row, following: bool = False) -> Dict:
+    return {
+        "username": row.author_username,
+        "bio": row.author_bio,
+        "image": row.author_image,
+        "following": following,
+    }
+
+
+def article_row_to_dict(
+    row: Row, tag_list: List[str], favorited: bool = False, following: bool = False
+) -> Dict:
+    """Construit le dictionnaire d'un article (schéma Article) depuis une ligne."""
+    return {
+        "slug": row.slug,
+        "title": row.title,
+        "description": row.description,
+        "body": row.body,
+        "tagList": tag_list,
+        "createdAt": row.created_at,
+        "updatedAt": row.updated_at,
+        "favorited": favorited,
+        "favoritesCount": row.favorites_count,
+        "author": _author_dict(row, following),
+    }
+
+
+def serialize_article_row(
+    row: Row, tag_list: List[str], favorited: bool = False, following: bool = False
+) -> Dict:
+    """Construit le contenu d'une réponse SingleArticleResponse."""
+    return {"article": article_row_to_dict(row, tag_list, favorited, following)}
+
+
+def serialize_article_rows(
+    rows: Sequence[Row],
+    tags_by_article: Mapping[int, List[str]],
+    total_count: int,
+    favorited_ids: Collection[int] = (),
+    next_cursor: Optional[str] = None,
+) -> Dict:
+    """Construit le contenu d'une réponse MultipleArticlesResponse."""
+    return {
+        "articles": [
+            article_row_to_dict(
+                row, tags_by_article.get(row.id, []), favorited=row.id in favorited_ids
+            )
+            for row in rows
+        ],
+        "articlesCount": total_count,
+        "nextCursor": next_cursor,
+    }
+
+
+def comment_row_to_dict(row: Row) -> Dict:
+    """Construit le dictionnaire d'un commentaire (schéma Comment) depuis une ligne."""
+    return {
+        "id": row.id,
+        "createdAt": row.created_at,
+        "updatedAt": row.updated_at,
+        "body": row.body,
+        "author": _author_dict(row),
+    }
+
+
+def serialize_comment_rows(
+    rows: Sequence[Row], next_cursor: Optional[str] = None
+) -> Dict:
+    """Construit le contenu d'une réponse MultipleCommentsResponse."""
+    return {
+        "comments": [comment_row_to_dict(row) for row in rows],
+        "nextCursor": next_cursor,
+    }
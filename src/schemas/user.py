@@ -32,6 +32,7 @@ class UpdateUser(BaseSchema):
     email: Optional[str] = None
     token: Optional[str] = None
     username: Optional[str] = None
+    password: Optional[str] = None
     bio: Optional[str] = None
     image: Optional[str] = None
 
@@ -42,6 +43,14 @@ class Profile(BaseSchema):
     image: Optional[str]
     following: bool = False
 
+    @classmethod
+    def from_user_instance(cls, user, following: bool = False) -> "Profile":
+        # Construction explicite : `UserModel.following` est une relation,
+        # pas un booléen
+        return cls(
+            username=user.username, bio=user.bio, image=user.image, following=following
+        )
+
 
 class ProfileResponse(BaseSchema):
     profile: Profile
@@ -1,3 +1,5 @@
+from typing import Dict, Optional
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings
 
@@ -7,6 +9,100 @@ class Settings(BaseSettings):
 
     # Base de données
     DATABASE_URL: str = "sqlite+aiosqlite:///./realworld.db"
+    # Connexions en lecture seule (l'écriture passe par une connexion unique)
+    DATABASE_READ_POOL_SIZE: int = 4
+    # Attente maximale d'une connexion libre dans le pool (secondes)
+    DATABASE_POOL_TIMEOUT: float = 30.0
+
+    # Pragmas SQLite appliqués à chaque nouvelle connexion
+    SQLITE_JOURNAL_MODE: str = "WAL"
+    SQLITE_SYNCHRONOUS: str = "NORMAL"
+    SQLITE_MMAP_SIZE: int = 268435456  # 256 Mio
+    SQLITE_CACHE_SIZE: int = -65536  # négatif : en Kio, soit 64 Mio par connexion
+    SQLITE_BUSY_TIMEOUT: int = 5000  # millisecondes
+
+    # Regroupement des petites écritures (favoris, abonnements, commentaires) en
+    # une transaction par lot : au plus MAX_SIZE opérations ou MAX_DELAY_MS d'attente.
+    WRITE_BATCH_ENABLED: bool = False
+    WRITE_BATCH_MAX_SIZE: int = 64
+    WRITE_BATCH_MAX_DELAY_MS: float = 2.0
+
+    # Cache du nombre total d'articles (listes non filtrées ou filtrées par tag).
+    # Vidé à chaque écriture ; le TTL borne l'écart entre plusieurs workers.
+    ARTICLES_COUNT_CACHE_ENABLED: bool = False
+    ARTICLES_COUNT_CACHE_TTL: int = 60
+
+    # Cache des utilisateurs authentifiés (par sujet du token) : nombre d'entrées
+    # et durée de vie en secondes, qui borne l'écart entre plusieurs workers.
+    USER_CACHE_SIZE: int = 10000
+    USER_CACHE_TTL: int = 30
+
+    # Durée de vie du nuage de tags en cache (secondes)
+    TAGS_CACHE_TTL: int = 60
+
+    # Fil d'actualité : au-delà de ce nombre d'abonnés, les articles d'un auteur
+    # ne sont plus poussés dans les timelines mais fusionnés à la lecture.
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    # Nombre d'articles récents copiés dans la timeline lors d'un nouvel abonnement
+    # (ou quand un auteur repasse sous le seuil). Le fil et son articlesCount ne
+    # couvrent que ces articles antérieurs à l'abonnement, comme la migration
+    # initiale des timelines.
+    FEED_BACKFILL_LIMIT: int = 200
+
+    # Commentaires : taille de page par défaut et maximale (pagination par curseur)
+    COMMENTS_PAGE_SIZE: int = 20
+    COMMENTS_MAX_PAGE_SIZE: int = 100
+
+    # Hachage bcrypt : threads dédiés et nombre de demandes en attente au-delà
+    # desquelles les connexions/inscriptions sont refusées en 503
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_QUEUE: int = 16
+
+    # Enregistrement d'un échantillon des requêtes reçues (JSONL), rejouable avec
+    # scripts/replay_traffic.py : proportion enregistrée et taille maximale du corps
+    TRAFFIC_CAPTURE_ENABLED: bool = False
+    TRAFFIC_CAPTURE_PATH: str = "traffic.jsonl"
+    TRAFFIC_CAPTURE_SAMPLE_RATE: float = 0.01
+    TRAFFIC_CAPTURE_MAX_BODY: int = 65536
+
+    # Métriques Prometheus exposées sur /metrics (latences par route, requêtes SQL,
+    # attente du pool) et période de mesure du retard de la boucle (secondes)
+    METRICS_ENABLED: bool = True
+    METRICS_LOOP_LAG_INTERVAL: float = 0.5
+
+    # Budget de requêtes SQL par requête HTTP (développement) : journalise les
+    # dépassements de MAX_QUERIES et les formes de requête répétées au moins
+    # REPEAT_THRESHOLD fois (N+1). Budgets par route : tests/test_query_budgets.py
+    QUERY_BUDGET_ENABLED: bool = False
+    QUERY_BUDGET_MAX_QUERIES: Optional[int] = None
+    QUERY_BUDGET_REPEAT_THRESHOLD: int = 3
+
+    # Journal des requêtes SQL lentes (JSON, avec plan EXPLAIN QUERY PLAN par forme
+    # de requête) ; un seuil de 0 journalise toutes les requêtes. Rapport des
+    # formes les plus coûteuses : /health/slow-queries, scripts/slow_query_report.py
+    SLOW_QUERY_LOG_ENABLED: bool = True
+    SLOW_QUERY_THRESHOLD_MS: float = 100.0
+    SLOW_QUERY_EXPLAIN: bool = True
+    SLOW_QUERY_MAX_STATEMENTS: int = 1000
+
+    # Compression des réponses (gzip ; brotli et zstd si installés, extra "perf") :
+    # taille minimale par défaut et par route (None : jamais compressée), niveaux,
+    # entrées du cache des réponses compressées portant un ETag, et taille au-delà
+    # de laquelle un corps est compressé et envoyé par tranches. La compression
+    # s'exécute sur la boucle d'événements : niveaux rapides par défaut (gzip 1
+    # compresse une page de 100 articles 4,4x en 2 ms, gzip 6 4,5x en 16 ms)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_ROUTES: Dict[str, Optional[int]] = {
+        "/articles": 512,
+        "/articles/feed": 512,
+        "/articles/search": 512,
+    }
+    COMPRESSION_GZIP_LEVEL: int = 1
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_CACHE_SIZE: int = 256
+    COMPRESSION_STREAM_THRESHOLD: int = 1048576  # 1 Mio
 
     # JWT
     SECRET_KEY: SecretStr = SecretStr("your-secret-key")
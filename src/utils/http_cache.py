@@ -0,0 +1,48 @@
+import hashlib
+from typing import Optional
+
+from fastapi import Request, Response, status
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Indique si l'en-tête If-None-Match correspond à l'ETag (comparaison faible)."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    expected = etag.removeprefix("W/")
+    candidates = (value.strip().removeprefix("W/") for value in header.split(","))
+    return expected in candidates
+
+
+def weak_etag(*parts) -> str:
+    """ETag faible dérivé des éléments qui versionnent une représentation."""
+    digest = hashlib.sha1("\x1f".join(str(part) for part in parts).encode()).hexdigest()
+    return f'W/"{digest}"'
+
+
+def not_modified(etag: str, vary: Optional[str] = None) -> Response:
+    """Réponse 304, avec les en-têtes de validation de la réponse complète."""
+    headers = {"ETag": etag}
+    if vary:
+        headers["Vary"] = vary
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+
+def conditional_response(
+    request: Request, response: Response, vary: Optional[str] = None
+) -> Response:
+    """Valide une réponse déjà rendue par l'empreinte de son corps.
+
+    Pour les pages dont la version coûterait autant que le contenu (listes,
+    commentaires) : la requête SQL est faite, mais un client à jour reçoit un
+    304 sans corps.
+    """
+    etag = f'W/"{hashlib.sha1(response.body).hexdigest()}"'
+    if etag_matches(request, etag):
+        return not_modified(etag, vary)
+    response.headers["ETag"] = etag
+    if vary:
+        response.headers["Vary"] = vary
+    return response
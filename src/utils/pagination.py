@@ -0,0 +1,36 @@
+import base64
+from datetime import datetime
+from typing import Optional, Sequence, Tuple
+
+from core.exceptions import InvalidCursorException
+
+# Plus grand entier stocké par SQLite : au-delà, la requête échouerait
+MAX_ITEM_ID = 2**63 - 1
+
+
+def encode_cursor(created_at: datetime, item_id: int) -> str:
+    """Encode une position (created_at, id) en curseur opaque."""
+    raw = f"{created_at.isoformat()}|{item_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """Décode un curseur opaque en position (created_at, id)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode()).decode()
+        created_at, item_id = raw.rsplit("|", 1)
+        position = datetime.fromisoformat(created_at), int(item_id)
+    except ValueError:
+        raise InvalidCursorException()
+    if not 0 < position[1] <= MAX_ITEM_ID:
+        raise InvalidCursorException()
+    return position
+
+
+def next_cursor(items: Sequence, limit: int) -> Optional[str]:
+    """Retourne le curseur de la page suivante, ou None si la page est la dernière."""
+    if limit <= 0 or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -1,5 +1,7 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Callable, Optional, TypeVar
 
 from jose import jwt
 from passlib.context import CryptContext
@@ -7,9 +9,12 @@ from pydantic import BaseModel
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
+from core.exceptions import ServiceOverloadedException
 from models.user_sql import UserModel as User
 from settings import settings
 
+T = TypeVar("T")
+
 
 class Token(BaseModel):
     access_token: str
@@ -33,6 +38,49 @@ def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
 
+class PasswordHasher:
+    """Exécute bcrypt dans un pool de threads dédié et borné.
+
+    bcrypt libère le GIL : la boucle d'événements reste libre pendant le
+    hachage. Au-delà de `max_workers + max_queue` demandes en cours, les
+    nouvelles sont refusées immédiatement (503) plutôt que mises en attente.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.pending = 0
+        self.rejected = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="password-hasher"
+        )
+
+    async def hash(self, password: str) -> str:
+        """Hache un mot de passe hors de la boucle d'événements."""
+        return await self._run(get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Vérifie un mot de passe hors de la boucle d'événements."""
+        return await self._run(verify_password, plain_password, hashed_password)
+
+    async def _run(self, func: Callable[..., T], *args) -> T:
+        if self.pending >= self.max_pending:
+            self.rejected += 1
+            raise ServiceOverloadedException()
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.pending -= 1
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
+
+
 async def get_user_instance(
     db: AsyncSession, username: Optional[str] = None, email: Optional[str] = None
 ) -> Optional[User]:
@@ -53,7 +101,9 @@ async def authenticate_user(db: AsyncSession, email: str, password: str) -> Opti
     user = await get_user_instance(db, email=email)
     if user is None:
         return None
-    if not verify_password(password, user.hashed_password):
+    # Rendre la connexion au pool pendant le hachage
+    await db.commit()
+    if not await password_hasher.verify(password, user.hashed_password):
         return None
     return user
 
@@ -0,0 +1,176 @@
+"""Fixtures des tests de performance : jeu de données, application, budgets.
+
+Les tests pilotent la vraie application (`api:app`) via le transport ASGI de
+httpx, sur un jeu de données généré une fois par session par
+scripts/generate_dataset.py (`--dataset-scale`), ou copié depuis une base
+peuplée (`--dataset`).
+"""
+import argparse
+import functools
+import os
+import random
+import shutil
+import sys
+import tempfile
+import uuid
+from pathlib import Path
+
+import httpx
+import pytest
+import pytest_asyncio
+
+ROOT = Path(__file__).parent.parent
+
+# Ajouter les répertoires src et scripts (générateur, scénarios) au chemin Python
+sys.path.append(str(ROOT / "src"))
+sys.path.append(str(ROOT / "scripts"))
+
+# Répertoire temporaire de la session : base de l'application
+_workdir = pytest.StashKey[Path]()
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("dataset", "jeu de données des tests de performance")
+    group.addoption(
+        "--dataset", type=Path, help="base peuplée à copier (sinon générée)"
+    )
+    group.addoption(
+        "--dataset-scale", type=float, default=0.01, help="volume du jeu généré"
+    )
+    group.addoption(
+        "--dataset-password", default="password", help="mot de passe des utilisateurs"
+    )
+    group.addoption(
+        "--plans-scale",
+        type=float,
+        default=1.0,
+        help="volume de la base des tests de plans d'exécution",
+    )
+    group.addoption(
+        "--bench-baseline",
+        type=Path,
+        help="résultats JSON de scripts/bench_api.py servant de référence",
+    )
+    group.addoption(
+        "--bench-threshold",
+        type=float,
+        default=0.2,
+        help="dégradation tolérée du p95 et du débit (0.2 = 20 %%)",
+    )
+
+
+def pytest_configure(config):
+    # La base de l'application est choisie à l'import des settings : avant toute
+    # collecte, les modules de test important les repositories
+    workdir = Path(tempfile.mkdtemp(prefix="realworld-tests-"))
+    config.stash[_workdir] = workdir
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir / 'bench.db'}"
+    # Le middleware de budget journaliserait en double les requêtes mesurées
+    os.environ["QUERY_BUDGET_ENABLED"] = "false"
+
+
+def pytest_unconfigure(config):
+    shutil.rmtree(config.stash[_workdir], ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def dataset(pytestconfig) -> Path:
+    """Base de l'application, peuplée une fois pour toute la session."""
+    from bench_api import prepare_database
+
+    args = argparse.Namespace(
+        database=pytestconfig.getoption("dataset"),
+        scale=pytestconfig.getoption("dataset_scale"),
+    )
+    return prepare_database(args, pytestconfig.stash[_workdir])
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def client(dataset):
+    """Client HTTP de l'application démarrée (regroupeur d'écritures, etc.)."""
+    from api import app
+    from database import engine, read_engine
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://test"
+        ) as client:
+            yield client
+    await engine.dispose()
+    await read_engine.dispose()
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def dataset_context(pytestconfig, dataset):
+    """Slugs, utilisateurs, tags et jetons échantillonnés dans le jeu de données."""
+    from bench_api import build_context
+
+    from database import async_read_session
+
+    password = pytestconfig.getoption("dataset_password")
+    return await build_context(async_read_session, random.Random(42), password)
+
+
+@pytest.fixture
+def query_budget():
+    """Fabrique de QueryBudget comptant les requêtes des moteurs de l'application.
+
+    Les dépassements sont journalisés au lieu de lever une exception : le test
+    vérifie `violations()` après coup et peut rapporter toutes les routes.
+    """
+    from core.query_budget import QueryBudget, watch_engine
+    from database import engine, read_engine
+
+    watch_engine(engine)
+    watch_engine(read_engine)
+    return functools.partial(QueryBudget, raise_on_violation=False)
+
+
+@pytest.fixture
+def new_user(client):
+    """Fabrique d'utilisateurs inscrits par l'API, aux noms uniques.
+
+    Retourne le nom d'utilisateur et les en-têtes d'authentification.
+    """
+
+    async def register(prefix: str = "user", password: str = "password"):
+        username = f"{prefix}-{uuid.uuid4().hex[:8]}"
+        response = await client.post(
+            "/users",
+            json={
+                "user": {
+                    "username": username,
+                    "email": f"{username}@example.com",
+                    "password": password,
+                }
+            },
+        )
+        response.raise_for_status()
+        token = response.json()["user"]["token"]
+        return username, {"Authorization": f"Bearer {token}"}
+
+    return register
+
+
+@pytest.fixture
+def new_article(client):
+    """Fabrique d'articles publiés par l'API ; retourne l'article sérialisé."""
+
+    async def publish(headers: dict, tags=(), body: str = "Corps de l'article"):
+        response = await client.post(
+            "/articles",
+            headers=headers,
+            json={
+                "article": {
+                    "title": f"Article {uuid.uuid4().hex[:8]}",
+                    "description": "Description",
+                    "body": body,
+                    "tagList": list(tags),
+                }
+            },
+        )
+        response.raise_for_status()
+        return response.json()["article"]
+
+    return publish
@@ -0,0 +1,75 @@
+"""Non-régression des performances face à un enregistrement de scripts/bench_api.py.
+
+Chaque scénario de la référence (`--bench-baseline`, produite par
+`bench_api.py --output` sur un jeu de même volume) est rejoué avec le même
+nombre de requêtes, d'échauffement et de clients. Le test échoue si un p95
+ou le débit se dégrade de plus de `--bench-threshold`, ou si le nombre de
+requêtes SQL par requête HTTP augmente. Sans référence, il est ignoré.
+"""
+import json
+from typing import List
+
+import pytest
+from bench_api import SCENARIOS, run_scenario
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def compare(results: dict, baseline: dict, threshold: float) -> List[str]:
+    """Liste les régressions par rapport à un enregistrement précédent."""
+    regressions = []
+    for name, current in results["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None:
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name} : débit {previous['throughput_rps']} -> "
+                f"{current['throughput_rps']} req/s"
+            )
+        for label, stats in current["endpoints"].items():
+            before = previous["endpoints"].get(label)
+            if before is None:
+                continue
+            if stats["p95_ms"] > before["p95_ms"] * (1 + threshold):
+                regressions.append(
+                    f"{name} / {label} : p95 {before['p95_ms']} -> {stats['p95_ms']} ms"
+                )
+            # Déterministe : toute requête SQL supplémentaire est une régression
+            if stats["queries_per_request"] > before["queries_per_request"] + 0.5:
+                regressions.append(
+                    f"{name} / {label} : {before['queries_per_request']} -> "
+                    f"{stats['queries_per_request']} requêtes SQL par requête"
+                )
+    return regressions
+
+
+@pytest.fixture(scope="session")
+def bench_baseline(pytestconfig) -> dict:
+    path = pytestconfig.getoption("bench_baseline")
+    if path is None:
+        pytest.skip("pas de référence (--bench-baseline)")
+    return json.loads(path.read_text())
+
+
+@pytest.mark.parametrize("name", list(SCENARIOS))
+async def test_no_regression_against_baseline(
+    pytestconfig, client, dataset_context, bench_baseline, name
+):
+    if name not in bench_baseline["scenarios"]:
+        pytest.skip(f"scénario {name} absent de la référence")
+    meta = bench_baseline["meta"]
+    result = await run_scenario(
+        client,
+        dataset_context,
+        SCENARIOS[name],
+        meta["requests"],
+        meta["concurrency"],
+        meta.get("warmup", 50),
+    )
+
+    threshold = pytestconfig.getoption("bench_threshold")
+    regressions = compare({"scenarios": {name: result}}, bench_baseline, threshold)
+    assert not regressions, f"régressions au-delà de {threshold:.0%} :\n" + "\n".join(
+        regressions
+    )
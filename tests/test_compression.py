@@ -0,0 +1,148 @@
+"""Négociation du codage et comportement de CompressionMiddleware.
+
+Le middleware est monté devant une petite application FastAPI : seuil par
+route (None : jamais compressée), passage en clair sous le seuil avec
+Vary: Accept-Encoding, réponses 304 jamais compressées, et cache des corps
+compressés par ETag.
+"""
+import gzip
+
+import httpx
+import pytest
+from fastapi import FastAPI, Response
+
+from core.compression import CompressionMiddleware, Encoder, negotiate
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+ENCODERS = [Encoder("zstd", 3), Encoder("br", 4), Encoder("gzip", 1)]
+LARGE = b'{"items": "' + b"x" * 4096 + b'"}'
+SMALL = b'{"items": "x"}'
+ETAG = 'W/"v1"'
+
+
+def _json(body: bytes, **headers) -> Response:
+    return Response(body, media_type="application/json", headers=headers)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("gzip;q=0.5, br;q=0.8", "br"),
+        ("br;q=0, zstd;q=0, gzip", "gzip"),
+        ("*", "zstd"),
+        ("*;q=0", None),
+        ("*, zstd;q=0", "br"),
+        ("*;q=0.1, gzip;q=0.5", "gzip"),
+        ("GZIP; q=1", "gzip"),
+        ("gzip;q=abc", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    encoder = negotiate(accept_encoding, ENCODERS)
+
+    assert (encoder.name if encoder else None) == expected
+
+
+@pytest.fixture
+def compressed_app():
+    app = FastAPI()
+
+    @app.get("/large")
+    def large():
+        return _json(LARGE, etag=ETAG)
+
+    @app.get("/small")
+    def small():
+        return _json(SMALL)
+
+    @app.get("/never")
+    def never():
+        return _json(LARGE, vary="Authorization")
+
+    @app.get("/cached")
+    def cached():
+        return Response(
+            status_code=304, media_type="application/json", headers={"ETag": ETAG}
+        )
+
+    return CompressionMiddleware(
+        app,
+        [Encoder("gzip", 1)],
+        min_size=1024,
+        # Seuil nul et type compressible : seul le statut empêche de compresser /cached
+        routes={"/never": None, "/cached": 0},
+    )
+
+
+async def _get(middleware, path: str, accept_encoding: str = "gzip"):
+    """Retourne la réponse et son corps tel qu'émis (non décodé)."""
+    transport = httpx.ASGITransport(app=middleware)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+        async with c.stream(
+            "GET", path, headers={"Accept-Encoding": accept_encoding}
+        ) as response:
+            raw = b"".join([chunk async for chunk in response.aiter_raw()])
+    return response, raw
+
+
+def _vary(response) -> set:
+    return {value.strip() for value in response.headers.get("vary", "").split(",")}
+
+
+async def test_large_response_is_compressed(compressed_app):
+    response, raw = await _get(compressed_app, "/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in _vary(response)
+    assert int(response.headers["content-length"]) == len(raw)
+    assert gzip.decompress(raw) == LARGE
+
+
+async def test_refused_encoding_is_sent_plain_with_vary(compressed_app):
+    response, raw = await _get(compressed_app, "/large", "gzip;q=0")
+
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in _vary(response)
+    assert raw == LARGE
+
+
+async def test_below_threshold_is_sent_plain_with_vary(compressed_app):
+    response, raw = await _get(compressed_app, "/small")
+
+    assert "content-encoding" not in response.headers
+    assert "Accept-Encoding" in _vary(response)
+    assert raw == SMALL
+
+
+async def test_route_opt_out_is_never_compressed(compressed_app):
+    response, raw = await _get(compressed_app, "/never")
+
+    assert "content-encoding" not in response.headers
+    # La représentation ne dépend pas d'Accept-Encoding : Vary reste inchangé
+    assert _vary(response) == {"Authorization"}
+    assert raw == LARGE
+
+
+async def test_not_modified_is_not_compressed(compressed_app):
+    response, raw = await _get(compressed_app, "/cached")
+
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == ETAG
+    assert raw == b""
+
+
+async def test_etag_responses_are_compressed_once(compressed_app):
+    first, first_raw = await _get(compressed_app, "/large")
+    second, second_raw = await _get(compressed_app, "/large")
+
+    assert (compressed_app.cache_misses, compressed_app.cache_hits) == (1, 1)
+    assert second_raw == first_raw
+    assert second.headers["content-length"] == first.headers["content-length"]
+    assert second.headers["etag"] == ETAG
+    assert gzip.decompress(second_raw) == LARGE
@@ -0,0 +1,82 @@
+"""Mise en favori idempotente : compteur dénormalisé et updated_at de l'article.
+
+Favoriser ou retirer deux fois un article ne change le compteur qu'une fois ;
+le compteur reste égal au nombre d'associations, et updated_at (qui versionne
+l'article) n'est jamais modifié par un favori.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+async def _stored_state(slug: str):
+    """(favorites_count, nombre d'associations, updated_at) lus en base."""
+    from database import async_read_session
+    from models.article_sql import ArticleModel, article_favorites
+
+    async with async_read_session() as session:
+        article = (
+            await session.execute(
+                select(
+                    ArticleModel.id,
+                    ArticleModel.favorites_count,
+                    ArticleModel.updated_at,
+                ).where(ArticleModel.slug == slug)
+            )
+        ).one()
+        associations = (
+            await session.execute(
+                select(func.count()).where(article_favorites.c.article_id == article.id)
+            )
+        ).scalar_one()
+    return article.favorites_count, associations, article.updated_at
+
+
+async def _toggle(client, method: str, slug: str, headers: dict) -> dict:
+    response = await client.request(
+        method, f"/articles/{slug}/favorite", headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()["article"]
+
+
+async def test_repeated_favorite_and_unfavorite(client, new_user, new_article):
+    _, author = await new_user("author")
+    _, fan = await new_user("fan")
+    slug = (await new_article(author))["slug"]
+    _, _, updated_at = await _stored_state(slug)
+
+    for _ in range(2):
+        article = await _toggle(client, "POST", slug, fan)
+        assert article["favorited"] is True
+        assert article["favoritesCount"] == 1
+    assert await _stored_state(slug) == (1, 1, updated_at)
+
+    for _ in range(2):
+        article = await _toggle(client, "DELETE", slug, fan)
+        assert article["favorited"] is False
+        assert article["favoritesCount"] == 0
+    assert await _stored_state(slug) == (0, 0, updated_at)
+
+
+async def test_concurrent_favorites_keep_count_exact(client, new_user, new_article):
+    _, author = await new_user("author")
+    fans = [(await new_user("fan"))[1] for _ in range(4)]
+    published = await new_article(author)
+    slug = published["slug"]
+    _, _, updated_at = await _stored_state(slug)
+
+    # Chaque fan favorise deux fois, tous en même temps
+    await asyncio.gather(*(_toggle(client, "POST", slug, fan) for fan in fans + fans))
+    assert await _stored_state(slug) == (4, 4, updated_at)
+
+    await asyncio.gather(
+        *(_toggle(client, "DELETE", slug, fan) for fan in fans[:2] + fans[:2])
+    )
+    assert await _stored_state(slug) == (2, 2, updated_at)
+    article = (await client.get(f"/articles/{slug}")).json()["article"]
+    assert article["favoritesCount"] == 2
+    assert article["updatedAt"] == published["updatedAt"]
@@ -0,0 +1,128 @@
+"""Validation conditionnelle (ETag) de la vue détail d'un article et des profils.
+
+L'ETag d'un article dépend de sa version, de celle du profil de son auteur, du
+nombre de favoris et de l'état propre au lecteur (favori, abonnement) : il
+change avec chacun d'eux, mais pas avec les écritures de compteurs qui
+conservent updated_at (commentaires, abonnements à l'auteur).
+"""
+import pytest
+import pytest_asyncio
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def _vary(response) -> set:
+    return {value.strip() for value in response.headers["Vary"].split(",")}
+
+
+async def _etag(client, path: str, headers: dict = None) -> str:
+    response = await client.get(path, headers=headers)
+    assert response.status_code == 200, response.text
+    assert "Authorization" in _vary(response)
+    return response.headers["ETag"]
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def article(new_user, new_article):
+    """Article d'un auteur dédié : (slug, nom et en-têtes de l'auteur)."""
+    author, headers = await new_user("author")
+    published = await new_article(headers)
+    return published["slug"], author, headers
+
+
+@pytest.mark.parametrize("authenticated", [False, True], ids=["anonyme", "connecté"])
+async def test_if_none_match_returns_304(client, new_user, article, authenticated):
+    slug, author, _ = article
+    headers = (await new_user("reader"))[1] if authenticated else {}
+
+    for path in (f"/articles/{slug}", f"/profiles/{author}"):
+        etag = await _etag(client, path, headers)
+        response = await client.get(path, headers={**headers, "If-None-Match": etag})
+
+        assert response.status_code == 304
+        assert response.content == b""
+        assert response.headers["ETag"] == etag
+        assert "Authorization" in _vary(response)
+
+
+async def test_stale_etag_returns_full_response(client, article):
+    slug, _, _ = article
+
+    response = await client.get(
+        f"/articles/{slug}", headers={"If-None-Match": 'W/"stale"'}
+    )
+
+    assert response.status_code == 200
+    assert response.json()["article"]["slug"] == slug
+
+
+async def test_article_etag_follows_favorites(client, new_user, article):
+    slug, _, _ = article
+    _, fan = await new_user("fan")
+    path = f"/articles/{slug}"
+    anonymous = await _etag(client, path)
+    viewer = await _etag(client, path, fan)
+
+    (await client.post(f"{path}/favorite", headers=fan)).raise_for_status()
+    favorited_anonymous = await _etag(client, path)
+    favorited_viewer = await _etag(client, path, fan)
+    assert favorited_anonymous != anonymous
+    assert favorited_viewer not in (viewer, favorited_anonymous)
+
+    (await client.delete(f"{path}/favorite", headers=fan)).raise_for_status()
+    # Retour à l'état initial : mêmes versions, mêmes ETags
+    assert await _etag(client, path) == anonymous
+    assert await _etag(client, path, fan) == viewer
+
+
+async def test_article_etag_follows_author_profile(client, article):
+    slug, _, author_headers = article
+    path = f"/articles/{slug}"
+    before = await _etag(client, path)
+
+    response = await client.put(
+        "/user", headers=author_headers, json={"user": {"bio": "Nouvelle bio"}}
+    )
+    response.raise_for_status()
+
+    assert await _etag(client, path) != before
+    assert (await client.get(path)).json()["article"]["author"]["bio"] == (
+        "Nouvelle bio"
+    )
+
+
+async def test_article_etag_differs_per_viewer(client, new_user, article):
+    slug, author, _ = article
+    _, follower = await new_user("follower")
+    _, stranger = await new_user("stranger")
+    path = f"/articles/{slug}"
+    (
+        await client.post(f"/profiles/{author}/follow", headers=follower)
+    ).raise_for_status()
+
+    following = await _etag(client, path, follower)
+    not_following = await _etag(client, path, stranger)
+
+    assert following != not_following
+    assert not_following == await _etag(client, path)
+    response = await client.get(path, headers={**stranger, "If-None-Match": following})
+    assert response.status_code == 200
+    assert response.json()["article"]["author"]["following"] is False
+
+
+async def test_counter_writes_keep_article_etag(client, new_user, article):
+    slug, author, _ = article
+    _, other = await new_user("other")
+    path = f"/articles/{slug}"
+    article_etag = await _etag(client, path)
+    profile_etag = await _etag(client, f"/profiles/{author}")
+
+    response = await client.post(
+        f"{path}/comments", headers=other, json={"comment": {"body": "Bravo"}}
+    )
+    response.raise_for_status()
+    (await client.post(f"/profiles/{author}/follow", headers=other)).raise_for_status()
+
+    # Compteurs de commentaires et d'abonnés : updated_at est conservé
+    assert await _etag(client, path) == article_etag
+    assert await _etag(client, f"/profiles/{author}") == profile_etag
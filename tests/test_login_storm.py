@@ -0,0 +1,77 @@
+"""La latence de /health reste stable pendant une rafale de connexions.
+
+La latence de /health est mesurée au repos, puis pendant LOGINS connexions
+concurrentes (bcrypt). Le p99 sous charge doit rester sous MAX_RATIO fois le
+p99 au repos (avec un plancher de FLOOR_MS) : au-delà, le hachage
+s'exécuterait sur la boucle d'événements. Les refus 503 (pool de hachage
+saturé) sont admis.
+"""
+import asyncio
+import time
+
+import httpx
+import pytest
+from bench_api import percentile
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+LOGINS = 40
+SAMPLES = 200
+MAX_RATIO = 5.0
+FLOOR_MS = 20.0
+PASSWORD = "storm-password"
+
+
+async def health_latencies(client: httpx.AsyncClient, count: int, interval: float):
+    """Mesure `count` appels à /health espacés de `interval` secondes (ms).
+
+    La latence est comptée depuis l'instant d'envoi prévu : si la boucle
+    d'événements est bloquée pendant l'attente, le retard est inclus, comme
+    pour un client arrivant à ce moment-là.
+    """
+    samples = []
+    for _ in range(count):
+        scheduled = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        response = await client.get("/health")
+        samples.append((time.perf_counter() - scheduled) * 1000)
+        response.raise_for_status()
+    return samples
+
+
+async def test_health_latency_during_login_storm(client):
+    response = await client.post(
+        "/users",
+        json={
+            "user": {
+                "username": "storm",
+                "email": "storm@example.com",
+                "password": PASSWORD,
+            }
+        },
+    )
+    response.raise_for_status()
+
+    async def login():
+        return await client.post(
+            "/users/login",
+            json={"user_input": {"email": "storm@example.com", "password": PASSWORD}},
+        )
+
+    # Connexion d'échauffement : imports et caches du premier appel hors mesure
+    (await login()).raise_for_status()
+    idle = await health_latencies(client, SAMPLES, 0.002)
+
+    storm = asyncio.gather(*(login() for _ in range(LOGINS)))
+    loaded = await health_latencies(client, SAMPLES, 0.002)
+    responses = await storm
+
+    statuses = [response.status_code for response in responses]
+    assert set(statuses) <= {200, 503}, f"statuts inattendus : {sorted(set(statuses))}"
+    idle_p99 = percentile(sorted(idle), 0.99)
+    loaded_p99 = percentile(sorted(loaded), 0.99)
+    limit = max(idle_p99 * MAX_RATIO, FLOOR_MS)
+    assert loaded_p99 <= limit, (
+        f"p99 de /health sous charge {loaded_p99:.2f} ms, au repos {idle_p99:.2f} ms "
+        f"(limite {limit:.2f} ms) ; {statuses.count(503)} connexions refusées (503)"
+    )
@@ -0,0 +1,131 @@
+"""Pagination par curseur des listes d'articles et du fil.
+
+Les pages successives suivent `nextCursor` : l'ordre (created_at, id)
+décroissant reste total même quand plusieurs articles partagent le même
+instant de création, et un curseur invalide est refusé par un 400.
+"""
+import base64
+from datetime import datetime
+
+import pytest
+from sqlalchemy import select, update
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+SAME_INSTANT = datetime(2020, 1, 1, 12, 0, 0)
+
+
+async def _publish_simultaneous(new_article, headers, count: int):
+    """Publie `count` articles puis leur donne le même instant de création."""
+    from database import async_session
+    from models.article_sql import ArticleModel, timeline_entries
+
+    slugs = [(await new_article(headers))["slug"] for _ in range(count)]
+    async with async_session() as session:
+        ids = (
+            await session.execute(
+                select(ArticleModel.id).where(ArticleModel.slug.in_(slugs))
+            )
+        ).scalars()
+        ids = list(ids)
+        await session.execute(
+            update(ArticleModel)
+            .where(ArticleModel.id.in_(ids))
+            .values(created_at=SAME_INSTANT)
+        )
+        await session.execute(
+            update(timeline_entries)
+            .where(timeline_entries.c.article_id.in_(ids))
+            .values(created_at=SAME_INSTANT)
+        )
+        await session.commit()
+    return slugs
+
+
+async def _walk(client, path: str, headers: dict, limit: int):
+    """Parcourt toutes les pages d'une liste en suivant `nextCursor`."""
+    slugs, pages = [], 0
+    response = await client.get(f"{path}limit={limit}", headers=headers)
+    while True:
+        assert response.status_code == 200, response.text
+        content = response.json()
+        slugs.extend(article["slug"] for article in content["articles"])
+        pages += 1
+        if content["nextCursor"] is None:
+            return slugs, pages
+        response = await client.get(
+            f"{path}limit={limit}&cursor={content['nextCursor']}", headers=headers
+        )
+
+
+def _cursor(raw: str) -> str:
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+async def test_cursor_pages_are_stable_across_equal_created_at(
+    client, new_user, new_article
+):
+    author, headers = await new_user("paged")
+    slugs = await _publish_simultaneous(new_article, headers, 5)
+
+    walked, pages = await _walk(client, f"/articles?author={author}&", {}, 2)
+
+    # Départage par id décroissant, soit l'ordre inverse de publication
+    assert walked == slugs[::-1]
+    assert pages == 3
+    offset = await client.get(f"/articles?author={author}&limit=5")
+    assert [article["slug"] for article in offset.json()["articles"]] == walked
+
+
+async def test_next_cursor_round_trip(client, new_user, new_article):
+    author, headers = await new_user("cursor")
+    slugs = [(await new_article(headers))["slug"] for _ in range(3)]
+
+    first = (await client.get(f"/articles?author={author}&limit=2")).json()
+    assert [article["slug"] for article in first["articles"]] == slugs[:0:-1]
+    assert first["articlesCount"] == 3
+    second = (
+        await client.get(
+            f"/articles?author={author}&limit=2&cursor={first['nextCursor']}"
+        )
+    ).json()
+    assert [article["slug"] for article in second["articles"]] == slugs[:1]
+    assert second["articlesCount"] == 3
+    assert second["nextCursor"] is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        pytest.param("pas-un-curseur!", id="base64 invalide"),
+        pytest.param(_cursor("sans séparateur"), id="sans séparateur"),
+        pytest.param(_cursor("hier|12"), id="date invalide"),
+        pytest.param(_cursor("2020-01-01T00:00:00|douze"), id="id invalide"),
+        pytest.param(_cursor(f"2020-01-01T00:00:00|{2**64}"), id="id hors limites"),
+        pytest.param(
+            base64.urlsafe_b64encode(b"\xff\xfe|1").decode(), id="octets non UTF-8"
+        ),
+    ],
+)
+@pytest.mark.parametrize("path", ["/articles", "/articles/feed"])
+async def test_invalid_cursor_is_rejected(client, new_user, path, cursor):
+    _, headers = await new_user("tamper")
+
+    response = await client.get(f"{path}?cursor={cursor}", headers=headers)
+
+    assert response.status_code == 400, response.text
+
+
+async def test_feed_cursor_pages(client, new_user, new_article):
+    author, author_headers = await new_user("followed")
+    _, reader_headers = await new_user("reader")
+    response = await client.post(f"/profiles/{author}/follow", headers=reader_headers)
+    response.raise_for_status()
+    slugs = await _publish_simultaneous(new_article, author_headers, 3)
+    latest = (await new_article(author_headers))["slug"]
+
+    walked, pages = await _walk(client, "/articles/feed?", reader_headers, 2)
+
+    assert walked == [latest] + slugs[::-1]
+    # Deux pages pleines, puis une page vide sans curseur
+    assert pages == 3
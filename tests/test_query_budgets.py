@@ -0,0 +1,193 @@
+"""Nombre de requêtes SQL de chaque route face à son budget.
+
+Chaque route est appelée sous un QueryBudget (core/query_budget.py) : le test
+échoue si elle dépasse son budget, si une même forme de requête s'y répète
+(N+1), ou si son nombre de requêtes varie avec la taille de page (`limit`) —
+une liste de 100 articles doit coûter autant de requêtes qu'une liste de 1.
+
+Chaque requête mesurée est précédée d'un appel d'échauffement (cache des
+utilisateurs authentifiés, nuage de tags) : les budgets portent sur le régime
+établi. Les routes marquées « (304) » sont mesurées avec l'ETag obtenu à
+l'échauffement (If-None-Match) et doivent répondre 304.
+"""
+from typing import Callable, List, Optional, Sequence, Tuple
+
+import pytest
+from bench_api import Context, Request
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+PAGE_SIZES = (1, 20, 100)
+
+
+def _auth(ctx: Context) -> dict:
+    # Toujours le même utilisateur, distinct des profils et auteurs ciblés
+    # (les premiers de ctx.usernames) : le dernier échantillonné
+    return ctx.auth(list(ctx.tokens)[-1])
+
+
+# (route, budget, fabrique de requête à partir du contexte et de la taille de page,
+# tailles de page essayées) ; None : route non paginée
+BUDGETS: List[
+    Tuple[str, int, Callable[[Context, Optional[int]], Request], Sequence]
+] = [
+    ("GET /articles", 2, lambda c, n: ("GET", f"/articles?limit={n}", {}), PAGE_SIZES),
+    (
+        "GET /articles (authentifié)",
+        3,
+        lambda c, n: ("GET", f"/articles?limit={n}", {"headers": _auth(c)}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles?tag",
+        2,
+        lambda c, n: ("GET", f"/articles?tag={c.tags[0]}&limit={n}", {}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles?author",
+        2,
+        lambda c, n: ("GET", f"/articles?author={c.usernames[0]}&limit={n}", {}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles?favorited",
+        2,
+        lambda c, n: ("GET", f"/articles?favorited={c.usernames[0]}&limit={n}", {}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles/feed",
+        3,
+        lambda c, n: ("GET", f"/articles/feed?limit={n}", {"headers": _auth(c)}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles/search",
+        2,
+        lambda c, n: ("GET", f"/articles/search?q=python&limit={n}", {}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /articles/{slug}",
+        5,
+        lambda c, n: ("GET", f"/articles/{c.hot_slugs[0]}", {"headers": _auth(c)}),
+        (None,),
+    ),
+    (
+        "GET /articles/{slug} (304)",
+        3,
+        lambda c, n: ("GET", f"/articles/{c.hot_slugs[0]}", {"headers": _auth(c)}),
+        (None,),
+    ),
+    (
+        "GET /articles/{slug} (304, anonyme)",
+        1,
+        lambda c, n: ("GET", f"/articles/{c.hot_slugs[0]}", {}),
+        (None,),
+    ),
+    (
+        "GET /articles/{slug}/comments",
+        1,
+        lambda c, n: ("GET", f"/articles/{c.hot_slugs[0]}/comments?limit={n}", {}),
+        PAGE_SIZES,
+    ),
+    (
+        "GET /profiles/{username}",
+        2,
+        lambda c, n: ("GET", f"/profiles/{c.usernames[1]}", {"headers": _auth(c)}),
+        (None,),
+    ),
+    ("GET /tags", 0, lambda c, n: ("GET", "/tags", {}), (None,)),
+    ("GET /user", 0, lambda c, n: ("GET", "/user", {"headers": _auth(c)}), (None,)),
+    (
+        "POST /articles/{slug}/favorite",
+        5,
+        lambda c, n: (
+            "POST",
+            f"/articles/{c.slugs[0]}/favorite",
+            {"headers": _auth(c)},
+        ),
+        (None,),
+    ),
+    (
+        "DELETE /articles/{slug}/favorite",
+        5,
+        lambda c, n: (
+            "DELETE",
+            f"/articles/{c.slugs[0]}/favorite",
+            {"headers": _auth(c)},
+        ),
+        (None,),
+    ),
+    (
+        "POST /profiles/{username}/follow",
+        6,
+        lambda c, n: (
+            "POST",
+            f"/profiles/{c.usernames[2]}/follow",
+            {"headers": _auth(c)},
+        ),
+        (None,),
+    ),
+    (
+        "DELETE /profiles/{username}/follow",
+        5,
+        lambda c, n: (
+            "DELETE",
+            f"/profiles/{c.usernames[2]}/follow",
+            {"headers": _auth(c)},
+        ),
+        (None,),
+    ),
+    (
+        "POST /articles/{slug}/comments",
+        5,
+        lambda c, n: (
+            "POST",
+            f"/articles/{c.slugs[1]}/comments",
+            {"headers": _auth(c), "json": {"comment": {"body": "Budget"}}},
+        ),
+        (None,),
+    ),
+]
+
+
+@pytest.mark.parametrize(
+    "label, max_queries, factory, page_sizes",
+    [pytest.param(*entry, id=entry[0]) for entry in BUDGETS],
+)
+async def test_route_query_budget(
+    client, dataset_context, query_budget, label, max_queries, factory, page_sizes
+):
+    counts = []
+    problems = []
+    for page_size in page_sizes:
+        method, path, kwargs = factory(dataset_context, page_size)
+        # Les écritures s'échauffent sur GET /user (cache de l'utilisateur)
+        warmup = (method, path) if method == "GET" else ("GET", "/user")
+        response = await client.request(*warmup, headers=kwargs.get("headers"))
+        if "(304" in label:
+            headers = {**kwargs.get("headers", {})}
+            headers["If-None-Match"] = response.headers.get("etag", "")
+            kwargs = {**kwargs, "headers": headers}
+
+        name = label if page_size is None else f"{label} (limit={page_size})"
+        with query_budget(max_queries, name=name) as budget:
+            response = await client.request(method, path, **kwargs)
+        counts.append(budget.count)
+        problems.extend(f"{name} : {problem}" for problem in budget.violations())
+        if response.status_code >= 400:
+            problems.append(
+                f"{name} : statut {response.status_code} : {response.text[:200]}"
+            )
+        elif "(304" in label and response.status_code != 304:
+            problems.append(f"{name} : statut {response.status_code} au lieu de 304")
+
+    if len(set(counts)) > 1:
+        sizes = ", ".join(f"limit={n} : {c}" for n, c in zip(page_sizes, counts))
+        problems.append(
+            f"{label} : requêtes dépendantes de la taille de page ({sizes})"
+        )
+
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,246 @@
+"""Aucune requête des repositories ne retombe sur un parcours complet de table.
+
+Une base temporaire est peuplée en volume (`--plans-scale`), chaque fonction
+de repository y est exécutée et l'EXPLAIN QUERY PLAN de chaque requête émise
+est analysé : toute ligne « SCAN <table> » sans index fait échouer le test,
+avec la requête fautive et son plan.
+"""
+import random
+import re
+from datetime import datetime, timedelta
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import event, insert, text
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from database import Base
+from models.article_sql import (
+    ArticleModel,
+    ArticleTag,
+    CommentModel,
+    article_favorites,
+    article_tags,
+)
+from models.user_sql import UserModel, user_follows
+from repositories.article_repository import (
+    favorite_article,
+    follow_user,
+    get_all_tags,
+    get_article_by_slug,
+    get_article_ref,
+    get_article_row_by_slug,
+    get_article_rows_page,
+    get_article_version,
+    get_articles_page,
+    get_favorited_article_ids,
+    search_articles,
+    unfavorite_article,
+    unfollow_user,
+)
+from repositories.comment_repository import (
+    get_article_comment_rows,
+    get_article_comments,
+    has_comments_from_others,
+)
+from repositories.feed_repository import get_feed_page, get_feed_rows_page
+from repositories.tag_repository import get_tag_usage_for_article
+from repositories.user_repository import get_user_by_username
+from utils.pagination import encode_cursor
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+SCAN_RE = re.compile(r"^SCAN (\w+)$")
+
+
+async def seed(engine, scale: float) -> None:
+    """Peuple la base avec un jeu de données volumineux via des insertions en masse."""
+    rng = random.Random(42)
+    users = int(2_000 * scale)
+    articles = int(20_000 * scale)
+    tags = 50
+    start = datetime(2020, 1, 1)
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+        await conn.execute(
+            insert(UserModel),
+            [
+                {"id": i, "username": f"user{i}", "email": f"user{i}@example.com"}
+                for i in range(1, users + 1)
+            ],
+        )
+        await conn.execute(
+            insert(ArticleTag),
+            [{"id": i, "name": f"tag{i}"} for i in range(1, tags + 1)],
+        )
+        await conn.execute(
+            insert(ArticleModel),
+            [
+                {
+                    "id": i,
+                    "slug": f"article-{i}",
+                    "title": f"Article {i}",
+                    "description": "Description",
+                    "body": "Body",
+                    "author_id": rng.randint(1, users),
+                    "created_at": start + timedelta(minutes=i),
+                    "updated_at": start + timedelta(minutes=i),
+                }
+                for i in range(1, articles + 1)
+            ],
+        )
+        await conn.execute(
+            insert(article_tags),
+            [
+                {"article_id": i, "tag_id": tag_id}
+                for i in range(1, articles + 1)
+                for tag_id in rng.sample(range(1, tags + 1), 3)
+            ],
+        )
+        await conn.execute(
+            insert(article_favorites).prefix_with("OR IGNORE"),
+            [
+                {
+                    "article_id": rng.randint(1, articles),
+                    "user_id": rng.randint(1, users),
+                }
+                for _ in range(articles * 2)
+            ],
+        )
+        await conn.execute(
+            insert(CommentModel),
+            [
+                {
+                    "body": "Comment",
+                    "article_id": rng.randint(1, articles),
+                    "author_id": rng.randint(1, users),
+                    "created_at": start + timedelta(minutes=i),
+                    "updated_at": start + timedelta(minutes=i),
+                }
+                for i in range(articles * 2)
+            ],
+        )
+        await conn.execute(
+            insert(user_follows).prefix_with("OR IGNORE"),
+            [
+                {
+                    "follower_id": rng.randint(1, users),
+                    "followed_id": rng.randint(1, users),
+                }
+                for _ in range(users * 10)
+            ],
+        )
+        await conn.execute(
+            text(
+                "INSERT INTO timeline_entries "
+                "(user_id, article_id, author_id, created_at) "
+                "SELECT user_follows.follower_id, articles.id, articles.author_id, "
+                "articles.created_at FROM user_follows "
+                "JOIN articles ON articles.author_id = user_follows.followed_id"
+            )
+        )
+
+
+def scenarios():
+    """Appels de repository à analyser, avec des filtres représentatifs."""
+    cursor = encode_cursor(datetime(2020, 1, 5), 5_000)
+    return {
+        "get_articles": lambda s: get_articles_page(s),
+        "get_articles (cursor)": lambda s: get_articles_page(s, cursor=cursor),
+        "get_articles (offset)": lambda s: get_articles_page(s, offset=1_000),
+        "get_articles (author)": lambda s: get_articles_page(s, author="user7"),
+        "get_articles (favorited)": lambda s: get_articles_page(s, favorited="user7"),
+        "get_articles (tag)": lambda s: get_articles_page(s, tag="tag7"),
+        "get_article_rows_page": lambda s: get_article_rows_page(s),
+        "get_article_rows_page (favorited)": lambda s: get_article_rows_page(
+            s, favorited="user7"
+        ),
+        "search_articles": lambda s: search_articles(s, "article 42"),
+        "search_articles (tag)": lambda s: search_articles(s, "article", tag="tag7"),
+        "get_favorited_article_ids": lambda s: get_favorited_article_ids(
+            s, 7, list(range(1, 21))
+        ),
+        "get_feed": lambda s: get_feed_page(s, 7),
+        "get_feed (cursor)": lambda s: get_feed_page(s, 7, cursor=cursor),
+        "get_feed_rows_page": lambda s: get_feed_rows_page(s, 7),
+        "get_article_by_slug": lambda s: get_article_by_slug(s, "article-42"),
+        "get_article_row_by_slug": lambda s: get_article_row_by_slug(s, "article-42"),
+        "get_article_ref": lambda s: get_article_ref(s, "article-42"),
+        "get_article_version": lambda s: get_article_version(s, "article-42"),
+        "get_tag_usage_for_article": lambda s: get_tag_usage_for_article(s, 42),
+        "get_article_comments": lambda s: get_article_comments(s, "article-42"),
+        "get_article_comment_rows": lambda s: get_article_comment_rows(s, "article-42"),
+        "get_article_comment_rows (cursor)": lambda s: get_article_comment_rows(
+            s, "article-42", cursor=cursor
+        ),
+        "has_comments_from_others": lambda s: has_comments_from_others(s, 42, 7),
+        "get_all_tags": lambda s: get_all_tags(s),
+        "get_user_by_username": lambda s: get_user_by_username(s, "user7"),
+        "follow_user": lambda s: follow_user(s, 7, 8),
+        "unfollow_user": lambda s: unfollow_user(s, 7, 8),
+        "favorite_article": lambda s: favorite_article(s, 42, 7),
+        "unfavorite_article": lambda s: unfavorite_article(s, 42, 7),
+    }
+
+
+def full_scans(plan) -> list:
+    """Retourne les tables parcourues intégralement dans un plan d'exécution."""
+    tables = Base.metadata.tables
+    scanned = []
+    for row in plan:
+        match = SCAN_RE.match(row[-1])
+        if match is None:
+            continue
+        # Les alias SQLAlchemy (users_1, ...) désignent la même table
+        name = re.sub(r"_\d+$", "", match.group(1))
+        if name in tables:
+            scanned.append(name)
+    return scanned
+
+
+@pytest_asyncio.fixture(scope="module", loop_scope="session")
+async def plans_engine(pytestconfig, tmp_path_factory):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}"
+    )
+    await seed(engine, pytestconfig.getoption("plans_scale"))
+    yield engine
+    await engine.dispose()
+
+
+@pytest.mark.parametrize("name", list(scenarios()))
+async def test_no_full_table_scan(plans_engine, name):
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and not statement.startswith("EXPLAIN"):
+            captured.append((statement, parameters))
+
+    session_factory = sessionmaker(
+        plans_engine, class_=AsyncSession, expire_on_commit=False
+    )
+    event.listen(plans_engine.sync_engine, "before_cursor_execute", capture)
+    try:
+        async with session_factory() as session:
+            await scenarios()[name](session)
+    finally:
+        event.remove(plans_engine.sync_engine, "before_cursor_execute", capture)
+
+    problems = []
+    async with plans_engine.connect() as conn:
+        for statement, parameters in captured:
+            result = await conn.exec_driver_sql(
+                f"EXPLAIN QUERY PLAN {statement}", parameters
+            )
+            plan = result.all()
+            scanned = full_scans(plan)
+            if scanned:
+                problems.append(
+                    f"parcours complet de : {', '.join(sorted(set(scanned)))}"
+                )
+                problems.append("  " + " ".join(statement.split()))
+                problems.extend(f"    {row[-1]}" for row in plan)
+
+    assert not problems, "\n".join(problems)
@@ -0,0 +1,75 @@
+"""Invalidation du cache des utilisateurs authentifiés à la modification du profil.
+
+Le cache est indexé par nom d'utilisateur (sujet des tokens) : PUT /user doit
+en retirer l'entrée du nom courant et, après un renommage, celle de l'ancien
+nom, faute de quoi un ancien token résoudrait encore vers l'utilisateur.
+"""
+import pytest
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+def _bearer(response) -> dict:
+    return {"Authorization": f"Bearer {response.json()['user']['token']}"}
+
+
+async def _login(client, username: str, password: str):
+    return await client.post(
+        "/users/login",
+        json={"user_input": {"email": f"{username}@example.com", "password": password}},
+    )
+
+
+async def test_rename_invalidates_old_and_new_username(client, new_user):
+    from repositories.user_cache import UserSnapshot, user_cache
+
+    old_name, old_headers = await new_user("rename")
+    new_name = f"{old_name}-renamed"
+    (await client.get("/user", headers=old_headers)).raise_for_status()
+    assert user_cache.get(old_name) is not None
+    # Entrée périmée sous le nouveau nom (autre worker, ancien titulaire du nom)
+    user_cache.set(UserSnapshot(-1, new_name, "stale@example.com", None, None))
+
+    response = await client.put(
+        "/user", headers=old_headers, json={"user": {"username": new_name}}
+    )
+
+    assert response.status_code == 200, response.text
+    assert user_cache.get(old_name) is None
+    assert user_cache.get(new_name) is None
+    assert (await client.get("/user", headers=old_headers)).status_code == 401
+    current = await client.get("/user", headers=_bearer(response))
+    assert current.status_code == 200
+    assert current.json()["user"]["username"] == new_name
+    assert current.json()["user"]["email"] == f"{old_name}@example.com"
+
+
+async def test_password_change_invalidates_cached_user(client, new_user):
+    from repositories.user_cache import user_cache
+
+    username, headers = await new_user("password", password="old-password")
+    (await client.get("/user", headers=headers)).raise_for_status()
+    assert user_cache.get(username) is not None
+
+    response = await client.put(
+        "/user", headers=headers, json={"user": {"password": "new-password"}}
+    )
+
+    assert response.status_code == 200, response.text
+    assert user_cache.get(username) is None
+    assert (await _login(client, username, "old-password")).status_code == 401
+    assert (await _login(client, username, "new-password")).status_code == 200
+    assert (await client.get("/user", headers=_bearer(response))).status_code == 200
+
+
+async def test_profile_edit_is_served_after_invalidation(client, new_user):
+    username, headers = await new_user("bio")
+    (await client.get("/user", headers=headers)).raise_for_status()
+
+    response = await client.put(
+        "/user", headers=headers, json={"user": {"bio": "Bio à jour"}}
+    )
+    response.raise_for_status()
+
+    current = await client.get("/user", headers=headers)
+    assert current.json()["user"]["bio"] == "Bio à jour"
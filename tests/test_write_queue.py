@@ -0,0 +1,110 @@
+"""Regroupement des écritures (WriteBatcher) : isolation des opérations d'un lot.
+
+Chaque opération d'un lot s'exécute dans son propre SAVEPOINT : une opération
+qui échoue n'annule que ses propres écritures, les autres sont validées avec
+le lot, et seul son appelant reçoit l'exception.
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+
+pytestmark = pytest.mark.asyncio(loop_scope="session")
+
+
+class OperationFailed(Exception):
+    pass
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def batch_engine(tmp_path):
+    """Moteur d'écriture configuré comme celui de l'application, sur une base vide."""
+    from database import create_db_engine
+    from settings import Settings
+
+    config = Settings(DATABASE_URL=f"sqlite+aiosqlite:///{tmp_path / 'batch.db'}")
+    engine = create_db_engine(config)
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+        await conn.execute(text("INSERT INTO items (id) VALUES (1)"))
+    yield engine
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture(loop_scope="session")
+async def batcher(batch_engine):
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import sessionmaker
+
+    from repositories.write_queue import WriteBatcher
+
+    # Un délai long : toutes les opérations soumises ensemble forment un lot
+    batcher = WriteBatcher(
+        sessionmaker(batch_engine, class_=AsyncSession, expire_on_commit=False),
+        max_batch_size=16,
+        max_delay=0.2,
+    )
+    batcher.start()
+    yield batcher
+    await batcher.stop()
+
+
+def _insert(*ids: int, error: Exception = None):
+    """Opération insérant des lignes, puis levant `error` s'il est fourni."""
+    sessions = []
+
+    async def operation(session):
+        sessions.append(session)
+        for item_id in ids:
+            await session.execute(
+                text("INSERT INTO items (id) VALUES (:id)"), {"id": item_id}
+            )
+        if error is not None:
+            raise error
+        return ids
+
+    operation.sessions = sessions
+    return operation
+
+
+async def _stored_ids(engine):
+    async with engine.connect() as conn:
+        result = await conn.execute(text("SELECT id FROM items ORDER BY id"))
+        return [row.id for row in result]
+
+
+async def test_failed_operation_rolls_back_only_its_savepoint(batch_engine, batcher):
+    error = OperationFailed("échec de l'opération")
+    operations = [
+        _insert(10, 11),
+        # Écrit avant d'échouer : ses lignes doivent être annulées
+        _insert(20, error=error),
+        # Viole la clé primaire après une insertion valide
+        _insert(30, 1),
+        _insert(40),
+    ]
+
+    results = await asyncio.gather(
+        *(batcher.submit(operation) for operation in operations),
+        return_exceptions=True,
+    )
+
+    # Un seul lot, donc une seule session partagée
+    sessions = {id(session) for op in operations for session in op.sessions}
+    assert len(sessions) == 1
+    assert results[0] == (10, 11)
+    assert results[1] is error
+    assert isinstance(results[2], IntegrityError)
+    assert results[3] == (40,)
+    assert await _stored_ids(batch_engine) == [1, 10, 11, 40]
+
+
+async def test_batcher_keeps_running_after_a_failed_operation(batch_engine, batcher):
+    with pytest.raises(OperationFailed):
+        await batcher.submit(_insert(50, error=OperationFailed()))
+
+    assert await batcher.submit(_insert(60)) == (60,)
+    assert batcher.running
+    assert await _stored_ids(batch_engine) == [1, 60]